@@ -16,13 +16,8 @@ import sys
 import os
 
 from wb_agent import __version__
-from wb_agent.generator import ProjectGenerator
-from wb_agent.scanner import ProjectScanner
-from wb_agent.validators import validate_agent_structure
-from wb_agent.registry import (
-    SKILLS_REGISTRY, WORKFLOWS_REGISTRY, PROJECT_TYPES,
-    get_skills_for_project_type, get_workflows_for_project_type,
-)
+from wb_agent.fleet import FLEET_ACTIONS
+from wb_agent.registry import PROJECT_TYPES, get_registry_index
 
 
 def _ask_project_type():
@@ -47,6 +42,9 @@ def _ask_project_type():
 
 def cmd_init(args):
     """Khởi tạo cấu trúc .agent/ cho project."""
+    from wb_agent.generator import ProjectGenerator
+    from wb_agent.scanner import ProjectScanner, DETECTORS
+
     target = os.path.abspath(args.target or os.getcwd())
     name = args.name or os.path.basename(target)
     force = getattr(args, 'force', False)
@@ -98,13 +96,13 @@ def cmd_init(args):
         print(f"  🏗️ Project Type: {type_info['label']}")
 
     # Lọc skills theo loại dự án
-    filtered_skills = get_skills_for_project_type(project_type)
-    filtered_workflows = get_workflows_for_project_type(project_type)
+    registry = get_registry_index()
+    filtered_skills = registry.skills_for(project_type)
+    filtered_workflows = registry.workflows_for(project_type)
 
     # Hiển thị skills được bật/tắt
-    all_skill_names = {s["name"] for s in SKILLS_REGISTRY}
-    active_skill_names = {s["name"] for s in filtered_skills}
-    skipped_skill_names = all_skill_names - active_skill_names
+    active_skill_names = registry.skill_names_for(project_type)
+    skipped_skill_names = registry.skill_names - active_skill_names
 
     if skipped_skill_names:
         print(f"\n  🟢 Bật:  {len(active_skill_names)} skills")
@@ -116,8 +114,14 @@ def cmd_init(args):
 
     # SCAN EXISTING CODEBASE
     print("🔬 Đang quét codebase...")
-    scanner = ProjectScanner(target)
+    budget = _scan_budget(_scan_limits(args))
+    if budget is not None:
+        print(f"  ⏳ Giới hạn quét: {budget.describe()}")
+    scanner = ProjectScanner(target, use_cache=True, workers=getattr(args, "jobs", 1), budget=budget)
     scan_profile = scanner.scan()
+    if scanner.scan_stats["detectors_cached"]:
+        total = len(DETECTORS) * (1 + scanner.scan_stats["packages"])
+        print(f"  ♻️  Cache: dùng lại {scanner.scan_stats['detectors_cached']}/{total} detectors")
 
     if scan_profile["has_existing_code"]:
         print(scanner.generate_report())
@@ -126,11 +130,16 @@ def cmd_init(args):
         print("  📭 Dự án trống — sử dụng templates mặc định.\n")
 
     # Generate
+    if getattr(args, "render_cache", None):
+        from wb_agent.render_cache import configure_disk_cache
+        configure_disk_cache(args.render_cache)
     generator = ProjectGenerator(
         target_dir=target,
         project_name=name,
         project_type=project_type,
         scan_profile=scan_profile,
+        atomic=args.atomic,
+        workers=args.jobs,
     )
     generator.generate()
 
@@ -173,7 +182,7 @@ def _audit_existing_agent(agent_dir):
 
     # 2. Kiểm tra files lẻ/thừa không thuộc chuẩn mới
     for item in os.listdir(agent_dir):
-        if item in [".", "..", "skills", "workflows", "templates", "scripts", "identity", "knowledge_base", "memory", "README.md"]:
+        if item in [".", "..", "skills", "workflows", "templates", "scripts", "identity", "knowledge_base", "memory", "README.md", ".cache"]:
             continue
         report["is_legacy"] = True
         report["items"].append({"name": item, "status": "NON-STANDARD", "action": "Backup & Di chuyển"})
@@ -188,12 +197,13 @@ def _audit_existing_agent(agent_dir):
 
 def cmd_list_skills(args):
     """Liệt kê tất cả skills."""
-    print(f"\n🧠 WB-Agent - Skills Registry ({len(SKILLS_REGISTRY)} skills)")
+    skills = get_registry_index().skills
+    print(f"\n🧠 WB-Agent - Skills Registry ({len(skills)} skills)")
     print(f"{'─' * 85}")
     print(f"  {'Skill':<25} {'Type':<12} {'Description'}")
     print(f"  {'─' * 23}   {'─' * 10}   {'─' * 45}")
 
-    for skill in SKILLS_REGISTRY:
+    for skill in skills:
         ptype = skill.get("project_types", "all")
         print(f"  @{skill['name']:<23} {ptype:<12} {skill['description']}")
 
@@ -203,21 +213,53 @@ def cmd_list_skills(args):
 
 def cmd_list_workflows(args):
     """Liệt kê tất cả workflows."""
-    print(f"\n🔄 WB-Agent - Workflows Registry ({len(WORKFLOWS_REGISTRY)} workflows)")
+    workflows = get_registry_index().workflows
+    print(f"\n🔄 WB-Agent - Workflows Registry ({len(workflows)} workflows)")
     print(f"{'─' * 70}")
     print(f"  {'Command':<35} {'Description'}")
     print(f"  {'─' * 33}   {'─' * 33}")
 
-    for wf in WORKFLOWS_REGISTRY:
+    for wf in workflows:
         print(f"  /{wf['command']:<33} {wf['description']}")
 
     print(f"\n💡 Sử dụng: /<command> trong Antigravity để chạy workflow\n")
 
 
 def cmd_validate(args):
-    """Validate cấu trúc .agent/ của project."""
+    """Validate cấu trúc .agent/ của project. Exit code: 0 = PASSED, 1 = có check FAILED."""
+    import json
+    from wb_agent.validators import validate_agent_structure, iter_agent_checks
+
     target = os.path.abspath(args.target or os.getcwd())
     agent_dir = os.path.join(target, ".agent")
+    output_format = args.format
+    fail_fast = args.fail_fast
+
+    if output_format == "ndjson":
+        # Stream từng check ngay khi xong — dòng cuối là summary
+        total = failed = 0
+        for check in iter_agent_checks(agent_dir):
+            total += 1
+            failed += not check["passed"]
+            print(json.dumps({"type": "check", "target": target, **check}, ensure_ascii=False), flush=True)
+            if fail_fast and not check["passed"]:
+                break
+        print(json.dumps({"type": "summary", "target": target, "passed": failed == 0,
+                          "total": total, "failed": failed}, ensure_ascii=False))
+        return 1 if failed else 0
+
+    results = validate_agent_structure(agent_dir, fail_fast=fail_fast)
+    failed = sum(1 for check in results if not check["passed"])
+
+    if output_format == "json":
+        print(json.dumps({
+            "target": target,
+            "passed": failed == 0,
+            "total": len(results),
+            "failed": failed,
+            "checks": results,
+        }, ensure_ascii=False, indent=2))
+        return 1 if failed else 0
 
     print(f"\n🔍 Validating .agent/ tại: {target}")
     print(f"{'─' * 50}\n")
@@ -225,24 +267,266 @@ def cmd_validate(args):
     if not os.path.exists(agent_dir):
         print("❌ Không tìm thấy thư mục .agent/")
         print("💡 Chạy: wb-agent init để khởi tạo\n")
-        return
-
-    results = validate_agent_structure(agent_dir)
+        return 1
 
-    all_passed = True
     for check in results:
         status = "✅" if check["passed"] else "❌"
         print(f"  {status} {check['name']}")
         if not check["passed"]:
-            all_passed = False
             for detail in check.get("details", []):
                 print(f"     ⚠️  {detail}")
 
     print()
-    if all_passed:
+    if not failed:
         print("✅ Tất cả kiểm tra đều PASSED!\n")
+    elif fail_fast:
+        print("❌ Dừng ở check FAILED đầu tiên (--fail-fast).\n")
     else:
         print("❌ Một số kiểm tra FAILED. Xem chi tiết ở trên.\n")
+    return 1 if failed else 0
+
+
+def cmd_status(args):
+    """Progress dashboard từ .agent/specs/*/tasks.md (parse trực tiếp, cache theo mtime)."""
+    from wb_agent.status import collect_status, render_brief, render_dashboard
+
+    target = os.path.abspath(args.target or os.getcwd())
+    statuses = collect_status(target, feature=args.feature)
+
+    if args.format == "json":
+        import json
+        print(json.dumps({
+            "target": target,
+            "done": sum(s["done"] for s in statuses),
+            "total": sum(s["total"] for s in statuses),
+            "features": statuses,
+        }, ensure_ascii=False, indent=2))
+        return 0
+
+    if not statuses:
+        what = f"feature '{args.feature}'" if args.feature else "feature nào"
+        print(f"📭 Chưa có tasks.md cho {what} trong .agent/specs/")
+        print("💡 Chạy: /05-speckit.tasks để tạo tasks.md\n")
+        return 0
+
+    print()
+    if args.brief:
+        print(render_brief(statuses))
+    else:
+        for status in statuses:
+            print(render_dashboard(status))
+            print()
+        if len(statuses) > 1:
+            print(render_brief(statuses))
+    print()
+    return 0
+
+
+def cmd_tasks(args):
+    """`wb-agent tasks plan`: DAG dependency từ tasks.md → waves song song + critical path."""
+    from wb_agent.status import iter_task_files
+    from wb_agent.task_plan import plan_feature, render_plan
+
+    if args.max_parallel is not None and args.max_parallel < 1:
+        print("❌ --max-parallel phải >= 1")
+        return 2
+
+    target = os.path.abspath(args.target or os.getcwd())
+    plans = []
+    for name, rel, _ in iter_task_files(target):
+        if args.feature and name != args.feature:
+            continue
+        plan = plan_feature(os.path.join(target, rel), max_parallel=args.max_parallel)
+        plans.append({"feature": name, "path": rel, **plan})
+    has_cycles = any(p["cycles"] for p in plans)
+
+    if args.format == "json":
+        import json
+        print(json.dumps({"target": target, "features": plans}, ensure_ascii=False, indent=2))
+        return 1 if has_cycles else 0
+
+    if not plans:
+        what = f"feature '{args.feature}'" if args.feature else "feature nào"
+        print(f"📭 Chưa có tasks.md cho {what} trong .agent/specs/")
+        print("💡 Chạy: /05-speckit.tasks để tạo tasks.md\n")
+        return 0
+
+    print()
+    for plan in plans:
+        print(render_plan(plan["feature"], plan))
+        print()
+    if has_cycles:
+        print("❌ tasks.md có dependency vòng — sửa `Depends on:` rồi chạy lại.\n")
+    return 1 if has_cycles else 0
+
+
+def cmd_export_issues(args):
+    """tasks.md → file import cho GitHub/GitLab/Jira, chỉ xuất task mới / đã đổi (sync ledger)."""
+    from wb_agent.issue_export import confirm_export, export_issues
+
+    target = os.path.abspath(args.target or os.getcwd())
+    if args.confirm:
+        pending = confirm_export(target, args.tracker, args.feature)
+        if pending is None:
+            what = f"{args.tracker}, feature '{args.feature}'" if args.feature else args.tracker
+            print(f"📭 Không có export nào đang chờ xác nhận cho {what}.\n")
+            return 0
+        print(f"✅ Đã ghi sync ledger: {len(pending['issues'])} issue, {len(pending['removed'])} đã xoá ({args.tracker})\n")
+        return 0
+
+    summary = export_issues(
+        target, tracker=args.tracker, fmt=args.format, feature=args.feature, full=args.all,
+        output=args.output, mock_tracker=args.mock_tracker, dry_run=args.dry_run,
+        jira_project=args.jira_project,
+    )
+
+    if not summary["total"] and not summary["removed"]:
+        what = f"feature '{args.feature}'" if args.feature else "feature nào"
+        print(f"📭 Chưa có task nào (có ID) cho {what} trong .agent/specs/*/tasks.md\n")
+        return 0
+
+    print(f"\n🔗 Export issues → {args.tracker} ({args.format})" + (" [dry-run]" if args.dry_run else ""))
+    print(f"  🆕 Mới:       {len(summary['added'])}")
+    print(f"  ✏️  Thay đổi:  {len(summary['changed'])}")
+    print(f"  🗑️  Đã xoá:    {len(summary['removed'])}")
+    print(f"  ＝ Không đổi: {summary['unchanged']}")
+    for key in summary["removed"]:
+        print(f"     - {key} (không còn trong tasks.md — đóng issue thủ công)")
+    if args.dry_run:
+        print()
+        return 0
+    print(f"\n📄 {os.path.relpath(summary['markdown'], target)}")
+    if not summary["output"]:
+        print("✅ Tracker đã đồng bộ — không có gì để export.\n")
+        return 0
+    print(f"📦 {os.path.relpath(summary['output'], target)}")
+    if summary["removed_output"]:
+        print(f"🗑️  {os.path.relpath(summary['removed_output'], target)} (issue cần đóng)")
+    if summary["applied"]:
+        print(f"🧪 Đã áp dụng vào mock tracker: {args.mock_tracker}")
+    else:
+        scope = f" --feature {args.feature}" if args.feature else ""
+        print(f"👉 Sau khi import vào tracker: wb-agent export-issues --tracker {args.tracker}{scope} --confirm")
+    print()
+    return 0
+
+
+def cmd_diff(args):
+    """Spec (plan.md / tasks.md) vs code: file, endpoint, model thiếu / thừa / đổi tên."""
+    from wb_agent.scanner import ProjectScanner
+    from wb_agent.spec_diff import diff_features, render_report
+    from wb_agent.status import SPECS_DIR
+
+    target = os.path.abspath(args.target or os.getcwd())
+    if os.path.isdir(os.path.join(target, SPECS_DIR)):
+        # Dùng scan cache: lần chạy sau chỉ stat thư mục + kiểm dependency của detector (đủ nhanh cho pre-commit)
+        scanner = ProjectScanner(target, use_cache=True, workers=args.jobs)
+        scanner.scan()
+        reports, partial = diff_features(target, scanner, feature=args.feature), scanner.profile["partial"]
+    else:
+        # Repo chưa init → không scan (scan cache sẽ tạo .agent/ và `init` hiểu nhầm là repo cũ cần migrate)
+        reports, partial = [], False
+
+    failing = ("error", "renamed", "pending") if args.strict else ("error",)
+    failed = any(f["status"] in failing for r in reports for f in r["findings"])
+
+    if args.format == "json":
+        import json
+        print(json.dumps({"target": target, "features": reports, "partial": partial},
+                         ensure_ascii=False, indent=2))
+        return 1 if failed else 0
+
+    if not reports:
+        what = f"feature '{args.feature}'" if args.feature else "feature nào"
+        print(f"📭 Chưa có plan.md / tasks.md cho {what} trong .agent/specs/\n")
+        return 0
+
+    print()
+    for report in reports:
+        print(render_report(report))
+        print()
+    if scanner.profile["partial"]:
+        print("⚠️  Scan chưa đầy đủ — kết quả có thể thiếu sót.\n")
+    if failed:
+        print("❌ Code lệch so với spec" + (" (--strict)" if args.strict else "") + ".\n")
+    return 1 if failed else 0
+
+
+def cmd_watch(args):
+    """Theo dõi thay đổi → chạy lại detector liên quan → cập nhật .agent/knowledge_base/*.md."""
+    from wb_agent.watch import KNOWLEDGE_BASE_DIR, InotifyError, watch
+
+    target = os.path.abspath(args.target or os.getcwd())
+    if not os.path.isdir(os.path.join(target, KNOWLEDGE_BASE_DIR)):
+        print(f"❌ Không tìm thấy {KNOWLEDGE_BASE_DIR}/ trong {target} — chạy `wb-agent init` trước.\n")
+        return 1
+    try:
+        watch(target, mode=args.mode, debounce=args.debounce, interval=args.interval, workers=args.jobs)
+    except InotifyError as e:
+        print(f"❌ inotify: {e.strerror}\n")
+        return 1
+    except KeyboardInterrupt:
+        print("\n👋 Dừng watch.")
+    return 0
+
+
+def _scan_budget(limits):
+    """dict giới hạn (từ _add_scan_limit_arguments) → ScanBudget, hoặc None nếu không đặt giới hạn nào."""
+    if not limits or all(v is None for v in limits.values()):
+        return None
+    from wb_agent.scan_budget import ScanBudget
+    return ScanBudget(**limits)
+
+
+def _scan_limits(args):
+    """Giá trị của các cờ giới hạn quét → dict tham số cho ScanBudget (picklable, gửi được sang fleet worker)."""
+    return {
+        "max_files": args.max_files,
+        "max_depth": args.max_depth,
+        "max_bytes": args.max_bytes,
+        "timeout": args.scan_timeout,
+    }
+
+
+def _add_scan_limit_arguments(subparser):
+    """Thêm --max-files / --max-depth / --max-bytes / --scan-timeout cho subcommand có quét."""
+    group = subparser.add_argument_group("giới hạn quét (repo lớn / CI)")
+    group.add_argument("--max-files", type=int, help="Dừng index sau N file")
+    group.add_argument("--max-depth", type=int, help="Không đi sâu quá N cấp thư mục")
+    group.add_argument("--max-bytes", type=int, help="Tổng số byte tối đa detectors được đọc")
+    group.add_argument("--scan-timeout", type=float, help="Thời gian quét tối đa (giây)")
+
+
+def cmd_fleet(args):
+    """Chạy init/validate/refresh trên nhiều repo song song (không tương tác)."""
+    import time
+    from wb_agent.fleet import expand_targets, run_fleet, format_summary
+
+    targets = expand_targets(args.targets, from_file=args.from_file)
+    if not targets:
+        print("❌ Không có thư mục đích nào (truyền đường dẫn, glob hoặc --from-file)")
+        return 2
+
+    jobs = args.jobs or os.cpu_count() or 1
+    print(f"\n🚀 WB-Agent Fleet — {args.action} trên {len(targets)} repo ({jobs} processes)")
+
+    done = [0]
+
+    def _progress(result):
+        done[0] += 1
+        print(f"  [{done[0]}/{len(targets)}] {result['status']:<8} {result['seconds']:6.2f}s  {result['target']}")
+
+    started = time.perf_counter()
+    results = run_fleet(
+        args.action, targets, jobs=jobs,
+        options={"force": args.force, "project_type": args.type, "render_cache": args.render_cache,
+                 "atomic": args.atomic, "scan_limits": _scan_limits(args)},
+        on_result=_progress,
+    )
+    print(format_summary(results, time.perf_counter() - started))
+    print()
+
+    return 1 if any(r["status"] in ("failed", "error") for r in results) else 0
 
 
 def cmd_version(args):
@@ -262,9 +546,13 @@ Ví dụ:
   wb-agent init --name "My Project"          # Init với tên project
   wb-agent init --type web_public            # Init cho Web B2C (bật SEO/GEO)
   wb-agent init --force                      # Init và ghi đè không hỏi
+  wb-agent init --jobs 8                     # Quét + ghi file với 8 thread song song
+  wb-agent init --atomic                     # Sinh .agent/ theo transaction (staging + rename)
   wb-agent list-skills                       # Xem danh sách skills
   wb-agent list-workflows                    # Xem danh sách workflows
   wb-agent validate                          # Validate cấu trúc .agent/
+  wb-agent validate --format json            # Kết quả JSON + exit code ≠ 0 khi FAILED (CI)
+  wb-agent fleet init 'services/*' -j 16     # Init hàng loạt repo song song
   wb-agent version                           # Xem phiên bản
 
 Loại dự án:
@@ -296,6 +584,12 @@ Quy trình dự án CÓ SẴN:
     init_parser.add_argument("--name", "-n", help="Tên project (mặc định: tên thư mục)")
     init_parser.add_argument("--type", help="Loại dự án: web_public, web_saas, mobile_app, desktop_cli, fullstack")
     init_parser.add_argument("--force", "-f", action="store_true", help="Ghi đè .agent/ nếu đã tồn tại")
+    init_parser.add_argument("--jobs", "-j", type=int, default=1, help="Số thread song song khi quét (detectors) và khi ghi file (mặc định: 1)")
+    init_parser.add_argument("--render-cache", default=os.environ.get("WB_AGENT_RENDER_CACHE"),
+                             help="Thư mục cache nội dung template đã render (mặc định: $WB_AGENT_RENDER_CACHE)")
+    init_parser.add_argument("--atomic", action="store_true",
+                             help="Ghi vào thư mục tạm rồi rename một lượt (bị ngắt giữa chừng không để lại file dở)")
+    _add_scan_limit_arguments(init_parser)
 
     # list-skills
     subparsers.add_parser("list-skills", help="Liệt kê tất cả skills")
@@ -306,6 +600,73 @@ Quy trình dự án CÓ SẴN:
     # validate
     validate_parser = subparsers.add_parser("validate", help="Validate cấu trúc .agent/")
     validate_parser.add_argument("--target", "-t", help="Thư mục đích (mặc định: thư mục hiện tại)")
+    validate_parser.add_argument("--format", choices=["text", "json", "ndjson"], default="text",
+                                 help="Định dạng output (json/ndjson cho CI; mặc định: text)")
+    validate_parser.add_argument("--fail-fast", action="store_true", help="Dừng ngay ở check FAILED đầu tiên")
+
+    # status
+    status_parser = subparsers.add_parser("status", help="Progress dashboard từ .agent/specs/*/tasks.md")
+    status_parser.add_argument("--target", "-t", help="Thư mục đích (mặc định: thư mục hiện tại)")
+    status_parser.add_argument("--feature", help="Chỉ hiển thị 1 feature (tên thư mục trong .agent/specs/)")
+    status_parser.add_argument("--brief", action="store_true", help="1 dòng / feature (cho project nhiều spec)")
+    status_parser.add_argument("--format", choices=["text", "json"], default="text", help="Định dạng output")
+
+    # tasks
+    tasks_parser = subparsers.add_parser("tasks", help="Công cụ cho .agent/specs/*/tasks.md")
+    tasks_subparsers = tasks_parser.add_subparsers(dest="tasks_command", required=True)
+    plan_parser = tasks_subparsers.add_parser("plan", help="DAG dependency → waves song song + critical path")
+    plan_parser.add_argument("--target", "-t", help="Thư mục đích (mặc định: thư mục hiện tại)")
+    plan_parser.add_argument("--feature", help="Chỉ lập plan cho 1 feature (tên thư mục trong .agent/specs/)")
+    plan_parser.add_argument("--max-parallel", type=int, default=None,
+                             help="Số task tối đa mỗi wave (= số implementer agent chạy cùng lúc)")
+    plan_parser.add_argument("--format", choices=["text", "json"], default="text", help="Định dạng output")
+
+    # diff
+    diff_parser = subparsers.add_parser("diff", help="So sánh plan.md / tasks.md với code (file, endpoint, model)")
+    diff_parser.add_argument("--target", "-t", help="Thư mục đích (mặc định: thư mục hiện tại)")
+    diff_parser.add_argument("--feature", help="Chỉ so sánh 1 feature (tên thư mục trong .agent/specs/)")
+    diff_parser.add_argument("--strict", action="store_true",
+                             help="Exit 1 cả khi có artifact chưa implement / đổi tên (mặc định: chỉ khi task đã xong mà thiếu)")
+    diff_parser.add_argument("--jobs", "-j", type=int, default=1, help="Số thread song song khi quét (mặc định: 1)")
+    diff_parser.add_argument("--format", choices=["text", "json"], default="text", help="Định dạng output")
+
+    # watch
+    watch_parser = subparsers.add_parser("watch", help="Tự cập nhật knowledge base khi code thay đổi")
+    watch_parser.add_argument("--target", "-t", help="Thư mục đích (mặc định: thư mục hiện tại)")
+    watch_parser.add_argument("--mode", choices=["auto", "inotify", "poll"], default="auto",
+                              help="Cơ chế theo dõi (auto: inotify nếu có, không thì polling)")
+    watch_parser.add_argument("--debounce", type=float, default=0.3,
+                              help="Số giây im lặng trước khi cập nhật (mặc định: 0.3)")
+    watch_parser.add_argument("--interval", type=float, default=1.0, help="Chu kỳ polling, giây (mặc định: 1.0)")
+    watch_parser.add_argument("--jobs", "-j", type=int, default=1, help="Số thread song song khi quét (mặc định: 1)")
+
+    # export-issues
+    export_parser = subparsers.add_parser("export-issues", help="tasks.md → file import issue (GitHub/GitLab/Jira)")
+    export_parser.add_argument("--target", "-t", help="Thư mục đích (mặc định: thư mục hiện tại)")
+    export_parser.add_argument("--feature", help="Chỉ export 1 feature (tên thư mục trong .agent/specs/)")
+    export_parser.add_argument("--tracker", choices=["github", "gitlab", "jira"], default="github", help="Issue tracker đích")
+    export_parser.add_argument("--format", choices=["json", "csv"], default="json", help="Định dạng file export")
+    export_parser.add_argument("--output", "-o", help="File export (mặc định: .agent/memory/issues-export.[<feature>.]<tracker>.<format>)")
+    export_parser.add_argument("--all", action="store_true", help="Export lại mọi task (bỏ qua so sánh hash trong ledger)")
+    export_parser.add_argument("--dry-run", action="store_true", help="Chỉ báo số task mới/đổi, không ghi file")
+    export_parser.add_argument("--jira-project", default="WB", help="Jira project key (mặc định: WB)")
+    export_parser.add_argument("--mock-tracker", help="Áp dụng export vào tracker giả (file JSON local) để kiểm thử")
+    export_parser.add_argument("--confirm", action="store_true",
+                               help="Đã import file export vào tracker → ghi delta vào sync ledger (kèm --feature: chỉ feature đó)")
+
+    # fleet
+    fleet_parser = subparsers.add_parser("fleet", help="Chạy init/validate/refresh trên nhiều repo song song")
+    fleet_parser.add_argument("action", choices=FLEET_ACTIONS, help="Hành động cho mỗi repo")
+    fleet_parser.add_argument("targets", nargs="*", help="Thư mục hoặc glob (VD: 'services/*')")
+    fleet_parser.add_argument("--from-file", help="File chứa danh sách thư mục (mỗi dòng 1 path/glob)")
+    fleet_parser.add_argument("--jobs", "-j", type=int, default=None, help="Số process song song (mặc định: số CPU)")
+    fleet_parser.add_argument("--type", help="Loại dự án cho repo chưa có .agent/project.json (mặc định: fullstack)")
+    fleet_parser.add_argument("--force", "-f", action="store_true", help="init: ghi đè repo đã có .agent/")
+    fleet_parser.add_argument("--render-cache", default=os.environ.get("WB_AGENT_RENDER_CACHE"),
+                              help="Thư mục cache nội dung template đã render (mặc định: $WB_AGENT_RENDER_CACHE)")
+    fleet_parser.add_argument("--atomic", action="store_true",
+                              help="init/refresh: ghi qua thư mục tạm rồi rename một lượt")
+    _add_scan_limit_arguments(fleet_parser)
 
     # version
     subparsers.add_parser("version", help="Hiển thị phiên bản")
@@ -321,10 +682,18 @@ Quy trình dự án CÓ SẴN:
         "list-skills": cmd_list_skills,
         "list-workflows": cmd_list_workflows,
         "validate": cmd_validate,
+        "status": cmd_status,
+        "tasks": cmd_tasks,
+        "diff": cmd_diff,
+        "watch": cmd_watch,
+        "export-issues": cmd_export_issues,
+        "fleet": cmd_fleet,
         "version": cmd_version,
     }
 
-    commands[args.command](args)
+    exit_code = commands[args.command](args)
+    if exit_code:
+        sys.exit(exit_code)
 
 
 if __name__ == "__main__":
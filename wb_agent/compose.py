@@ -0,0 +1,322 @@
+"""
+Compose - Phân tích docker-compose thành model có kiểu (services, ports, volumes, networks).
+
+Quy trình:
+  1. Tìm file: base (file đầu tiên có trong docker-compose.yml | compose.yml ...) + biến thể cùng stem
+     `<stem>.override.yml`, `<stem>.prod.yml`, `<stem>.dev.yml`, ... (mỗi biến thể tối đa 1 file)
+  2. Mỗi file: parse bằng mini_yaml (stream từng dòng), giải `include:` đệ quy
+  3. Deep-merge (giống `docker compose -f ... -f ...`):
+       - model chính = base → override (những gì `docker compose up` tự nạp)
+       - mỗi môi trường khác (prod, staging, dev...) = base → biến thể đó, là model RIÊNG —
+         không gộp các môi trường vào nhau (stack đó không tồn tại thật)
+  4. Giải `extends:` của từng service (cùng file hoặc file khác)
+  5. Chuẩn hoá ports / volumes / networks / depends_on thành dict JSON-serializable
+
+Chỉ dùng stdlib; mọi đường dẫn là relpath (dấu "/") tính từ thư mục project.
+"""
+
+import posixpath
+import re
+
+from .mini_yaml import YamlError, load
+
+COMPOSE_BASE_FILES = ("docker-compose.yml", "docker-compose.yaml", "compose.yml", "compose.yaml")
+
+# "override" được docker compose tự nạp cùng base; các biến thể còn lại là môi trường riêng
+OVERRIDE_VARIANT = "override"
+ENVIRONMENT_VARIANTS = ("dev", "development", "local", "test", "staging", "prod", "production")
+COMPOSE_VARIANTS = (OVERRIDE_VARIANT,) + ENVIRONMENT_VARIANTS
+PROD_VARIANTS = ("prod", "production")
+
+# Key service mà giá trị sequence bị GHI ĐÈ khi merge (thay vì gộp) — theo compose spec
+_OVERRIDE_SEQUENCE_KEYS = frozenset({"command", "entrypoint", "test"})
+
+_MAX_DEPTH = 8  # include / extends lồng nhau tối đa
+_INTERPOLATION_RE = re.compile(r"\$\{[^}]*\}")
+
+
+def compose_variant_candidates(base_file):
+    """Yield (variant, [relpath ứng viên]) theo thứ tự merge cho file base đã chọn.
+
+    Biến thể đi theo stem của base (docker-compose.yml → docker-compose.override.yml, không lấy
+    compose.override.yml); ứng viên xếp đuôi của base trước — chỉ file đầu tiên tồn tại được dùng.
+    """
+    stem, _, ext = base_file.rpartition(".")
+    extensions = [ext] + [e for e in ("yml", "yaml") if e != ext]
+    for variant in COMPOSE_VARIANTS:
+        yield variant, [f"{stem}.{variant}.{e}" for e in extensions]
+
+
+# =============================================================================
+# MERGE
+# =============================================================================
+def _as_mapping(value):
+    """depends_on / networks dạng list → dict (để merge theo key)."""
+    if isinstance(value, list):
+        return {str(item): {} for item in value if item is not None}
+    return value
+
+
+def _merge(base, override, key=None):
+    """Deep-merge kiểu compose: dict đệ quy, list gộp không trùng, scalar ghi đè."""
+    if key in ("depends_on", "networks"):
+        base, override = _as_mapping(base), _as_mapping(override)
+    if isinstance(base, dict) and isinstance(override, dict):
+        result = dict(base)
+        for k, v in override.items():
+            result[k] = _merge(result[k], v, k) if k in result else v
+        return result
+    if isinstance(base, list) and isinstance(override, list) and key not in _OVERRIDE_SEQUENCE_KEYS:
+        result = list(base)
+        for item in override:
+            if item not in result:
+                result.append(item)
+        return result
+    return override
+
+
+# =============================================================================
+# NORMALIZE
+# =============================================================================
+def _split_outside_interpolation(text, sep):
+    """Tách theo `sep` nhưng không cắt bên trong ${VAR:-default}."""
+    placeholders = []
+
+    def _protect(match):
+        placeholders.append(match.group(0))
+        return f"\0{len(placeholders) - 1}\0"
+
+    parts = _INTERPOLATION_RE.sub(_protect, text).split(sep)
+    return [re.sub(r"\0(\d+)\0", lambda m: placeholders[int(m.group(1))], part) for part in parts]
+
+
+def parse_port(entry):
+    """Port short syntax `[ip:][host:]container[/proto]` hoặc long syntax → dict, None nếu không hợp lệ."""
+    if isinstance(entry, dict):
+        target = entry.get("target")
+        if target is None:
+            return None
+        published = entry.get("published")
+        return {
+            "host_ip": entry.get("host_ip"),
+            "published": str(published) if published is not None else None,
+            "target": str(target),
+            "protocol": entry.get("protocol") or "tcp",
+        }
+    if entry is None or isinstance(entry, (list, bool)):
+        return None
+
+    text = str(entry).strip()
+    protocol = "tcp"
+    if "/" in text and not text.endswith("}"):
+        text, _, protocol = text.rpartition("/")
+    parts = _split_outside_interpolation(text, ":")
+    if len(parts) > 3 or not all(parts):
+        return None
+    host_ip = parts[0] if len(parts) == 3 else None
+    published = parts[-2] if len(parts) >= 2 else None
+    return {"host_ip": host_ip, "published": published, "target": parts[-1], "protocol": protocol}
+
+
+def format_port(service, port):
+    """Dạng hiển thị "svc: host:container" (giữ tương thích profile cũ)."""
+    mapping = f"{port['published']}:{port['target']}" if port["published"] else port["target"]
+    if port["protocol"] != "tcp":
+        mapping += f"/{port['protocol']}"
+    return f"{service}: {mapping}"
+
+
+def parse_volume(entry):
+    """Volume short syntax `[source:]target[:mode]` hoặc long syntax → dict."""
+    if isinstance(entry, dict):
+        return {
+            "type": entry.get("type") or "volume",
+            "source": entry.get("source"),
+            "target": entry.get("target"),
+            "read_only": bool(entry.get("read_only")),
+        }
+    if entry is None:
+        return None
+
+    parts = _split_outside_interpolation(str(entry).strip(), ":")
+    # Ổ đĩa Windows "C:\..." → ghép lại
+    if len(parts) > 1 and len(parts[0]) == 1 and parts[1][:1] in ("\\", "/"):
+        parts[:2] = [parts[0] + ":" + parts[1]]
+    if len(parts) == 1:
+        return {"type": "volume", "source": None, "target": parts[0], "read_only": False}
+
+    source, target = parts[0], parts[1]
+    mode = parts[2] if len(parts) > 2 else ""
+    is_bind = source.startswith((".", "/", "~", "$")) or (len(source) > 1 and source[1] == ":")
+    return {
+        "type": "bind" if is_bind else "volume",
+        "source": source,
+        "target": target,
+        "read_only": "ro" in mode.split(","),
+    }
+
+
+def _names(value):
+    """depends_on / networks / profiles (list hoặc dict) → list tên."""
+    if isinstance(value, dict):
+        return [str(k) for k in value]
+    if isinstance(value, list):
+        return [str(v) for v in value if v is not None]
+    if isinstance(value, str):
+        return [value]
+    return []
+
+
+def _build_context(build):
+    if isinstance(build, dict):
+        return build.get("context") or "."
+    return str(build) if build is not None else None
+
+
+def _normalize_service(name, spec, files):
+    spec = spec if isinstance(spec, dict) else {}
+    ports = [p for p in (parse_port(e) for e in spec.get("ports") or []) if p]
+    volumes = [v for v in (parse_volume(e) for e in spec.get("volumes") or []) if v]
+    return {
+        "image": spec.get("image"),
+        "build": _build_context(spec.get("build")),
+        "ports": ports,
+        "volumes": volumes,
+        "networks": _names(spec.get("networks")),
+        "depends_on": _names(spec.get("depends_on")),
+        "profiles": _names(spec.get("profiles")),
+        "files": files,
+    }
+
+
+# =============================================================================
+# ANALYZER
+# =============================================================================
+class ComposeAnalyzer:
+    """Gộp các compose file của 1 project.
+
+    `read_lines(rel)` trả về iterable các dòng của file, `is_file(rel)` → bool.
+    Truyền hàm của _DetectorContext để mọi file đọc được ghi vào cache dependency.
+    """
+
+    def __init__(self, read_lines, is_file):
+        self._read_lines = read_lines
+        self._is_file = is_file
+        self._documents = {}  # rel → document đã giải include (dùng chung giữa các lần analyze)
+        self._closure = {}  # rel → [rel + mọi file include của nó]
+        self._errors = {}  # rel → lỗi parse (file sai cú pháp được coi là rỗng)
+        self.files = []  # file tạo nên model của lần analyze() gần nhất (kể cả include / extends)
+
+    def _resolve(self, base_rel, path):
+        """Đường dẫn tương đối với file khai báo → relpath; None nếu ra ngoài project."""
+        rel = posixpath.normpath(posixpath.join(posixpath.dirname(base_rel), str(path)))
+        if rel.startswith("../") or rel == ".." or posixpath.isabs(rel):
+            return None
+        return rel
+
+    def load_file(self, rel, stack=()):
+        """Document của 1 file với `include:` đã được gộp vào (file include đứng trước)."""
+        if rel in self._documents:
+            self._record(self._closure[rel])
+            return self._documents[rel]
+        if rel in stack or len(stack) > _MAX_DEPTH or not self._is_file(rel):
+            return {}
+
+        try:
+            document = load(self._read_lines(rel))
+        except YamlError as e:
+            self._errors[rel] = str(e)
+            document = None
+        document = dict(document) if isinstance(document, dict) else {}
+        self._record([rel])
+        self._tag_services(document, rel)
+
+        merged = {}
+        closure = [rel]
+        for include in self._include_paths(document.pop("include", None)):
+            include_rel = self._resolve(rel, include)
+            if include_rel:
+                merged = _merge(merged, self.load_file(include_rel, stack + (rel,)))
+                closure.extend(self._closure.get(include_rel, ()))
+        merged = _merge(merged, document)
+        self._documents[rel] = merged
+        self._closure[rel] = closure
+        return merged
+
+    def _record(self, rels):
+        for rel in rels:
+            if rel not in self.files:
+                self.files.append(rel)
+
+    @staticmethod
+    def _include_paths(include):
+        for item in include if isinstance(include, list) else [include]:
+            if isinstance(item, dict):
+                item = item.get("path")
+            for path in item if isinstance(item, list) else [item]:
+                if isinstance(path, str) and path:
+                    yield path
+
+    @staticmethod
+    def _tag_services(document, rel):
+        """Ghi file nguồn vào key nội bộ `x-wb-files` của từng service (list → gộp khi merge)."""
+        services = document.get("services")
+        if not isinstance(services, dict):
+            return
+        for name, spec in list(services.items()):
+            spec = dict(spec) if isinstance(spec, dict) else {}
+            spec["x-wb-files"] = [rel]
+            services[name] = spec
+
+    def _extend(self, name, services, rel, stack=()):
+        """Giải `extends:` của service `name` trong `services` (thuộc file `rel`)."""
+        spec = services.get(name)
+        if not isinstance(spec, dict) or "extends" not in spec:
+            return spec
+        if (rel, name) in stack or len(stack) > _MAX_DEPTH:
+            return {k: v for k, v in spec.items() if k != "extends"}
+
+        extends = spec["extends"]
+        base_name = extends.get("service") if isinstance(extends, dict) else extends
+        base_file = extends.get("file") if isinstance(extends, dict) else None
+        base_services, base_rel = services, rel
+        if base_file:
+            base_rel = self._resolve(rel, base_file)
+            base_services = (self.load_file(base_rel).get("services") or {}) if base_rel else {}
+
+        base_spec = self._extend(base_name, base_services, base_rel, stack + ((rel, name),))
+        own = {k: v for k, v in spec.items() if k != "extends"}
+        if not isinstance(base_spec, dict):
+            return own
+        # depends_on của service gốc không được kế thừa (compose spec)
+        base_spec = {k: v for k, v in base_spec.items() if k not in ("depends_on", "x-wb-files")}
+        return _merge(base_spec, own)
+
+    def analyze(self, files):
+        """Gộp `files` theo thứ tự → {"files", "services", "volumes", "networks", "errors"}.
+
+        Gọi nhiều lần trên cùng analyzer (VD: base + override, base + prod) chỉ parse mỗi file 1 lần.
+        """
+        self.files = []
+        model = {}
+        service_origin = {}
+        for rel in files:
+            document = self.load_file(rel)
+            for name in document.get("services") or {}:
+                service_origin[name] = rel
+            model = _merge(model, document)
+
+        services = model.get("services") if isinstance(model.get("services"), dict) else {}
+        result = {}
+        for name in services:
+            spec = self._extend(name, services, service_origin.get(name, ""))
+            files_of = (spec or {}).get("x-wb-files") or []
+            result[str(name)] = _normalize_service(str(name), spec, files_of)
+
+        return {
+            "files": list(self.files),
+            "services": result,
+            "volumes": _names(model.get("volumes")),
+            "networks": _names(model.get("networks")),
+            "errors": [f"{rel}: {self._errors[rel]}" for rel in self.files if rel in self._errors],
+        }
@@ -0,0 +1,75 @@
+"""
+Env File - Parser file .env dạng stream (từng dòng), thời gian tuyến tính theo số dòng.
+
+Hỗ trợ cú pháp dotenv phổ biến:
+  - `export KEY=value`, khoảng trắng quanh `=`
+  - giá trị trong '...', "..." hoặc `...` — kể cả giá trị nhiều dòng
+  - comment `#` đầu dòng, và ` #` sau giá trị không quote
+  - KEY lặp lại → lần xuất hiện sau thắng (giống dotenv)
+"""
+
+import re
+
+# Thứ tự ưu tiên TĂNG DẦN — file sau ghi đè file trước (theo quy ước dotenv-flow, mode development)
+ENV_FILES = (
+    ".env.example",
+    ".env.sample",
+    ".env.template",
+    ".env.local.example",
+    ".env",
+    ".env.local",
+    ".env.development",
+    ".env.development.local",
+)
+
+_ASSIGN_RE = re.compile(r"(?:export\s+)?([A-Za-z_][A-Za-z0-9_.\-]*)\s*(?:=\s*(.*))?$")
+_QUOTES = ("'", '"', "`")
+
+
+def _scan_quoted(text, quote):
+    """Tìm dấu đóng `quote` trong `text` → (phần giá trị, đã đóng chưa). `\\` escape trong "..."."""
+    i = 0
+    while i < len(text):
+        char = text[i]
+        if char == "\\" and quote == '"':
+            i += 2
+            continue
+        if char == quote:
+            return text[:i], True
+        i += 1
+    return text, False
+
+
+def parse_env_lines(lines):
+    """Yield (key, value) theo thứ tự xuất hiện. `lines` là iterable bất kỳ (VD: file object).
+
+    Dòng `KEY` không có `=` cho value None. Dòng không phải phép gán hợp lệ bị bỏ qua.
+    """
+    lines = iter(lines)
+    for line in lines:
+        stripped = line.strip()
+        if not stripped or stripped.startswith("#"):
+            continue
+        match = _ASSIGN_RE.match(stripped)
+        if not match:
+            continue
+
+        key, raw = match.group(1), match.group(2)
+        if raw is None:
+            yield key, None
+            continue
+
+        quote = raw[:1]
+        if quote in _QUOTES:
+            value, closed = _scan_quoted(raw[1:], quote)
+            parts = [value]
+            # Giá trị nhiều dòng: đọc tiếp tới khi gặp dấu đóng (hoặc hết file)
+            while not closed:
+                next_line = next(lines, None)
+                if next_line is None:
+                    break
+                value, closed = _scan_quoted(next_line.rstrip("\r\n"), quote)
+                parts.append(value)
+            yield key, "\n".join(parts)
+        else:
+            yield key, raw.split(" #", 1)[0].strip()
@@ -0,0 +1,197 @@
+"""
+File Index - Duyệt cây thư mục MỘT lần duy nhất bằng os.scandir.
+Mọi phase của ProjectScanner đọc từ index trong bộ nhớ thay vì tự walk lại.
+
+Đường dẫn trong index luôn là đường dẫn tương đối so với root, ngăn cách bằng "/".
+Thư mục gốc có relpath là "".
+Các subtree bị ignore (xem ignore.py) bị cắt bỏ ngay khi duyệt — không bao giờ scandir vào.
+
+Build tăng dần: truyền `previous` (snapshot từ lần trước) → thư mục nào có mtime
+không đổi được dùng lại listing cũ, chỉ tốn 1 lần stat thay vì scandir.
+
+Truyền `budget` (scan_budget.ScanBudget) để giới hạn số file / độ sâu / thời gian;
+khi chạm giới hạn index dừng sớm và ghi lý do vào `truncated`.
+"""
+
+import os
+
+from .ignore import PACKAGE_MANIFEST, IgnoreRules
+from .scan_budget import DEADLINE, MAX_DEPTH, MAX_FILES
+
+
+def join_rel(rel, name):
+    """Nối relpath kiểu index ('' là root)."""
+    return f"{rel}/{name}" if rel else name
+
+
+class FileIndex:
+    """Snapshot cây thư mục của project, xây dựng bằng một lượt os.scandir."""
+
+    def __init__(self, root: str, ignore: IgnoreRules = None):
+        self.root = root
+        self.ignore = ignore
+        self._dirs = {}        # reldir -> [tên thư mục con] (đã sort)
+        self._files = {}       # reldir -> [tên file] (đã sort)
+        self._pruned = {}      # reldir -> [thư mục con bị ignore]
+        self._file_set = set()
+        self._by_name = {}     # tên file -> [relpath] theo thứ tự duyệt
+        self._unreadable = set()
+        self._snapshot = {}    # reldir -> [mtime_ns, dirs, files, descend] (chưa lọc ignore)
+        self._previous = {}
+        self._is_stable = None
+        self.dirs_scanned = 0
+        self.dirs_reused = 0
+        self.truncated = set()  # lý do index chưa đầy đủ (max_files / max_depth / deadline)
+
+    def build(self, previous=None, is_stable=None, budget=None):
+        """Duyệt cây (pre-order, tên đã sort) và dựng index trong bộ nhớ.
+
+        previous: snapshot() của lần build trước (dùng lại listing thư mục chưa đổi)
+        is_stable: callable(mtime_ns) → True nếu mtime đủ cũ để tin cậy
+        budget: ScanBudget — giới hạn max_files / max_depth / deadline (tuỳ chọn)
+        """
+        max_files = budget.max_files if budget else None
+        max_depth = budget.max_depth if budget else None
+        self._previous = previous or {}
+        self._is_stable = is_stable or (lambda mtime_ns: True)
+        if not os.path.isdir(self.root):
+            return self
+        if self.ignore is None:
+            self.ignore = IgnoreRules.for_project(self.root)
+
+        stack = [("", self.ignore)]
+        while stack:
+            if budget is not None and budget.expired():
+                self.truncated.add(DEADLINE)
+                break
+            rel, rules = stack.pop()
+            dirs, files, descend = self._list(rel)
+
+            # .gitignore lồng nhau áp dụng cho subtree của nó
+            if rel and ".gitignore" in files:
+                rules = rules.with_file(os.path.join(self.root, rel, ".gitignore"), rel)
+
+            package_root = PACKAGE_MANIFEST in files
+            pruned = [d for d in dirs if rules.is_ignored(join_rel(rel, d), True, package_root)]
+            if pruned:
+                self._pruned[rel] = pruned
+                pruned_set = set(pruned)
+                dirs = [d for d in dirs if d not in pruned_set]
+                descend = [d for d in descend if d not in pruned_set]
+            # File cấp root luôn giữ lại — Scanner đọc config gốc theo tên
+            if rel:
+                files = [f for f in files if not rules.is_ignored(join_rel(rel, f), False)]
+
+            if max_depth is not None and descend and (rel.count("/") + 1 if rel else 0) >= max_depth:
+                self.truncated.add(MAX_DEPTH)
+                descend = []
+            if max_files is not None and len(self._file_set) + len(files) > max_files:
+                self.truncated.add(MAX_FILES)
+                files = files[:max(0, max_files - len(self._file_set))]
+                stack.clear()
+                descend = []
+
+            self._dirs[rel] = dirs
+            self._files[rel] = files
+            for name in files:
+                relpath = join_rel(rel, name)
+                self._file_set.add(relpath)
+                self._by_name.setdefault(name, []).append(relpath)
+            # Đẩy ngược để pop ra đúng thứ tự sort
+            for name in reversed(descend):
+                stack.append((join_rel(rel, name), rules))
+        return self
+
+    def _list(self, rel):
+        """Liệt kê một thư mục. Symlink tới thư mục được liệt kê nhưng không đi vào."""
+        path = os.path.join(self.root, rel) if rel else self.root
+        try:
+            mtime_ns = os.stat(path).st_mtime_ns
+        except OSError:
+            mtime_ns = None
+
+        cached = self._previous.get(rel)
+        if (cached is not None and mtime_ns is not None
+                and cached[0] == mtime_ns and self._is_stable(mtime_ns)):
+            self.dirs_reused += 1
+            self._snapshot[rel] = cached
+            return list(cached[1]), list(cached[2]), list(cached[3])
+
+        self.dirs_scanned += 1
+        dirs, files, descend = [], [], []
+        try:
+            with os.scandir(path) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir():
+                            dirs.append(entry.name)
+                            if not entry.is_symlink():
+                                descend.append(entry.name)
+                        else:
+                            files.append(entry.name)
+                    except OSError:
+                        continue
+        except OSError:
+            self._unreadable.add(rel)
+            mtime_ns = None
+        dirs.sort()
+        files.sort()
+        descend.sort()
+        self._snapshot[rel] = [mtime_ns, dirs, files, descend]
+        return list(dirs), list(files), list(descend)
+
+    def snapshot(self):
+        """Listing thô (chưa lọc ignore) kèm mtime của mọi thư mục đã duyệt — để lưu cache."""
+        return self._snapshot
+
+    # =========================================================================
+    # QUERIES
+    # =========================================================================
+    def is_dir(self, rel):
+        """Thư mục đã được duyệt (có listing) hoặc là thư mục con được liệt kê."""
+        if rel in self._dirs:
+            return True
+        parent, _, name = rel.rpartition("/")
+        return name in self._dirs.get(parent, ())
+
+    def is_file(self, rel):
+        return rel in self._file_set
+
+    def listdir(self, rel):
+        """Trả về (dirs, files) của thư mục, hoặc None nếu không đọc được."""
+        if rel in self._unreadable or rel not in self._dirs:
+            return None
+        return self._dirs[rel], self._files[rel]
+
+    def pruned(self, rel):
+        """Thư mục con của `rel` đã bị ignore (không được duyệt)."""
+        return list(self._pruned.get(rel, ()))
+
+    def files_named(self, name):
+        """Tất cả file có đúng tên `name` ở mọi độ sâu."""
+        return list(self._by_name.get(name, ()))
+
+    def files_with_suffix(self, suffix):
+        """Tất cả file có tên kết thúc bằng `suffix` (VD: ".prisma"), sort theo relpath."""
+        paths = []
+        for name, rels in self._by_name.items():
+            if name.endswith(suffix):
+                paths.extend(rels)
+        return sorted(paths)
+
+    def walk(self, rel=""):
+        """Tương đương os.walk(rel) nhưng đọc từ bộ nhớ: yield (reldir, dirs, files)."""
+        if rel not in self._dirs:
+            return
+        stack = [rel]
+        while stack:
+            current = stack.pop()
+            dirs = self._dirs.get(current)
+            if dirs is None:
+                continue
+            yield current, list(dirs), list(self._files[current])
+            for name in reversed(dirs):
+                stack.append(join_rel(current, name))
+
+    def __len__(self):
+        return len(self._file_set)
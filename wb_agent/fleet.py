@@ -0,0 +1,190 @@
+"""
+Fleet - Chạy init / validate / refresh trên hàng trăm repo trong 1 lệnh.
+
+Không hỏi tương tác (không gọi input()). Mỗi repo chạy trong 1 process của pool;
+templates dùng chung được render 1 lần ở process cha (render_cache.warm) rồi nạp vào các worker.
+"""
+
+import glob
+import json
+import os
+import time
+
+FLEET_ACTIONS = ("init", "validate", "refresh")
+
+
+def expand_targets(patterns, from_file=None):
+    """Mở rộng danh sách thư mục / glob → list đường dẫn tuyệt đối (giữ thứ tự, bỏ trùng)."""
+    patterns = list(patterns or [])
+    if from_file:
+        with open(from_file, "r", encoding="utf-8") as f:
+            patterns.extend(line.strip() for line in f if line.strip() and not line.startswith("#"))
+
+    targets = []
+    seen = set()
+    for pattern in patterns:
+        pattern = os.path.expanduser(pattern)
+        matches = sorted(glob.glob(pattern)) if glob.has_magic(pattern) else [pattern]
+        for path in matches:
+            path = os.path.abspath(path)
+            if path not in seen and os.path.isdir(path):
+                seen.add(path)
+                targets.append(path)
+    return targets
+
+
+def _init_worker(rendered, render_cache_dir=None):
+    from . import render_cache
+
+    if render_cache_dir:
+        render_cache.configure_disk_cache(render_cache_dir)
+    render_cache.install(rendered)
+
+
+def _read_project_config(target):
+    try:
+        with open(os.path.join(target, ".agent", "project.json"), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _scan_budget(options):
+    from .scan_budget import ScanBudget
+
+    limits = options.get("scan_limits") or {}
+    return ScanBudget(**limits) if any(v is not None for v in limits.values()) else None
+
+
+def _fleet_init(target, options):
+    from .generator import ProjectGenerator
+    from .scanner import ProjectScanner
+
+    if os.path.isdir(os.path.join(target, ".agent")) and not options.get("force"):
+        return {"status": "skipped", "detail": ".agent/ đã tồn tại (dùng --force để ghi đè)"}
+
+    profile = ProjectScanner(target, use_cache=True, budget=_scan_budget(options)).scan()
+    generator = ProjectGenerator(
+        target_dir=target,
+        project_name=os.path.basename(target),
+        project_type=options.get("project_type") or "fullstack",
+        scan_profile=profile,
+        verbose=False,
+        atomic=bool(options.get("atomic")),
+    )
+    generator.generate()
+    stats = generator.stats
+    return {"status": "ok", "detail": f"{stats['skills']} skills, {stats['workflows']} workflows"}
+
+
+def _fleet_refresh(target, options):
+    from .generator import ProjectGenerator
+    from .scanner import ProjectScanner
+
+    if not os.path.isdir(os.path.join(target, ".agent")):
+        return {"status": "skipped", "detail": "Chưa có .agent/ — chạy fleet init trước"}
+
+    config = _read_project_config(target)
+    profile = ProjectScanner(target, use_cache=True, budget=_scan_budget(options)).scan()
+    generator = ProjectGenerator(
+        target_dir=target,
+        project_name=config.get("project_name") or os.path.basename(target),
+        project_type=config.get("project_type") or options.get("project_type") or "fullstack",
+        scan_profile=profile,
+        verbose=False,
+        atomic=bool(options.get("atomic")),
+    )
+    generator.refresh()
+    return {"status": "ok", "detail": f"{generator.stats['knowledge']} knowledge files"}
+
+
+def _fleet_validate(target, options):
+    from .validators import validate_agent_structure
+
+    agent_dir = os.path.join(target, ".agent")
+    if not os.path.isdir(agent_dir):
+        return {"status": "failed", "detail": "Không tìm thấy thư mục .agent/"}
+
+    checks = validate_agent_structure(agent_dir)
+    failed = [c["name"] for c in checks if not c["passed"]]
+    if failed:
+        return {"status": "failed", "detail": f"{len(failed)}/{len(checks)} checks FAILED: {', '.join(failed)}"}
+    return {"status": "ok", "detail": f"{len(checks)} checks PASSED"}
+
+
+_ACTION_HANDLERS = {
+    "init": _fleet_init,
+    "validate": _fleet_validate,
+    "refresh": _fleet_refresh,
+}
+
+
+def run_one(action, target, options):
+    """Chạy 1 action trên 1 repo — không bao giờ raise (lỗi được ghi vào kết quả)."""
+    started = time.perf_counter()
+    try:
+        result = _ACTION_HANDLERS[action](target, options)
+    except Exception as e:  # noqa: BLE001 — 1 repo lỗi không được làm hỏng cả fleet
+        result = {"status": "error", "detail": f"{type(e).__name__}: {e}"}
+    result["target"] = target
+    result["action"] = action
+    result["seconds"] = time.perf_counter() - started
+    return result
+
+
+def run_fleet(action, targets, jobs=None, options=None, on_result=None):
+    """Chạy `action` trên mọi target bằng process pool. Trả về kết quả theo thứ tự targets."""
+    options = options or {}
+    jobs = max(1, jobs or os.cpu_count() or 1)
+
+    rendered = None
+    render_cache_dir = options.get("render_cache")
+    if action in ("init", "refresh"):
+        from . import render_cache
+        if render_cache_dir:
+            render_cache.configure_disk_cache(render_cache_dir)
+        rendered = render_cache.warm()
+
+    results = {}
+    if jobs == 1 or len(targets) <= 1:
+        _init_worker(rendered, render_cache_dir)
+        for target in targets:
+            results[target] = run_one(action, target, options)
+            if on_result:
+                on_result(results[target])
+    else:
+        from concurrent.futures import ProcessPoolExecutor, as_completed
+
+        with ProcessPoolExecutor(max_workers=min(jobs, len(targets)),
+                                 initializer=_init_worker, initargs=(rendered, render_cache_dir)) as pool:
+            futures = {pool.submit(run_one, action, target, options): target for target in targets}
+            for future in as_completed(futures):
+                result = future.result()
+                results[futures[future]] = result
+                if on_result:
+                    on_result(result)
+
+    return [results[target] for target in targets]
+
+
+def format_summary(results, wall_seconds):
+    """Bảng tổng hợp kết quả + thời gian từng repo."""
+    icons = {"ok": "✅", "skipped": "⏭️ ", "failed": "❌", "error": "💥"}
+    lines = []
+    lines.append(f"{'─' * 70}")
+    lines.append(f"  {'Repo':<35} {'Status':<10} {'Time':>8}")
+    lines.append(f"  {'─' * 33}   {'─' * 8}   {'─' * 8}")
+    for r in results:
+        name = os.path.basename(r["target"]) or r["target"]
+        lines.append(f"  {icons.get(r['status'], '?')} {name:<32} {r['status']:<10} {r['seconds']:>7.2f}s")
+        if r["status"] != "ok" and r.get("detail"):
+            lines.append(f"     └─ {r['detail']}")
+
+    counts = {}
+    for r in results:
+        counts[r["status"]] = counts.get(r["status"], 0) + 1
+    total_cpu = sum(r["seconds"] for r in results)
+    lines.append(f"{'─' * 70}")
+    lines.append("  📊 " + " | ".join(f"{k}: {v}" for k, v in sorted(counts.items())))
+    lines.append(f"  ⏱️  Wall: {wall_seconds:.2f}s | Tổng thời gian các repo: {total_cpu:.2f}s")
+    return "\n".join(lines)
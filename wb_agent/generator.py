@@ -6,44 +6,61 @@ Tự động populate nội dung từ Scanner khi dự án có sẵn.
 
 import os
 import stat
+import json
+import hashlib
+import time
+from contextlib import contextmanager
 from datetime import datetime
 
-from .registry import (
-    SKILLS_REGISTRY, WORKFLOWS_REGISTRY, PROJECT_TYPES,
-    get_skills_for_project_type, get_workflows_for_project_type,
-)
-from .templates import (
-    SKILL_TEMPLATE_MAP,
-    WORKFLOW_TEMPLATE_MAP,
-    SCRIPT_TEMPLATE_MAP,
-    DOCUMENT_TEMPLATE_MAP,
-    doc_identity_template,
-    doc_seo_standards_template,
-    doc_antigravity_rules_template,
-    doc_cursor_rules_template,
-    doc_windsurf_rules_template,
-    doc_vscode_copilot_template,
-    doc_jetbrains_rules_template,
-    doc_kiro_steering_template,
-    doc_claude_md_template,
-    doc_agents_md_template,
-)
-from .scanner import ProjectScanner
+from .registry import PROJECT_TYPES, get_registry_index
+from .templates import SCRIPT_TEMPLATE_MAP, DOCUMENT_TEMPLATE_MAP
+from .render_cache import render
+from .scanner import KNOWLEDGE_BASE_FILES, ProjectScanner
+from .scan_cache import ensure_cache_dir
+from .staging import AdvisoryLock, StagedWriter, remove_stale_stages
+
+GENERATE_LOCK_FILE = "generate.lock"
+
+
+def _file_digest(filepath):
+    digest = hashlib.sha256()
+    try:
+        with open(filepath, "rb") as f:
+            for chunk in iter(lambda: f.read(65536), b""):
+                digest.update(chunk)
+    except OSError:
+        return None
+    return digest.digest()
+
+
+def _make_executable(filepath):
+    try:
+        os.chmod(filepath, os.stat(filepath).st_mode | stat.S_IEXEC)
+    except OSError:
+        pass
 
 
 class ProjectGenerator:
     """Sinh cấu trúc .agent/ cho project theo chuẩn Spec-Kit & ASF 3.3."""
 
-    def __init__(self, target_dir: str, project_name: str, project_type: str = "fullstack", scan_profile: dict = None):
+    def __init__(self, target_dir: str, project_name: str, project_type: str = "fullstack",
+                 scan_profile: dict = None, verbose: bool = True, atomic: bool = False,
+                 workers: int = 1):
         self.target_dir = target_dir
         self.project_name = project_name
         self.project_type = project_type
         self.scan_profile = scan_profile  # Kết quả từ ProjectScanner
         self.agent_dir = os.path.join(target_dir, ".agent")
+        self.verbose = verbose  # False → không in log (fleet mode chạy nhiều repo song song)
+        self.atomic = atomic  # True → ghi vào staging rồi commit bằng rename (xem staging.py)
+        self.workers = max(1, workers or 1)  # > 1 → ghi file qua writer pool (thread)
+        self._stage = None
+        self._pending = None  # path → (data, executable) chờ writer pool ghi
 
         # Lọc skills/workflows theo project type
-        self.filtered_skills = get_skills_for_project_type(project_type)
-        self.filtered_workflows = get_workflows_for_project_type(project_type)
+        registry = get_registry_index()
+        self.filtered_skills = registry.skills_for(project_type)
+        self.filtered_workflows = registry.workflows_for(project_type)
 
         self.stats = {
             "skills": 0,
@@ -54,37 +71,101 @@ class ProjectGenerator:
             "identity": 0,
             "knowledge": 0
         }
+        # Kết quả ghi file: mới tạo / nội dung thay đổi / giống hệt (bỏ qua)
+        self.write_stats = {"written": 0, "changed": 0, "skipped": 0}
+        # Thời gian từng bước (giây), theo thứ tự chạy
+        self.stage_timings = {}
+
+    def _log(self, message):
+        if self.verbose:
+            print(message)
+
+    @contextmanager
+    def _timed(self, stage_name):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stage_timings[stage_name] = self.stage_timings.get(stage_name, 0.0) + time.perf_counter() - started
+
+    @contextmanager
+    def _transaction(self):
+        """Giữ advisory lock trong suốt lần sinh; ở chế độ atomic thì gom file vào staging
+        và chỉ rename vào vị trí thật khi mọi bước đã xong (lỗi giữa chừng → bỏ staging)."""
+        lock_path = os.path.join(ensure_cache_dir(self.target_dir), GENERATE_LOCK_FILE)
+        with AdvisoryLock(lock_path, on_wait=lambda: self._log("⏳ Đang chờ tiến trình wb-agent khác...")):
+            remove_stale_stages(self.target_dir)
+            if self.atomic:
+                self._stage = StagedWriter(self.target_dir)
+            if self.workers > 1:
+                self._pending = {}
+            try:
+                yield
+                if self._pending:
+                    with self._timed("write"):
+                        self._flush_writes()
+                if self._stage is not None:
+                    with self._timed("commit"):
+                        self._stage.commit()
+            finally:
+                self._pending = None
+                if self._stage is not None:
+                    self._stage.cleanup()
+                    self._stage = None
+
+    def refresh(self):
+        """Chỉ cập nhật Identity + Knowledge Base từ scan mới (giữ nguyên skills/workflows)."""
+        with self._transaction():
+            self._log("🎭 Cập nhật Identity...")
+            with self._timed("identity"):
+                self._create_identity()
+            self._log("🧠 Cập nhật Knowledge Base...")
+            with self._timed("knowledge"):
+                self._create_knowledge_base()
 
     def generate(self):
         """Thực thi toàn bộ quá trình sinh cấu trúc."""
-        print("📁 Tạo cấu trúc thư mục (ASF 3.3 Standard)...")
-        self._create_directories()
+        with self._transaction():
+            self._generate()
+        self._print_stats()
 
-        print("🎭 Thiết lập Identity & Soul...")
-        self._create_identity()
+    def _generate(self):
+        self._log("📁 Tạo cấu trúc thư mục (ASF 3.3 Standard)...")
+        with self._timed("directories"):
+            self._create_directories()
 
-        print("🧠 Khởi tạo Knowledge Base...")
-        self._create_knowledge_base()
+        self._log("🎭 Thiết lập Identity & Soul...")
+        with self._timed("identity"):
+            self._create_identity()
 
-        print("🛠️ Tạo Skills (@mentions)...")
-        self._create_skills()
+        self._log("🧠 Khởi tạo Knowledge Base...")
+        with self._timed("knowledge"):
+            self._create_knowledge_base()
 
-        print("🔄 Tạo Workflows (/commands)...")
-        self._create_workflows()
+        self._log("🛠️ Tạo Skills (@mentions)...")
+        with self._timed("skills"):
+            self._create_skills()
 
-        print("📄 Tạo Templates & Memory...")
-        self._create_templates()
-        self._create_memory()
+        self._log("🔄 Tạo Workflows (/commands)...")
+        with self._timed("workflows"):
+            self._create_workflows()
 
-        print("🔧 Tạo Bash Scripts...")
-        self._create_scripts()
+        self._log("📄 Tạo Templates & Memory...")
+        with self._timed("templates"):
+            self._create_templates()
+            self._create_memory()
 
-        print("🖥️  Thiết lập Rules cho 8 IDE/Agent...")
-        self._create_ide_rules()
+        self._log("🔧 Tạo Bash Scripts...")
+        with self._timed("scripts"):
+            self._create_scripts()
 
-        self._create_project_config()
-        self._create_agent_readme()
-        self._print_stats()
+        self._log("🖥️  Thiết lập Rules cho 8 IDE/Agent...")
+        with self._timed("ide_rules"):
+            self._create_ide_rules()
+
+        with self._timed("config"):
+            self._create_project_config()
+            self._create_agent_readme()
 
     def _create_ide_rules(self):
         """Tạo rules files chuẩn cho 8 IDE/Agent — đúng path + format từng IDE."""
@@ -94,75 +175,70 @@ class ProjectGenerator:
         # Path: .agent/rules/wb-agent.md
         self._write_file(
             os.path.join(self.agent_dir, "rules", "wb-agent.md"),
-            doc_antigravity_rules_template(name)
+            render("doc", "doc_antigravity_rules_template", name)
         )
-        print("  ✅ Antigravity  → .agent/rules/wb-agent.md")
+        self._log("  ✅ Antigravity  → .agent/rules/wb-agent.md")
 
         # ─── 2. Cursor ──────────────────────────────────────
         # Path: .cursor/rules/wb-agent.mdc (YAML frontmatter, .mdc extension)
         cursor_dir = os.path.join(self.target_dir, ".cursor", "rules")
-        os.makedirs(cursor_dir, exist_ok=True)
         self._write_file(
             os.path.join(cursor_dir, "wb-agent.mdc"),
-            doc_cursor_rules_template(name)
+            render("doc", "doc_cursor_rules_template", name)
         )
-        print("  ✅ Cursor       → .cursor/rules/wb-agent.mdc")
+        self._log("  ✅ Cursor       → .cursor/rules/wb-agent.mdc")
 
         # ─── 3. Windsurf (Codeium) ──────────────────────────
         # Path: .windsurf/rules/wb-agent.md
         windsurf_dir = os.path.join(self.target_dir, ".windsurf", "rules")
-        os.makedirs(windsurf_dir, exist_ok=True)
         self._write_file(
             os.path.join(windsurf_dir, "wb-agent.md"),
-            doc_windsurf_rules_template(name)
+            render("doc", "doc_windsurf_rules_template", name)
         )
-        print("  ✅ Windsurf     → .windsurf/rules/wb-agent.md")
+        self._log("  ✅ Windsurf     → .windsurf/rules/wb-agent.md")
 
         # ─── 4. VS Code (GitHub Copilot) ────────────────────
         # Path: .github/copilot-instructions.md
         github_dir = os.path.join(self.target_dir, ".github")
-        os.makedirs(github_dir, exist_ok=True)
         self._write_file(
             os.path.join(github_dir, "copilot-instructions.md"),
-            doc_vscode_copilot_template(name)
+            render("doc", "doc_vscode_copilot_template", name)
         )
-        print("  ✅ VS Code      → .github/copilot-instructions.md")
+        self._log("  ✅ VS Code      → .github/copilot-instructions.md")
 
         # ─── 5. JetBrains (PhpStorm, WebStorm, PyCharm) ────
         # Path: .aiassistant/rules/wb-agent.md
         jb_dir = os.path.join(self.target_dir, ".aiassistant", "rules")
-        os.makedirs(jb_dir, exist_ok=True)
         self._write_file(
             os.path.join(jb_dir, "wb-agent.md"),
-            doc_jetbrains_rules_template(name)
+            render("doc", "doc_jetbrains_rules_template", name)
         )
-        print("  ✅ JetBrains    → .aiassistant/rules/wb-agent.md")
+        self._log("  ✅ JetBrains    → .aiassistant/rules/wb-agent.md")
 
         # ─── 6. Kiro (AWS) ──────────────────────────────────
         # Path: .kiro/steering/tech.md
         kiro_dir = os.path.join(self.target_dir, ".kiro", "steering")
-        os.makedirs(kiro_dir, exist_ok=True)
         self._write_file(
             os.path.join(kiro_dir, "tech.md"),
-            doc_kiro_steering_template(name)
+            render("doc", "doc_kiro_steering_template", name)
         )
-        print("  ✅ Kiro         → .kiro/steering/tech.md")
+        self._log("  ✅ Kiro         → .kiro/steering/tech.md")
 
         # ─── 7. Claude Code ─────────────────────────────────
         # Path: CLAUDE.md (root)
         self._write_file(
             os.path.join(self.target_dir, "CLAUDE.md"),
-            doc_claude_md_template(name)
+            render("doc", "doc_claude_md_template", name)
         )
-        print("  ✅ Claude Code  → CLAUDE.md")
+        self._log("  ✅ Claude Code  → CLAUDE.md")
 
         # ─── 8. GitHub Copilot Agent ────────────────────────
         # Path: AGENTS.md (root)
         self._write_file(
             os.path.join(self.target_dir, "AGENTS.md"),
-            doc_agents_md_template(name)
+            render("doc", "doc_agents_md_template", name)
         )
-        print("  ✅ GitHub Agent → AGENTS.md")
+        self._log("  ✅ GitHub Agent → AGENTS.md")
 
 
     def _create_directories(self):
@@ -186,7 +262,7 @@ class ProjectGenerator:
     def _create_identity(self):
         """Tạo Master Identity — có nhận biết Project Type + thông tin scan."""
         filepath = os.path.join(self.agent_dir, "identity", "master-identity.md")
-        content = doc_identity_template(self.project_name, self.project_type)
+        content = render("doc", "doc_identity_template", self.project_name, self.project_type)
 
         # Bổ sung context từ scanner
         if self.scan_profile and self.scan_profile.get("has_existing_code"):
@@ -208,30 +284,15 @@ class ProjectGenerator:
             scanner = ProjectScanner(self.target_dir)
             scanner.profile = self.scan_profile
 
-            print("  📖 Đang điền nội dung từ codebase thật...")
-
-            self._write_file(
-                os.path.join(base_path, "infrastructure.md"),
-                scanner.generate_infrastructure_content()
-            )
-            self._write_file(
-                os.path.join(base_path, "data_schema.md"),
-                scanner.generate_data_schema_content()
-            )
-            self._write_file(
-                os.path.join(base_path, "api_standards.md"),
-                scanner.generate_api_standards_content()
-            )
-            self._write_file(
-                os.path.join(base_path, "business_logic.md"),
-                scanner.generate_business_logic_content()
-            )
-            self.stats["knowledge"] += 4
+            self._log("  📖 Đang điền nội dung từ codebase thật...")
+
+            for name, method, _ in KNOWLEDGE_BASE_FILES:
+                self._write_file(os.path.join(base_path, name), getattr(scanner, method)())
+            self.stats["knowledge"] += len(KNOWLEDGE_BASE_FILES)
         else:
             # Dự án mới — dùng template placeholder
             infra_path = os.path.join(base_path, "infrastructure.md")
-            infra_template = DOCUMENT_TEMPLATE_MAP.get("infrastructure-template.md")
-            self._write_file(infra_path, infra_template())
+            self._write_file(infra_path, render("document", "infrastructure-template.md"))
 
             files = {
                 "business_logic.md": "# Business Logic\n\nĐịnh nghĩa logic nghiệp vụ cốt lõi tại đây.",
@@ -247,22 +308,18 @@ class ProjectGenerator:
         allowed_skills = type_info.get("includes_skills", [])
         if "web" in allowed_skills or "web_public" in allowed_skills:
             seo_path = os.path.join(base_path, "seo_standards.md")
-            self._write_file(seo_path, doc_seo_standards_template())
+            self._write_file(seo_path, render("doc", "doc_seo_standards_template"))
             self.stats["knowledge"] += 1
-            print("  🔍 SEO & GEO Standards → knowledge_base/seo_standards.md")
+            self._log("  🔍 SEO & GEO Standards → knowledge_base/seo_standards.md")
 
     def _create_skills(self):
         """Tạo SKILL.md cho mỗi skill — CHỈ tạo skills phù hợp project type."""
         for skill in self.filtered_skills:
             skill_name = skill["name"]
-            skill_dir = os.path.join(self.agent_dir, "skills", skill_name)
-            os.makedirs(skill_dir, exist_ok=True)
-            skill_file = os.path.join(skill_dir, "SKILL.md")
-
-            template_fn = SKILL_TEMPLATE_MAP.get(skill_name)
-            if template_fn:
-                content = template_fn()
-            else:
+            skill_file = os.path.join(self.agent_dir, "skills", skill_name, "SKILL.md")
+
+            content = render("skill", skill_name)
+            if content is None:
                 content = self._generate_basic_skill(skill)
 
             self._write_file(skill_file, content)
@@ -295,10 +352,8 @@ Bạn là **{skill['role']}**.
             filepath = os.path.join(self.agent_dir, "workflows", f"{cmd}.md")
 
             # Ưu tiên template chi tiết từ WORKFLOW_TEMPLATE_MAP
-            template_fn = WORKFLOW_TEMPLATE_MAP.get(cmd)
-            if template_fn:
-                content = template_fn()
-            else:
+            content = render("workflow", cmd)
+            if content is None:
                 # Fallback cho workflows không có template
                 content = f"---\ndescription: {wf['description']}\n---\n\n# Workflow: {cmd}\n\n1. Run @{wf['skills'][0] if wf['skills'] else 'speckit.tasks'}"
 
@@ -306,7 +361,7 @@ Bạn là **{skill['role']}**.
             self.stats["workflows"] += 1
 
     def _create_templates(self):
-        for filename, template_fn in DOCUMENT_TEMPLATE_MAP.items():
+        for filename in DOCUMENT_TEMPLATE_MAP:
             # Skip internal templates
             if filename in ("identity-template.md",):
                 continue
@@ -317,36 +372,39 @@ Bạn là **{skill['role']}**.
                 continue
 
             filepath = os.path.join(self.agent_dir, "templates", filename)
-            self._write_file(filepath, template_fn())
+            self._write_file(filepath, render("document", filename))
             self.stats["templates"] += 1
 
     def _create_memory(self):
         filepath = os.path.join(self.agent_dir, "memory", "constitution.md")
-        template_fn = DOCUMENT_TEMPLATE_MAP.get("constitution-template.md")
-        self._write_file(filepath, template_fn())
+        self._write_file(filepath, render("document", "constitution-template.md"))
 
     def _create_scripts(self):
-        for filename, script_fn in SCRIPT_TEMPLATE_MAP.items():
+        for filename in SCRIPT_TEMPLATE_MAP:
             filepath = os.path.join(self.agent_dir, "scripts", "bash", filename)
-            self._write_file(filepath, script_fn())
-            try:
-                os.chmod(filepath, os.stat(filepath).st_mode | stat.S_IEXEC)
-            except: pass
+            self._write_file(filepath, render("script", filename), executable=True)
             self.stats["scripts"] += 1
 
     def _create_project_config(self):
         """Lưu thông tin project type vào .agent/project.json."""
-        import json
+        filepath = os.path.join(self.agent_dir, "project.json")
+        # Giữ created_at của lần init đầu → re-init không đổi file nếu config không đổi
+        created_at = None
+        try:
+            with open(filepath, "r", encoding="utf-8") as f:
+                created_at = json.load(f).get("created_at")
+        except (OSError, ValueError, AttributeError):
+            pass
+
         config = {
             "project_name": self.project_name,
             "project_type": self.project_type,
             "asf_version": "3.3",
             "wb_agent_version": "1.0.0",
-            "created_at": datetime.now().isoformat(),
+            "created_at": created_at or datetime.now().isoformat(),
             "skills_count": self.stats["skills"],
             "workflows_count": self.stats["workflows"],
         }
-        filepath = os.path.join(self.agent_dir, "project.json")
         self._write_file(filepath, json.dumps(config, indent=2, ensure_ascii=False))
 
     def _create_agent_readme(self):
@@ -385,19 +443,89 @@ Bạn là **{skill['role']}**.
 """
         self._write_file(os.path.join(self.agent_dir, "README.md"), content)
 
-    def _write_file(self, filepath, content):
-        os.makedirs(os.path.dirname(filepath), exist_ok=True)
-        with open(filepath, "w", encoding="utf-8") as f:
-            f.write(content)
+    def _write_file(self, filepath, content, executable=False):
+        """Ghi file nếu nội dung khác bản trên đĩa (so size trước, rồi mới so hash).
+
+        Returns True nếu file được ghi. File giống hệt được giữ nguyên (không đổi mtime).
+        Có writer pool (workers > 1) → file được xếp hàng, ghi khi flush; trả về None.
+        """
+        # Giữ newline như text mode ("\n" → os.linesep)
+        if os.linesep != "\n":
+            content = content.replace("\n", os.linesep)
+        data = content.encode("utf-8")
+
+        if self._pending is not None:
+            # Ghi lại cùng path → bản sau thắng, giống chế độ tuần tự
+            self._pending.pop(filepath, None)
+            self._pending[filepath] = (data, executable)
+            return None
+
+        result = self._emit(filepath, data, executable)
+        self.write_stats[result] += 1
+        return result != "skipped"
+
+    def _emit(self, filepath, data, executable, make_dirs=True):
+        """Ghi 1 file (an toàn khi chạy trong thread). Returns "written" | "changed" | "skipped"."""
+        try:
+            st = os.stat(filepath)
+        except OSError:
+            st = None
+
+        if st is not None and st.st_size == len(data) and _file_digest(filepath) == hashlib.sha256(data).digest():
+            if executable and not st.st_mode & stat.S_IEXEC:
+                _make_executable(filepath)
+            return "skipped"
+
+        result = "changed" if st is not None else "written"
+        if self._stage is not None:
+            # Giữ quyền của file cũ (rename sẽ thay cả inode)
+            staged_path = self._stage.stage(filepath, data, stat.S_IMODE(st.st_mode) if st is not None else None)
+            if executable:
+                _make_executable(staged_path)
+            return result
+
+        if make_dirs:
+            os.makedirs(os.path.dirname(filepath), exist_ok=True)
+        with open(filepath, "wb") as f:
+            f.write(data)
+        if executable:
+            _make_executable(filepath)
+        return result
+
+    def _flush_writes(self):
+        """Ghi mọi file đang chờ bằng writer pool giới hạn `workers` thread.
+
+        Thư mục cha được tạo trước trong 1 lượt (cha trước con); mỗi path chỉ được ghi
+        đúng 1 lần nên nội dung cuối cùng không phụ thuộc thứ tự hoàn thành của các thread.
+        """
+        from concurrent.futures import ThreadPoolExecutor
+
+        pending, self._pending = self._pending, None
+        if self._stage is None:
+            for directory in sorted({os.path.dirname(path) for path in pending}):
+                os.makedirs(directory, exist_ok=True)
+
+        with ThreadPoolExecutor(max_workers=min(self.workers, len(pending))) as pool:
+            results = list(pool.map(
+                lambda item: self._emit(item[0], item[1][0], item[1][1], make_dirs=False),
+                pending.items(),
+            ))
+        for result in results:
+            self.write_stats[result] += 1
 
     def _print_stats(self):
         type_info = PROJECT_TYPES.get(self.project_type, {})
         type_label = type_info.get("label", self.project_type)
-        print(f"\n{'─' * 50}")
-        print(f"📊 Thống kê khởi tạo (ASF 3.3 — {type_label}):")
-        print(f"  🎭 Identity:  {self.stats['identity']}")
-        print(f"  🧠 Knowledge: {self.stats['knowledge']}")
-        print(f"  🛠️ Skills:    {self.stats['skills']}")
-        print(f"  🔄 Workflows: {self.stats['workflows']}")
-        print(f"  📄 Templates: {self.stats['templates']}")
-        print(f"{'─' * 50}\n")
+        self._log(f"\n{'─' * 50}")
+        self._log(f"📊 Thống kê khởi tạo (ASF 3.3 — {type_label}):")
+        self._log(f"  🎭 Identity:  {self.stats['identity']}")
+        self._log(f"  🧠 Knowledge: {self.stats['knowledge']}")
+        self._log(f"  🛠️ Skills:    {self.stats['skills']}")
+        self._log(f"  🔄 Workflows: {self.stats['workflows']}")
+        self._log(f"  📄 Templates: {self.stats['templates']}")
+        ws = self.write_stats
+        self._log(f"  💾 Files:     {ws['written']} mới, {ws['changed']} cập nhật, {ws['skipped']} không đổi")
+        if self.stage_timings:
+            timings = " · ".join(f"{name} {seconds * 1000:.0f}ms" for name, seconds in self.stage_timings.items())
+            self._log(f"  ⏱️  Stages:    {timings}")
+        self._log(f"{'─' * 50}\n")
@@ -0,0 +1,180 @@
+"""
+Ignore - Engine bỏ qua thư mục/file dùng chung cho mọi phase của Scanner.
+Kết hợp danh sách built-in + `.gitignore` + `.wbagentignore` (pattern đã compile sẵn).
+
+Quy tắc pattern theo chuẩn gitignore:
+  - `#` comment, `!` phủ định (un-ignore), `/` cuối = chỉ áp dụng thư mục
+  - Pattern chứa `/` được neo theo thư mục chứa file ignore, ngược lại match basename ở mọi cấp
+  - Hỗ trợ `*`, `?`, `[...]`, `**`
+"""
+
+import os
+import re
+
+# Thư mục vendored / cache của tool — KHÔNG BAO GIỜ đi vào, ở mọi độ sâu
+VENDOR_IGNORE_DIRS = frozenset({
+    "node_modules", ".git", "__pycache__", ".next", ".turbo", ".nuxt", ".svelte-kit",
+    ".venv", ".tox", ".mypy_cache", ".pytest_cache", ".pnpm-store", ".yarn",
+})
+
+# Build output / thư mục phụ — chỉ bỏ qua ngay dưới root project hoặc root package (có package.json).
+# Sâu hơn có thể là source thật (VD: app/api/build/route.ts) → để .gitignore / .wbagentignore quyết định
+ROOT_IGNORE_DIRS = frozenset({
+    ".agent", "dist", "build", ".cache", "coverage",
+    "test-output", "test-output-deep", "test-output-infra", "venv",
+})
+
+BUILTIN_IGNORE_DIRS = VENDOR_IGNORE_DIRS | ROOT_IGNORE_DIRS
+
+PACKAGE_MANIFEST = "package.json"
+
+# Thư mục tạm của generator (staging.py) — có thể còn sót nếu lần chạy trước bị ngắt
+BUILTIN_IGNORE_PREFIXES = (".wb-agent-stage-",)
+
+IGNORE_FILES = (".gitignore", ".wbagentignore")
+
+
+def _translate(pattern):
+    """Chuyển glob kiểu gitignore sang regex (không match qua '/')."""
+    i, n = 0, len(pattern)
+    out = []
+    while i < n:
+        c = pattern[i]
+        if c == "*":
+            if pattern.startswith("**/", i):
+                out.append("(?:.*/)?")
+                i += 3
+                continue
+            if pattern.startswith("**", i):
+                out.append(".*")
+                i += 2
+                continue
+            out.append("[^/]*")
+        elif c == "?":
+            out.append("[^/]")
+        elif c == "[":
+            j = pattern.find("]", i + 2)
+            if j == -1:
+                out.append("\\[")
+            else:
+                body = pattern[i + 1:j].replace("\\", "\\\\")
+                if body.startswith("!"):
+                    body = "^" + body[1:]
+                out.append(f"[{body}]")
+                i = j
+        elif c == "\\" and i + 1 < n:
+            i += 1
+            out.append(re.escape(pattern[i]))
+        else:
+            out.append(re.escape(c))
+        i += 1
+    return "".join(out)
+
+
+def parse_ignore_lines(lines):
+    """Parse nội dung file ignore → list (regex_source, negate, dir_only)."""
+    rules = []
+    for raw in lines:
+        line = raw.rstrip("\r\n")
+        if not line.strip() or line.startswith("#"):
+            continue
+        if not line.endswith("\\ "):
+            line = line.rstrip()
+
+        negate = line.startswith("!")
+        if negate:
+            line = line[1:]
+        elif line.startswith("\\!") or line.startswith("\\#"):
+            line = line[1:]
+
+        dir_only = line.endswith("/")
+        line = line.rstrip("/")
+        if not line:
+            continue
+
+        anchored = "/" in line
+        line = line.lstrip("/")
+        prefix = "" if anchored else "(?:.*/)?"
+        rules.append((f"{prefix}{_translate(line)}", negate, dir_only))
+    return rules
+
+
+class _RuleGroup:
+    """Các rule đến từ một file ignore, neo tại thư mục `base` (relpath)."""
+
+    def __init__(self, base, rules):
+        self.base = base
+        self.has_negation = any(neg for _, neg, _ in rules)
+        if self.has_negation:
+            self.ordered = [(re.compile(f"^{src}$"), neg, dir_only) for src, neg, dir_only in rules]
+            self.any_re = self.dir_re = None
+        else:
+            # Không có phủ định → gộp thành 1 regex cho mỗi loại (match 1 lần)
+            self.ordered = ()
+            any_src = [src for src, _, dir_only in rules if not dir_only]
+            dir_src = [src for src, _, dir_only in rules if dir_only]
+            self.any_re = re.compile("^(?:" + "|".join(any_src) + ")$") if any_src else None
+            self.dir_re = re.compile("^(?:" + "|".join(dir_src) + ")$") if dir_src else None
+
+    def apply(self, rel, is_dir, current):
+        if self.base:
+            if not rel.startswith(self.base + "/"):
+                return current
+            rel = rel[len(self.base) + 1:]
+
+        if not self.has_negation:
+            if self.any_re is not None and self.any_re.match(rel):
+                return True
+            if is_dir and self.dir_re is not None and self.dir_re.match(rel):
+                return True
+            return current
+
+        for regex, negate, dir_only in self.ordered:
+            if dir_only and not is_dir:
+                continue
+            if regex.match(rel):
+                current = not negate
+        return current
+
+
+class IgnoreRules:
+    """Tập rule bất biến; `with_file()` trả về bản mới có thêm rule (cho .gitignore lồng nhau)."""
+
+    def __init__(self, builtin=VENDOR_IGNORE_DIRS, root_builtin=ROOT_IGNORE_DIRS, groups=()):
+        self.builtin = builtin
+        self.root_builtin = root_builtin
+        self._groups = tuple(groups)
+
+    @classmethod
+    def for_project(cls, root):
+        """Rule cho project: built-in + `.gitignore` + `.wbagentignore` ở thư mục gốc."""
+        rules = cls()
+        for name in IGNORE_FILES:
+            rules = rules.with_file(os.path.join(root, name), "")
+        return rules
+
+    def with_file(self, path, base=""):
+        try:
+            with open(path, "r", encoding="utf-8", errors="replace") as f:
+                parsed = parse_ignore_lines(f)
+        except OSError:
+            return self
+        if not parsed:
+            return self
+        return IgnoreRules(self.builtin, self.root_builtin, self._groups + (_RuleGroup(base, parsed),))
+
+    def is_ignored(self, rel, is_dir, package_root=False):
+        """`rel` là relpath tính từ root project (ngăn cách bằng '/').
+
+        package_root: thư mục cha của `rel` là root 1 package (có package.json) → áp dụng cả
+        ROOT_IGNORE_DIRS như ngay dưới root project.
+        """
+        parent, _, name = rel.rpartition("/")
+        ignored = is_dir and (
+            name in self.builtin
+            or name.startswith(BUILTIN_IGNORE_PREFIXES)
+            or ((not parent or package_root) and name in self.root_builtin)
+        )
+        for group in self._groups:
+            ignored = group.apply(rel, is_dir, ignored)
+        return ignored
@@ -0,0 +1,109 @@
+"""
+Import Budget - Đo thời gian import của từng subcommand bằng `python -X importtime`.
+
+Mỗi lệnh chạy trong 1 interpreter mới; thời gian = tổng self-time của mọi module
+được import (trừ phần nền của interpreter rỗng), lấy min của vài lần chạy.
+Ngoài ngân sách ms còn có danh sách module CẤM — lệnh nhẹ (gọi từ git hook) không
+được nạp templates / generator / scanner.
+
+Chạy: python -m wb_agent.import_budget [--runs N] [-v]
+Exit code 1 nếu có lệnh vượt ngân sách hoặc nạp module cấm.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+
+# Module nặng chỉ dành cho init / fleet init|refresh
+HEAVY_MODULES = (
+    "wb_agent.generator",
+    "wb_agent.scanner",
+    "wb_agent.templates",
+    "wb_agent.skill_templates",
+    "wb_agent.workflow_templates",
+    "concurrent.futures",
+)
+
+# subcommand → (argv, ngân sách ms, module cấm)
+IMPORT_BUDGETS = {
+    "version": (["version"], 40, HEAVY_MODULES),
+    "list-skills": (["list-skills"], 40, HEAVY_MODULES),
+    "list-workflows": (["list-workflows"], 40, HEAVY_MODULES),
+    "validate": (["validate", "--format", "ndjson", "--target", "{target}"], 45, HEAVY_MODULES),
+    "status": (["status", "--target", "{target}"], 40, HEAVY_MODULES),
+}
+
+_RUNNER = "import sys; from wb_agent.cli import main; sys.argv = ['wb-agent'] + sys.argv[1:]; main()"
+
+
+def _parse_importtime(stderr):
+    """Trả về (tổng self-time µs, {module: self µs})."""
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue  # dòng header
+        modules[parts[2].strip()] = int(parts[0])
+    return sum(modules.values()), modules
+
+
+def _run(code, argv, cwd):
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [cwd, os.environ.get("PYTHONPATH")])))
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code, *argv],
+        cwd=cwd, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True,
+    )
+    return _parse_importtime(proc.stderr)
+
+
+def measure(runs=3):
+    """Đo mọi subcommand trong IMPORT_BUDGETS. Trả về list kết quả (dict)."""
+    package_parent = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    baseline = min(_run("pass", [], package_parent)[0] for _ in range(runs))
+
+    results = []
+    with tempfile.TemporaryDirectory() as target:
+        for command, (argv, budget_ms, forbidden) in IMPORT_BUDGETS.items():
+            argv = [arg.format(target=target) for arg in argv]
+            samples = [_run(_RUNNER, argv, package_parent) for _ in range(runs)]
+            total_us, modules = min(samples, key=lambda sample: sample[0])
+            elapsed_ms = max(0, total_us - baseline) / 1000
+            loaded = [m for m in modules if m.startswith("wb_agent")]
+            violations = [m for m in modules if m in forbidden or m.startswith(tuple(f + "." for f in forbidden))]
+            results.append({
+                "command": command,
+                "ms": elapsed_ms,
+                "budget_ms": budget_ms,
+                "modules": loaded,
+                "forbidden": violations,
+                "passed": elapsed_ms <= budget_ms and not violations,
+            })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Đo import-time budget của từng subcommand wb-agent")
+    parser.add_argument("--runs", type=int, default=3, help="Số lần đo mỗi lệnh (lấy min, mặc định: 3)")
+    parser.add_argument("--verbose", "-v", action="store_true", help="In danh sách module wb_agent được nạp")
+    args = parser.parse_args()
+
+    results = measure(max(1, args.runs))
+    print(f"\n  {'Lệnh':<16} {'Import':>9} {'Budget':>9}")
+    print(f"  {'─' * 16} {'─' * 9} {'─' * 9}")
+    for r in results:
+        status = "✅" if r["passed"] else "❌"
+        print(f"{status} {r['command']:<16} {r['ms']:>7.1f}ms {r['budget_ms']:>7}ms")
+        if r["forbidden"]:
+            print(f"     ⚠️  Nạp module cấm: {', '.join(r['forbidden'])}")
+        if args.verbose:
+            print(f"     📦 {', '.join(r['modules'])}")
+    print()
+    sys.exit(0 if all(r["passed"] for r in results) else 1)
+
+
+if __name__ == "__main__":
+    main()
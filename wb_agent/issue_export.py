@@ -0,0 +1,456 @@
+"""
+Issue Export - tasks.md → issue GitHub / GitLab / Jira (JSON hoặc CSV) + `.agent/memory/issues-export.md`.
+
+Không gọi network: chỉ sinh file để import (hoặc để 1 bước khác push lên tracker).
+Sync ledger `.agent/memory/issues-sync.json` lưu content hash của từng issue ĐÃ SYNC
+theo tracker → export chỉ xuất task mới / đã đổi, task bị xoá khỏi tasks.md là `removed`.
+
+Ledger chỉ tiến khi tracker thật sự nhận export:
+  - export ghi file + lưu delta vào `pending` của ledger, KHÔNG đánh dấu đã sync
+    → export lại trước khi import cho ra delta đầy đủ (gồm cả lần trước), không mất gì
+  - pending theo từng issue key: `--feature A` rồi `--feature B` giữ cả 2 delta, export lọc
+    theo feature chỉ thay phần pending của feature đó; file export mặc định có tên feature
+    (`issues-export.<feature>.<tracker>.<fmt>`) nên không ghi đè lẫn nhau
+  - `--confirm [--feature X]` (sau khi đã import file vào tracker) áp dụng delta pending vào ledger
+  - `--mock-tracker` áp dụng payload vào tracker giả rồi ghi ledger ngay
+JSON mang `removed` trong payload; CSV không có chỗ cho issue cần đóng nên removed key
+được ghi vào file kèm `<output>.removed.txt` (đóng thủ công trên tracker).
+MockTracker (file JSON local) nhận payload như tracker thật để kiểm thử toàn bộ vòng
+export → sync mà không cần token.
+"""
+
+import csv
+import hashlib
+import io
+import json
+import os
+import re
+
+from .status import iter_task_files
+from .tasks import parse_tasks
+
+TRACKERS = ("github", "gitlab", "jira")
+FORMATS = ("json", "csv")
+
+MEMORY_DIR = os.path.join(".agent", "memory")
+EXPORT_MARKDOWN = "issues-export.md"
+LEDGER_FILE = "issues-sync.json"
+LEDGER_SCHEMA = 1
+
+DEFAULT_JIRA_PROJECT = "WB"
+
+_PHASE_NUMBER_RE = re.compile(r"phase\s+(\d+)", re.IGNORECASE)
+_STORY_NUMBER_RE = re.compile(r"US(\d+)")
+
+
+# =============================================================================
+# TASK → ISSUE
+# =============================================================================
+def _labels(feature, task):
+    labels = [feature]
+    match = _PHASE_NUMBER_RE.search(task["phase"] or "")
+    if match:
+        labels.append(f"phase-{match.group(1)}")
+    if task["story"]:
+        labels.append(f"us-{_STORY_NUMBER_RE.match(task['story']).group(1)}")
+    if task["priority"]:
+        labels.append("priority")
+    return labels
+
+
+def _body(key, task):
+    lines = []
+    if task["phase"]:
+        lines.append(f"- Phase: {task['phase']}")
+    if task["story"]:
+        lines.append(f"- User story: {task['story']}")
+    for path in task["files"]:
+        lines.append(f"- File: `{path}`")
+    if task["depends_on"]:
+        lines.append(f"- Depends on: {', '.join(task['depends_on'])}")
+    lines.append("")
+    lines.append(f"<!-- wb-agent:{key} -->")  # key ổn định để tìm lại issue trên tracker
+    return "\n".join(lines)
+
+
+def build_issues(feature, tasks):
+    """Task của 1 feature → list issue trung lập (chưa theo format tracker nào)."""
+    issues = []
+    for task in tasks:
+        if not task["id"]:
+            continue  # không có ID → không có key ổn định để sync
+        key = f"{feature}/{task['id']}"
+        issue = {
+            "key": key,
+            "feature": feature,
+            "task_id": task["id"],
+            "title": f"{task['id']} - {task['title']}",
+            "body": _body(key, task),
+            "labels": _labels(feature, task),
+            "milestone": f"{feature}: {task['phase']}" if task["phase"] else feature,
+            "state": "closed" if task["done"] else "open",
+        }
+        issue["hash"] = content_hash(issue)
+        issues.append(issue)
+    return issues
+
+
+def content_hash(issue):
+    """Hash các trường hiển thị trên tracker — đổi title/body/label/milestone/state → hash đổi."""
+    payload = json.dumps([issue["title"], issue["body"], issue["labels"], issue["milestone"], issue["state"]],
+                         ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def collect_issues(target_dir, feature=None):
+    """Issue của mọi feature trong `.agent/specs/` (hoặc 1 feature)."""
+    issues = []
+    for name, rel, _ in iter_task_files(target_dir):
+        if feature and name != feature:
+            continue
+        with open(os.path.join(target_dir, rel), "r", encoding="utf-8", errors="replace") as f:
+            issues.extend(build_issues(name, parse_tasks(f)))
+    return issues
+
+
+def _in_feature(key, feature):
+    """Issue key `feature/Txxx` thuộc feature (None = mọi feature)."""
+    return feature is None or key.startswith(f"{feature}/")
+
+
+# =============================================================================
+# SYNC LEDGER
+# =============================================================================
+class SyncLedger:
+    """`.agent/memory/issues-sync.json`: {tracker: {key: {"hash", "number"}}}.
+
+    Nằm trong memory/ (không phải .cache/) vì mất ledger = export lại toàn bộ → issue trùng.
+    """
+
+    def __init__(self, target_dir):
+        self.path = os.path.join(target_dir, MEMORY_DIR, LEDGER_FILE)
+        self.trackers = {}
+        self.pending = {}  # tracker → {"issues": {key: hash}, "removed": [key]} — đã export, chờ --confirm
+
+    def load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return self
+        if data.get("schema") == LEDGER_SCHEMA:
+            self.trackers = data.get("trackers", {})
+            self.pending = data.get("pending", {})
+        return self
+
+    def diff(self, tracker, issues, feature=None, full=False):
+        """→ (added, changed, removed_keys). `changed` mang theo `number` đã biết trên tracker.
+
+        full=True: mọi issue đã có trong ledger đều vào `changed` (export lại toàn bộ, không tạo trùng).
+        """
+        entries = self.trackers.get(tracker, {})
+        added, changed = [], []
+        for issue in issues:
+            entry = entries.get(issue["key"])
+            if entry is None:
+                added.append(issue)
+            elif full or entry["hash"] != issue["hash"]:
+                changed.append(dict(issue, number=entry.get("number")))
+        current = {issue["key"] for issue in issues}
+        removed = sorted(key for key in entries if key not in current and _in_feature(key, feature))
+        return added, changed, removed
+
+    def record(self, tracker, issues, removed, numbers=None):
+        """Ghi nhận các issue đã export (numbers: key → số issue trên tracker, nếu biết)."""
+        entries = self.trackers.setdefault(tracker, {})
+        numbers = numbers or {}
+        for issue in issues:
+            previous = entries.get(issue["key"], {})
+            entries[issue["key"]] = {
+                "hash": issue["hash"],
+                "number": numbers.get(issue["key"], previous.get("number")),
+            }
+        for key in removed:
+            entries.pop(key, None)
+        recorded = {issue["key"] for issue in issues} | set(removed)
+        self._drop_pending(tracker, lambda key: key in recorded)
+
+    def _drop_pending(self, tracker, match):
+        """Bỏ các key pending thoả `match(key)` → True nếu có thay đổi."""
+        pending = self.pending.get(tracker)
+        if pending is None:
+            return False
+        before = len(pending["issues"]) + len(pending["removed"])
+        pending["issues"] = {key: digest for key, digest in pending["issues"].items() if not match(key)}
+        pending["removed"] = [key for key in pending["removed"] if not match(key)]
+        if not pending["issues"] and not pending["removed"]:
+            del self.pending[tracker]
+        return len(pending["issues"]) + len(pending["removed"]) != before
+
+    def clear_pending(self, tracker, feature=None):
+        """Bỏ delta pending của 1 feature (None = mọi feature) → True nếu có thay đổi."""
+        return self._drop_pending(tracker, lambda key: _in_feature(key, feature))
+
+    def set_pending(self, tracker, issues, removed, feature=None):
+        """Lưu delta vừa export. Thay phần pending cùng phạm vi (feature / toàn bộ) — delta mới đã
+        bao gồm nó; pending của feature khác giữ nguyên."""
+        self.clear_pending(tracker, feature)
+        pending = self.pending.setdefault(tracker, {"issues": {}, "removed": []})
+        pending["issues"].update((issue["key"], issue["hash"]) for issue in issues)
+        pending["removed"].extend(key for key in removed if key not in pending["removed"])
+        if not pending["issues"] and not pending["removed"]:
+            del self.pending[tracker]
+
+    def confirm(self, tracker, feature=None):
+        """Delta pending (của 1 feature hoặc mọi feature) đã được import vào tracker → ghi vào ledger.
+        Trả về delta đã ghi, hoặc None nếu không có."""
+        pending = self.pending.get(tracker)
+        if pending is None:
+            return None
+        confirmed = {
+            "issues": {key: digest for key, digest in pending["issues"].items() if _in_feature(key, feature)},
+            "removed": [key for key in pending["removed"] if _in_feature(key, feature)],
+        }
+        if not confirmed["issues"] and not confirmed["removed"]:
+            return None
+        issues = [{"key": key, "hash": digest} for key, digest in confirmed["issues"].items()]
+        self.record(tracker, issues, confirmed["removed"])
+        return confirmed
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"schema": LEDGER_SCHEMA, "trackers": self.trackers, "pending": self.pending},
+                      f, ensure_ascii=False, indent=2, sort_keys=True)
+            f.write("\n")
+        os.replace(tmp_path, self.path)
+
+
+# =============================================================================
+# TRACKER FORMATS
+# =============================================================================
+def to_github(issue):
+    """Payload cho `POST /repos/{owner}/{repo}/issues` (PATCH nếu có number).
+
+    `milestone` là tên — bước push cần đổi sang milestone number của repo.
+    """
+    return {"title": issue["title"], "body": issue["body"], "labels": issue["labels"],
+            "milestone": issue["milestone"], "state": issue["state"]}
+
+
+def to_gitlab(issue):
+    """Payload cho `POST /projects/:id/issues` (labels là chuỗi phân tách bằng dấu phẩy)."""
+    payload = {"title": issue["title"], "description": issue["body"], "labels": ",".join(issue["labels"]),
+               "milestone_title": issue["milestone"]}
+    if issue["state"] == "closed":
+        payload["state_event"] = "close"
+    return payload
+
+
+def to_jira(issue, project=DEFAULT_JIRA_PROJECT):
+    """Payload cho `POST /rest/api/2/issue` (label Jira không được chứa khoảng trắng)."""
+    return {"fields": {
+        "project": {"key": project},
+        "issuetype": {"name": "Task"},
+        "summary": issue["title"],
+        "description": issue["body"],
+        "labels": [label.replace(" ", "-") for label in issue["labels"]],
+        "fixVersions": [{"name": issue["milestone"]}],
+    }}
+
+
+# Cột CSV theo trình import của từng tracker
+CSV_COLUMNS = {
+    "github": ("title", "body", "labels", "milestone", "state"),
+    "gitlab": ("title", "description", "labels", "milestone", "state"),
+    "jira": ("Summary", "Description", "Labels", "Fix Version", "Status", "Issue Type"),
+}
+
+
+def _csv_row(tracker, issue):
+    if tracker == "jira":
+        # Jira CSV import tách label theo khoảng trắng
+        labels = " ".join(label.replace(" ", "-") for label in issue["labels"])
+        status = "Done" if issue["state"] == "closed" else "To Do"
+        return (issue["title"], issue["body"], labels, issue["milestone"], status, "Task")
+    return (issue["title"], issue["body"], ",".join(issue["labels"]), issue["milestone"], issue["state"])
+
+
+def render_payload(tracker, fmt, added, changed, removed, jira_project=DEFAULT_JIRA_PROJECT):
+    """Nội dung file export cho tracker theo format json / csv."""
+    if fmt == "csv":
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator="\n")
+        writer.writerow(CSV_COLUMNS[tracker])
+        for issue in added + changed:
+            writer.writerow(_csv_row(tracker, issue))
+        return buffer.getvalue()
+
+    def convert(issue):
+        if tracker == "jira":
+            return to_jira(issue, jira_project)
+        return to_github(issue) if tracker == "github" else to_gitlab(issue)
+
+    data = {
+        "tracker": tracker,
+        "create": [{"key": issue["key"], "payload": convert(issue)} for issue in added],
+        "update": [{"key": issue["key"], "number": issue.get("number"), "payload": convert(issue)} for issue in changed],
+        "removed": removed,
+    }
+    return json.dumps(data, ensure_ascii=False, indent=2) + "\n"
+
+
+def render_markdown(issues):
+    """`.agent/memory/issues-export.md` — toàn bộ issue, nhóm theo milestone (format của skill taskstoissues)."""
+    lines = ["# Issues Export", "", "> Generated by `wb-agent export-issues` — không sửa tay.", ""]
+    milestone = None
+    for issue in issues:
+        if issue["milestone"] != milestone:
+            milestone = issue["milestone"]
+            lines.extend([f"## Milestone: {milestone}", ""])
+        state = "✅ " if issue["state"] == "closed" else ""
+        lines.append(f"### {state}{issue['title']}")
+        lines.append(f"**Labels**: {', '.join(issue['labels'])}")
+        lines.append("**Description**:")
+        lines.extend(line for line in issue["body"].splitlines() if line and not line.startswith("<!--"))
+        lines.append("")
+    return "\n".join(lines)
+
+
+# =============================================================================
+# MOCK TRACKER
+# =============================================================================
+class MockTracker:
+    """Tracker giả lưu trong 1 file JSON — nhận đúng payload `render_payload(..., "json")`.
+
+    create → cấp number mới; update → ghi đè payload theo number; removed → đánh dấu deleted.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.issues = {}
+        self.next_number = 1
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self.issues = data.get("issues", {})
+            self.next_number = data.get("next_number", 1)
+        except (OSError, ValueError):
+            pass
+
+    def _find(self, key):
+        marker = f"<!-- wb-agent:{key} -->"
+        for number, issue in self.issues.items():
+            payload = issue["payload"]
+            fields = payload.get("fields", payload)
+            if marker in (fields.get("body") or fields.get("description") or ""):
+                return number
+        return None
+
+    def apply(self, export):
+        """Áp dụng payload export → {key: number} của các issue vừa tạo / cập nhật."""
+        numbers = {}
+        for item in export["create"]:
+            number = str(self.next_number)
+            self.next_number += 1
+            self.issues[number] = {"key": item["key"], "payload": item["payload"]}
+            numbers[item["key"]] = int(number)
+        for item in export["update"]:
+            number = str(item["number"]) if item.get("number") else self._find(item["key"])
+            if number is None:
+                number = str(self.next_number)
+                self.next_number += 1
+            self.issues[number] = {"key": item["key"], "payload": item["payload"]}
+            numbers[item["key"]] = int(number)
+        for key in export["removed"]:
+            number = self._find(key)
+            if number is not None:
+                self.issues[number]["deleted"] = True
+        return numbers
+
+    def save(self):
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump({"next_number": self.next_number, "issues": self.issues}, f, ensure_ascii=False, indent=2)
+            f.write("\n")
+
+
+# =============================================================================
+# EXPORT
+# =============================================================================
+def export_issues(target_dir, tracker="github", fmt="json", feature=None, full=False,
+                  output=None, mock_tracker=None, dry_run=False, jira_project=DEFAULT_JIRA_PROJECT):
+    """Chạy 1 lần export → dict tóm tắt
+    {"added", "changed", "removed", "unchanged", "output", "removed_output", "markdown", "applied"}.
+
+    full=True xuất lại mọi issue (issue đã sync thành update). dry_run=True không ghi file nào.
+    mock_tracker: path file JSON của MockTracker — payload được áp dụng ngay, number ghi vào ledger.
+    Không có mock_tracker: delta chỉ được lưu làm pending, chờ confirm_export() sau khi import.
+    """
+    issues = collect_issues(target_dir, feature)
+    ledger = SyncLedger(target_dir).load()
+    added, changed, removed = ledger.diff(tracker, issues, feature, full)
+
+    memory_dir = os.path.join(target_dir, MEMORY_DIR)
+    scope = f"{feature}." if feature else ""
+    output = output or os.path.join(memory_dir, f"issues-export.{scope}{tracker}.{fmt}")
+    markdown_path = os.path.join(memory_dir, EXPORT_MARKDOWN)
+    summary = {
+        "tracker": tracker,
+        "total": len(issues),
+        "added": [i["key"] for i in added],
+        "changed": [i["key"] for i in changed],
+        "removed": removed,
+        "unchanged": len(issues) - len(added) - len(changed),
+        "output": output,
+        "removed_output": None,
+        "markdown": markdown_path,
+        "applied": False,
+    }
+    if dry_run:
+        return summary
+
+    os.makedirs(memory_dir, exist_ok=True)
+    with open(markdown_path, "w", encoding="utf-8") as f:
+        f.write(render_markdown(issues))
+    if not (added or changed or removed):
+        summary["output"] = None  # không có gì mới → không ghi đè export lần trước
+        if ledger.clear_pending(tracker, feature):
+            ledger.save()  # tracker đã khớp tasks.md (trong phạm vi này) → delta pending cũ hết ý nghĩa
+        return summary
+
+    content = render_payload(tracker, fmt, added, changed, removed, jira_project)
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8", newline="") as f:
+        f.write(content)
+    removed_path = f"{os.path.splitext(output)[0]}.removed.txt"
+    if fmt == "csv" and removed:
+        summary["removed_output"] = removed_path
+        with open(removed_path, "w", encoding="utf-8") as f:
+            f.write("# Task đã bị xoá khỏi tasks.md — đóng issue tương ứng (marker <!-- wb-agent:KEY -->)\n")
+            f.writelines(f"{key}\n" for key in removed)
+    elif os.path.exists(removed_path):
+        os.remove(removed_path)  # của lần export trước — không còn đúng với delta này
+
+    if mock_tracker:
+        mock = MockTracker(mock_tracker)
+        export = content if fmt == "json" else render_payload(tracker, "json", added, changed, removed, jira_project)
+        numbers = mock.apply(json.loads(export))
+        mock.save()
+        ledger.record(tracker, added + changed, removed, numbers)
+        summary["applied"] = True
+    else:
+        ledger.set_pending(tracker, added + changed, removed, feature)
+    ledger.save()
+    return summary
+
+
+def confirm_export(target_dir, tracker="github", feature=None):
+    """Đánh dấu delta pending của tracker (1 feature hoặc tất cả) là đã import → {"issues", "removed"} hoặc None."""
+    ledger = SyncLedger(target_dir).load()
+    pending = ledger.confirm(tracker, feature)
+    if pending is not None:
+        ledger.save()
+    return pending
@@ -0,0 +1,421 @@
+"""
+Mini YAML - Parser YAML tối giản (chỉ stdlib) đủ cho file cấu hình như docker-compose.
+
+Đọc dạng stream từng dòng, không phụ thuộc độ thụt lề cố định (2 hay 4 space đều được).
+Hỗ trợ:
+  - block mapping / block sequence (kể cả `- key: value` và sequence cùng cột với key cha)
+  - flow `[a, b]`, `{a: 1}` (có thể trải nhiều dòng)
+  - scalar plain / 'single' / "double", comment `#`
+  - anchor `&x`, alias `*x`, merge key `<<: *x`
+  - block scalar `|` / `>` (giữ nội dung dạng text)
+Không hỗ trợ: tag, complex key `? `, nhiều document (chỉ đọc document đầu tiên).
+Thụt lề bằng tab (YAML không cho phép) → YamlError thay vì đoán cấu trúc.
+"""
+
+import re
+
+_INT_RE = re.compile(r"[-+]?\d+$")
+_FLOAT_RE = re.compile(r"[-+]?(\d+\.\d*|\.\d+)([eE][-+]?\d+)?$")
+_BOOL = {"true": True, "True": True, "TRUE": True, "false": False, "False": False, "FALSE": False}
+_NULL = {"", "~", "null", "Null", "NULL"}
+
+
+class YamlError(ValueError):
+    """File YAML sai cú pháp mà parser không thể hiểu đúng (VD: thụt lề bằng tab)."""
+
+
+class _Line:
+    __slots__ = ("indent", "text", "raw", "lineno")
+
+    def __init__(self, indent, text, raw, lineno=0):
+        self.indent = indent
+        self.text = text
+        self.raw = raw  # dòng gốc (cho block scalar)
+        self.lineno = lineno
+
+
+def _strip_comment(text):
+    """Bỏ comment `#` (đứng đầu hoặc sau khoảng trắng, ngoài quote)."""
+    if "#" not in text:
+        return text.rstrip()
+    quote = None
+    for i, char in enumerate(text):
+        if quote:
+            if char == quote:
+                quote = None
+        elif char in ("'", '"'):
+            quote = char
+        elif char == "#" and (i == 0 or text[i - 1] in " \t"):
+            return text[:i].rstrip()
+    return text.rstrip()
+
+
+def _flow_depth(text):
+    if "[" not in text and "{" not in text:
+        return 0
+    depth = 0
+    quote = None
+    for char in text:
+        if quote:
+            if char == quote:
+                quote = None
+        elif char in ("'", '"'):
+            quote = char
+        elif char in "[{":
+            depth += 1
+        elif char in "]}":
+            depth -= 1
+    return depth
+
+
+def _logical_lines(lines):
+    """Dòng có nội dung → _Line. Gộp flow collection nhiều dòng; dừng ở cuối document đầu tiên."""
+    pending = None
+    seen_content = False
+    for lineno, raw in enumerate(lines, 1):
+        raw = raw.rstrip("\r\n")
+        if pending is not None:
+            pending.text += " " + _strip_comment(raw).strip()
+            if _flow_depth(pending.text) <= 0:
+                yield pending
+                pending = None
+            continue
+
+        stripped = raw.lstrip(" ")
+        if stripped.startswith(("---", "...")) and stripped[3:4] in ("", " "):
+            if seen_content:
+                return
+            continue
+        text = _strip_comment(stripped)
+        if not text:
+            # Giữ dòng trống/comment cho block scalar (không ảnh hưởng phần còn lại)
+            yield _Line(None, "", raw, lineno)
+            continue
+        seen_content = True
+        line = _Line(len(raw) - len(stripped), text, raw, lineno)
+        if _flow_depth(text) > 0:
+            pending = line
+            continue
+        yield line
+    if pending is not None:
+        yield pending
+
+
+def _split_key(text):
+    """'key: value' → (key, value); None nếu không phải dòng mapping."""
+    if not any(char in text for char in "'\"[]{}\t"):
+        # Đường nhanh: không có quote / flow → chỉ cần tìm ": " đầu tiên
+        i = text.find(": ")
+        if i == -1:
+            i = len(text) - 1 if text.endswith(":") else -1
+        key = text[:i].strip() if i > 0 else ""
+        return (_scalar(key), text[i + 1:].strip()) if key else None
+    quote = None
+    depth = 0
+    start = 0
+    if text[:1] in ("'", '"'):
+        end = text.find(text[0], 1)
+        if end == -1:
+            return None
+        start = end + 1
+    for i in range(start, len(text)):
+        char = text[i]
+        if quote:
+            if char == quote:
+                quote = None
+        elif char in ("'", '"') and i == start:
+            quote = char
+        elif char in "[{":
+            if i == 0:
+                return None
+            depth += 1
+        elif char in "]}":
+            depth -= 1
+        elif char == ":" and depth == 0 and (i + 1 == len(text) or text[i + 1] in " \t"):
+            key = text[:i].strip()
+            if not key:
+                return None
+            return _scalar(key), text[i + 1:].strip()
+    return None
+
+
+def _unquote(text):
+    if text[0] == "'":
+        return text[1:-1].replace("''", "'")
+    body = text[1:-1]
+    if "\\" not in body:
+        return body
+    escapes = {"n": "\n", "t": "\t", '"': '"', "\\": "\\", "/": "/", "r": "\r", "0": "\0"}
+    out = []
+    i = 0
+    while i < len(body):
+        char = body[i]
+        if char == "\\" and i + 1 < len(body):
+            out.append(escapes.get(body[i + 1], body[i + 1]))
+            i += 2
+            continue
+        out.append(char)
+        i += 1
+    return "".join(out)
+
+
+def _scalar(text):
+    text = text.strip()
+    if len(text) >= 2 and text[0] in ("'", '"') and text[-1] == text[0]:
+        return _unquote(text)
+    if text in _NULL:
+        return None
+    if text in _BOOL:
+        return _BOOL[text]
+    if _INT_RE.match(text):
+        try:
+            return int(text)
+        except ValueError:
+            return text
+    if _FLOAT_RE.match(text):
+        return float(text)
+    return text
+
+
+class _FlowParser:
+    """Parser cho flow collection trên 1 chuỗi: [a, {b: c}, 'd']."""
+
+    def __init__(self, text, anchors):
+        self.text = text
+        self.pos = 0
+        self.anchors = anchors
+
+    def _skip(self):
+        while self.pos < len(self.text) and self.text[self.pos] in " \t":
+            self.pos += 1
+
+    def parse(self):
+        self._skip()
+        char = self.text[self.pos:self.pos + 1]
+        if char == "[":
+            return self._seq()
+        if char == "{":
+            return self._map()
+        return self._atom(",]}")
+
+    def _atom(self, stops):
+        self._skip()
+        start = self.pos
+        if self.text[self.pos:self.pos + 1] in ("'", '"'):
+            quote = self.text[self.pos]
+            self.pos += 1
+            while self.pos < len(self.text):
+                if self.text[self.pos] == "\\" and quote == '"':
+                    self.pos += 2
+                    continue
+                if self.text[self.pos] == quote:
+                    if quote == "'" and self.text[self.pos + 1:self.pos + 2] == "'":
+                        self.pos += 2
+                        continue
+                    break
+                self.pos += 1
+            self.pos += 1
+            return _scalar(self.text[start:self.pos])
+        while self.pos < len(self.text) and self.text[self.pos] not in stops:
+            if self.text[self.pos] == ":" and ":" in stops and self.text[self.pos + 1:self.pos + 2] in (" ", ",", "}", ""):
+                break
+            self.pos += 1
+        token = self.text[start:self.pos].strip()
+        if token.startswith("*"):
+            return self.anchors.get(token[1:])
+        return _scalar(token)
+
+    def _seq(self):
+        self.pos += 1
+        items = []
+        while True:
+            self._skip()
+            if self.pos >= len(self.text) or self.text[self.pos] == "]":
+                self.pos += 1
+                return items
+            if self.text[self.pos] == ",":
+                self.pos += 1
+                continue
+            char = self.text[self.pos]
+            items.append(self._seq() if char == "[" else self._map() if char == "{" else self._atom(",]"))
+
+    def _map(self):
+        self.pos += 1
+        result = {}
+        while True:
+            self._skip()
+            if self.pos >= len(self.text) or self.text[self.pos] == "}":
+                self.pos += 1
+                return result
+            if self.text[self.pos] == ",":
+                self.pos += 1
+                continue
+            key = self._atom(":,}")
+            self._skip()
+            value = None
+            if self.text[self.pos:self.pos + 1] == ":":
+                self.pos += 1
+                self._skip()
+                char = self.text[self.pos:self.pos + 1]
+                value = self._seq() if char == "[" else self._map() if char == "{" else self._atom(",}")
+            result[key] = value
+
+
+class _Parser:
+    def __init__(self, lines):
+        self._lines = _logical_lines(lines)
+        self._buffer = []
+        self.anchors = {}
+
+    # Lookahead trên generator (bỏ qua dòng trống trừ khi đọc block scalar)
+    def _peek(self, skip_blank=True):
+        while True:
+            if not self._buffer:
+                line = next(self._lines, None)
+                if line is None:
+                    return None
+                self._buffer.append(line)
+            line = self._buffer[0]
+            if skip_blank and line.indent is None:
+                self._buffer.pop(0)
+                continue
+            if skip_blank and line.text.startswith("\t"):
+                # Dòng cấu trúc (không phải nội dung block scalar `|` / `>`) thụt lề bằng tab
+                raise YamlError(f"dòng {line.lineno}: thụt lề bằng tab không hợp lệ trong YAML")
+            return line
+
+    def _advance(self):
+        return self._buffer.pop(0)
+
+    def parse(self):
+        line = self._peek()
+        if line is None:
+            return None
+        return self._node(line.indent)
+
+    def _node(self, indent):
+        line = self._peek()
+        if line is None or line.indent < indent:
+            return None
+        if line.text == "-" or line.text.startswith("- "):
+            return self._sequence(line.indent)
+        if _split_key(line.text) is not None:
+            return self._mapping(line.indent)
+        self._advance()
+        return self._value(line.text, line.indent)
+
+    def _mapping(self, indent):
+        result = {}
+        merged_keys = set()
+        while True:
+            line = self._peek()
+            if line is None or line.indent != indent:
+                break
+            pair = _split_key(line.text)
+            if pair is None:
+                break
+            self._advance()
+            key, rest = pair
+            value = self._value(rest, indent, allow_same_indent_seq=True)
+            if key == "<<":
+                # Merge key: key khai báo tường minh luôn thắng giá trị merge
+                sources = value if isinstance(value, list) else [value]
+                for source in sources:
+                    if isinstance(source, dict):
+                        for k, v in source.items():
+                            if k not in result or k in merged_keys:
+                                result[k] = v
+                                merged_keys.add(k)
+                continue
+            result[key] = value
+            merged_keys.discard(key)
+        return result
+
+    def _sequence(self, indent):
+        items = []
+        while True:
+            line = self._peek()
+            if line is None or line.indent != indent or not (line.text == "-" or line.text.startswith("- ")):
+                break
+            rest = line.text[1:].lstrip(" ")
+            if not rest:
+                self._advance()
+                nxt = self._peek()
+                items.append(self._node(nxt.indent) if nxt is not None and nxt.indent > indent else None)
+                continue
+            column = indent + len(line.text) - len(rest)
+            if (_split_key(rest) is not None or rest == "-" or rest.startswith("- ")) and rest[:1] not in "[{":
+                # `- key: value` → mapping/sequence lồng bắt đầu tại cột của `key`
+                line.indent = column
+                line.text = rest
+                items.append(self._node(column))
+            else:
+                self._advance()
+                items.append(self._value(rest, indent))
+        return items
+
+    def _value(self, rest, indent, allow_same_indent_seq=False):
+        anchor = None
+        if rest.startswith("&"):
+            anchor, _, rest = rest[1:].partition(" ")
+            rest = rest.strip()
+        if rest.startswith("!"):
+            rest = rest.partition(" ")[2].strip()  # bỏ qua tag
+
+        if rest.startswith("*"):
+            value = self.anchors.get(rest[1:].strip())
+        elif rest[:1] in ("|", ">"):
+            value = self._block_scalar(indent, folded=rest[0] == ">")
+        elif rest[:1] in ("[", "{"):
+            value = _FlowParser(rest, self.anchors).parse()
+        elif rest:
+            value = _scalar(rest)
+        else:
+            nxt = self._peek()
+            if nxt is not None and nxt.indent > indent:
+                value = self._node(nxt.indent)
+            elif (allow_same_indent_seq and nxt is not None and nxt.indent == indent
+                  and (nxt.text == "-" or nxt.text.startswith("- "))):
+                value = self._sequence(indent)  # "ports:\n- 80:80" (sequence cùng cột với key)
+            else:
+                value = None
+
+        if anchor:
+            self.anchors[anchor] = value
+        return value
+
+    def _block_scalar(self, indent, folded):
+        parts = []
+        block_indent = None
+        while True:
+            line = self._peek(skip_blank=False)
+            if line is None:
+                break
+            if line.indent is None:
+                # Dòng trống / dòng trông như comment: bên trong block thì là nội dung
+                raw_indent = len(line.raw) - len(line.raw.lstrip(" "))
+                if line.raw.strip() and raw_indent <= indent:
+                    break
+                self._advance()
+                parts.append(line.raw[block_indent:] if line.raw.strip() and block_indent else "")
+                continue
+            if line.indent <= indent:
+                break
+            self._advance()
+            if block_indent is None:
+                block_indent = line.indent
+            parts.append(line.raw[block_indent:])
+        while parts and parts[-1] == "":
+            parts.pop()
+        text = (" " if folded else "\n").join(parts)
+        return text + "\n" if parts else ""
+
+
+def load(lines):
+    """Parse YAML từ iterable các dòng (VD: file object) hoặc 1 chuỗi. Trả về dict/list/scalar.
+
+    Raise YamlError nếu file sai cú pháp theo cách không thể parse đúng.
+    """
+    if isinstance(lines, str):
+        lines = lines.splitlines()
+    return _Parser(lines).parse()
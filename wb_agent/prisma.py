@@ -0,0 +1,333 @@
+"""
+Prisma - Tokenizer schema Prisma (1 lượt / file, không regex backtracking) → graph model/enum/relation.
+
+Mỗi file .prisma được đọc dạng stream từng dòng; tokenizer theo dõi string và độ sâu
+ngoặc nên `}` / `//` nằm trong chuỗi (VD: @default("{}")) không làm lệch block.
+
+Nhóm file thành schema:
+  - File có block `datasource` là gốc của 1 schema
+  - Các file .prisma khác nằm trong cùng thư mục (hoặc thư mục con) với gốc gần nhất
+    thuộc schema đó — layout nhiều file `prismaSchemaFolder` (prisma/schema/*.prisma)
+  - File không thuộc gốc nào → schema riêng (không có provider)
+"""
+
+import posixpath
+import re
+
+SCHEMA_EXTENSION = ".prisma"
+
+# Ưu tiên chọn schema chính theo thứ tự (giống vị trí mặc định của Prisma CLI)
+PREFERRED_SCHEMA_PATHS = (
+    "prisma/schema.prisma",
+    "prisma/schema",
+    "schema.prisma",
+    "packages/database/prisma/schema.prisma",
+    "apps/api/prisma/schema.prisma",
+)
+
+PROVIDER_NAMES = {
+    "postgresql": "PostgreSQL",
+    "postgres": "PostgreSQL",
+    "mysql": "MySQL",
+    "sqlite": "SQLite",
+    "sqlserver": "SQL Server",
+    "mongodb": "MongoDB",
+    "cockroachdb": "CockroachDB",
+}
+
+_BLOCK_KINDS = frozenset({"model", "enum", "view", "type", "datasource", "generator"})
+_ENTITY_KINDS = ("model", "view", "type")
+_HEADER_RE = re.compile(r"(\w+)\s+(\w+)\s*\{")
+_ASSIGN_RE = re.compile(r"(\w+)\s*=\s*(.*)")
+_LIST_ARG_RE = re.compile(r"\b(fields|references)\s*:\s*\[([^\]]*)\]")
+_NAME_ARG_RE = re.compile(r"""(?:^|[(,]\s*)(?:name\s*:\s*)?"([^"]*)\"""")
+
+
+# =============================================================================
+# TOKENIZER
+# =============================================================================
+def _scan_line(line, depth=0):
+    """Bỏ comment `//` (ngoài string) → (code, độ sâu ngoặc nhọn, vị trí `}` đóng block hoặc None)."""
+    quote = False
+    escaped = False
+    for i, char in enumerate(line):
+        if quote:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                quote = False
+        elif char == '"':
+            quote = True
+        elif char == "/" and line[i + 1:i + 2] == "/":
+            return line[:i].rstrip(), depth, None
+        elif char == "{":
+            depth += 1
+        elif char == "}":
+            depth -= 1
+            if depth < 0:
+                return line[:i].rstrip(), depth, i
+    return line.rstrip(), depth, None
+
+
+def tokenize(lines):
+    """Yield block (dict) theo thứ tự: {"kind", "name", "line", "body": [dòng code], "doc"}.
+
+    `doc` là các dòng comment `///` ngay trước block.
+    """
+    block = None
+    depth = 0
+    doc = []
+    for lineno, raw in enumerate(lines, 1):
+        stripped = raw.strip()
+        if block is None:
+            if stripped.startswith("///"):
+                doc.append(stripped[3:].strip())
+                continue
+            code = _scan_line(stripped)[0]
+            match = _HEADER_RE.match(code)
+            if not match or match.group(1) not in _BLOCK_KINDS:
+                if code:
+                    doc = []
+                continue
+            block = {"kind": match.group(1), "name": match.group(2), "line": lineno, "body": [], "doc": " ".join(doc)}
+            doc = []
+            depth = 0
+            rest = code[match.end():]
+            if not rest.strip():
+                continue
+            stripped = rest  # block 1 dòng: `enum Role { USER ADMIN }`
+
+        code, depth, close_at = _scan_line(stripped, depth)
+        if close_at is None:
+            if code:
+                block["body"].append(code)
+            continue
+        if code:
+            block["body"].append(code)
+        yield block
+        block = None
+
+    if block is not None:
+        yield block  # thiếu `}` cuối file — vẫn giữ phần đã đọc
+
+
+def _split_top(text, sep=None):
+    """Tách `text` theo khoảng trắng (sep=None) hoặc `sep`, bỏ qua phần trong string và ngoặc."""
+    parts = []
+    current = []
+    depth = 0
+    quote = False
+    for char in text:
+        if quote:
+            current.append(char)
+            if char == '"':
+                quote = False
+            continue
+        if char == '"':
+            quote = True
+        elif char in "([":
+            depth += 1
+        elif char in ")]":
+            depth -= 1
+        elif depth == 0 and (char == sep or (sep is None and char in " \t")):
+            if current:
+                parts.append("".join(current).strip())
+            current = []
+            continue
+        current.append(char)
+    if current and "".join(current).strip():
+        parts.append("".join(current).strip())
+    return parts
+
+
+def parse_field(code):
+    """'author User? @relation(...)' → dict field, hoặc None nếu không phải dòng field."""
+    if code.startswith("@@"):
+        return None
+    tokens = _split_top(code)
+    if len(tokens) < 2 or tokens[1].startswith("@"):
+        return None
+    name, type_token = tokens[0], tokens[1]
+    base = type_token.rstrip("?")
+    is_list = base.endswith("[]")
+    return {
+        "name": name,
+        "type": type_token,
+        "base": base[:-2] if is_list else base,
+        "list": is_list,
+        "optional": type_token.endswith("?"),
+        "attributes": tokens[2:],
+    }
+
+
+# =============================================================================
+# SCHEMA FILE
+# =============================================================================
+class PrismaFile:
+    """Kết quả tokenize 1 file .prisma."""
+
+    def __init__(self, path, lines):
+        self.path = path
+        self.blocks = list(tokenize(lines))
+        self.provider = None
+        self.preview_features = []
+        for block in self.blocks:
+            if block["kind"] not in ("datasource", "generator"):
+                continue
+            settings = {}
+            for code in block["body"]:
+                match = _ASSIGN_RE.match(code)
+                if match:
+                    settings[match.group(1)] = match.group(2).strip()
+            if block["kind"] == "datasource" and self.provider is None:
+                self.provider = settings.get("provider", "").strip('"') or None
+            elif "previewFeatures" in settings:
+                self.preview_features += re.findall(r'"([^"]+)"', settings["previewFeatures"])
+
+    @property
+    def is_root(self):
+        return any(block["kind"] == "datasource" for block in self.blocks)
+
+
+def group_schemas(files):
+    """Nhóm PrismaFile thành schema → list {"path", "files", "provider", "folder"} (schema chính đứng đầu)."""
+    roots = [f for f in files if f.is_root]
+    members = {f.path: [f] for f in roots}
+    orphans = []
+    for f in files:
+        if f.is_root:
+            continue
+        owner = None
+        for root in roots:
+            folder = posixpath.dirname(root.path)
+            if not folder or f.path.startswith(folder + "/"):
+                # Gốc gần nhất (thư mục sâu nhất) thắng
+                if owner is None or len(folder) > len(posixpath.dirname(owner.path)):
+                    owner = root
+        if owner is None:
+            orphans.append(f)
+        else:
+            members[owner.path].append(f)
+
+    schemas = []
+    for root in roots:
+        group = members[root.path]
+        folder = len(group) > 1 or "prismaSchemaFolder" in root.preview_features
+        schemas.append({
+            "path": posixpath.dirname(root.path) if folder else root.path,
+            "files": group,
+            "provider": root.provider,
+            "folder": folder,
+        })
+    for f in orphans:
+        schemas.append({"path": f.path, "files": [f], "provider": None, "folder": False})
+
+    def _priority(schema):
+        path = schema["path"]
+        rank = PREFERRED_SCHEMA_PATHS.index(path) if path in PREFERRED_SCHEMA_PATHS else len(PREFERRED_SCHEMA_PATHS)
+        return rank, schema["provider"] is None, path.count("/"), path
+
+    schemas.sort(key=_priority)
+    return schemas
+
+
+# =============================================================================
+# GRAPH
+# =============================================================================
+def _relation_info(attributes):
+    """Args của @relation(...) → (name, fields, references)."""
+    for attribute in attributes:
+        if not attribute.startswith("@relation"):
+            continue
+        args = attribute[len("@relation"):].strip()[1:-1]
+        lists = {key: [v.strip() for v in value.split(",") if v.strip()] for key, value in _LIST_ARG_RE.findall(args)}
+        name = _NAME_ARG_RE.search(args)
+        return (name.group(1) if name else None), lists.get("fields", []), lists.get("references", [])
+    return None, [], []
+
+
+def _cardinality(field):
+    if field is None:
+        return None
+    return "many" if field["list"] else "optional" if field["optional"] else "one"
+
+
+_RELATION_TYPES = {
+    ("many", "many"): "n-m",
+    ("many", "one"): "1-n",
+    ("many", "optional"): "1-n",
+    ("one", "many"): "n-1",
+    ("optional", "many"): "n-1",
+}
+
+
+def build_graph(schemas):
+    """Schema đã nhóm → {"models", "enums", "relations", "schemas"} (JSON-serializable)."""
+    models = []
+    enums = []
+    entity_fields = {}  # tên model/view/type → [field dict]
+    for schema in schemas:
+        for f in schema["files"]:
+            for block in f.blocks:
+                if block["kind"] == "enum":
+                    values = [
+                        token for code in block["body"] if not code.startswith("@@")
+                        for token in _split_top(code) if not token.startswith("@")
+                    ]
+                    enums.append({"name": block["name"], "values": values, "file": f.path})
+                elif block["kind"] in _ENTITY_KINDS:
+                    fields = [field for field in map(parse_field, block["body"]) if field]
+                    entity_fields.setdefault(block["name"], fields)
+                    model = {
+                        "name": block["name"],
+                        "kind": block["kind"],
+                        "file": f.path,
+                        "fields": [f"{field['name']}: {field['type']}" for field in fields],
+                    }
+                    if block["doc"]:
+                        model["doc"] = block["doc"]
+                    models.append(model)
+
+    kinds = {m["name"]: m["kind"] for m in models}
+    relations = []
+    for model in models:
+        if model["kind"] == "type":
+            continue
+        for field in entity_fields.get(model["name"], ()):
+            target = field["base"]
+            if kinds.get(target) not in ("model", "view"):
+                continue
+            name, fk_fields, references = _relation_info(field["attributes"])
+            # Field đối diện: cùng tên relation (hoặc field đầu tiên trỏ ngược nếu không đặt tên)
+            back = None
+            for other in entity_fields.get(target, ()):
+                if other["base"] != model["name"] or (target == model["name"] and other["name"] == field["name"]):
+                    continue
+                if _relation_info(other["attributes"])[0] == name:
+                    back = other
+                    break
+            cardinality = _cardinality(field)
+            relation = {
+                "model": model["name"],
+                "field": field["name"],
+                "target": target,
+                "type": _RELATION_TYPES.get((cardinality, _cardinality(back)), "1-1" if back else cardinality),
+            }
+            if name:
+                relation["name"] = name
+            if fk_fields:
+                relation["fields"] = fk_fields
+                relation["references"] = references
+            relations.append(relation)
+
+    return {
+        "models": models,
+        "enums": enums,
+        "relations": relations,
+        "schemas": [
+            {"path": s["path"], "provider": s["provider"], "files": [f.path for f in s["files"]]}
+            for s in schemas
+        ],
+    }
@@ -6,8 +6,19 @@ Mỗi skill có trường `project_types`:
   - "all"       → Áp dụng cho mọi loại dự án
   - "web"       → Chỉ dự án Web (Public B2C, SaaS B2B, Full-stack)
   - "web_public" → Chỉ dự án Web Public (B2C có end-user)
+
+Skills/Workflows bổ sung được nạp từ plugin (xem phần PLUGINS bên dưới):
+  - Entry point nhóm `wb_agent.plugins` (trỏ tới dict manifest hoặc hàm trả về manifest)
+  - Thư mục manifest JSON trong biến môi trường WB_AGENT_PLUGIN_PATH
 """
 
+import hashlib
+import json
+import os
+import sys
+from functools import lru_cache
+from types import MappingProxyType
+
 # ============================================================================
 # PROJECT TYPES
 # ============================================================================
@@ -375,19 +386,320 @@ WORKFLOWS_REGISTRY = [
 ]
 
 
-def get_skills_for_project_type(project_type):
-    """Lọc skills phù hợp với loại dự án."""
-    if project_type not in PROJECT_TYPES:
-        return SKILLS_REGISTRY  # fallback: trả về tất cả
+# ============================================================================
+# REGISTRY INDEX — dựng 1 lần mỗi process, mọi tra cứu O(1)
+# ============================================================================
+class RegistryIndex:
+    """Index bất biến trên Skills/Workflows registry.
 
-    allowed = PROJECT_TYPES[project_type]["includes_skills"]
-    return [s for s in SKILLS_REGISTRY if s.get("project_types", "all") in allowed]
+    - name → skill, command → workflow (MappingProxyType)
+    - project type → tuple skills/workflows + frozenset tên skill
+    - skill → tuple workflows dùng skill đó (cạnh ngược)
+    """
 
+    def __init__(self, skills, workflows, project_types):
+        self.skills = tuple(MappingProxyType(dict(s)) for s in skills)
+        self.workflows = tuple(MappingProxyType(dict(w)) for w in workflows)
+        self.project_types = MappingProxyType(dict(project_types))
 
-def get_workflows_for_project_type(project_type):
-    """Lọc workflows phù hợp với loại dự án."""
-    if project_type not in PROJECT_TYPES:
-        return WORKFLOWS_REGISTRY
+        self._skill_by_name = MappingProxyType({s["name"]: s for s in self.skills})
+        self._workflow_by_command = MappingProxyType({w["command"]: w for w in self.workflows})
+        self.skill_names = frozenset(self._skill_by_name)
+        self.workflow_commands = frozenset(self._workflow_by_command)
+
+        skills_by_type = {}
+        workflows_by_type = {}
+        for type_key, type_info in self.project_types.items():
+            allowed = frozenset(type_info["includes_skills"])
+            skills_by_type[type_key] = tuple(s for s in self.skills if s.get("project_types", "all") in allowed)
+            workflows_by_type[type_key] = tuple(w for w in self.workflows if w.get("project_types", "all") in allowed)
+        self._skills_by_type = MappingProxyType(skills_by_type)
+        self._workflows_by_type = MappingProxyType(workflows_by_type)
+        self._skill_names_by_type = MappingProxyType(
+            {k: frozenset(s["name"] for s in v) for k, v in skills_by_type.items()}
+        )
+
+        workflows_by_skill = {}
+        for wf in self.workflows:
+            for skill_name in wf.get("skills", ()):
+                workflows_by_skill.setdefault(skill_name, []).append(wf)
+        self._workflows_by_skill = MappingProxyType({k: tuple(v) for k, v in workflows_by_skill.items()})
+
+    def skill(self, name):
+        """Skill theo tên, hoặc None."""
+        return self._skill_by_name.get(name)
+
+    def workflow(self, command):
+        """Workflow theo command, hoặc None."""
+        return self._workflow_by_command.get(command)
+
+    def skills_for(self, project_type):
+        """Skills phù hợp loại dự án (loại không biết → tất cả)."""
+        return self._skills_by_type.get(project_type, self.skills)
+
+    def workflows_for(self, project_type):
+        """Workflows phù hợp loại dự án (loại không biết → tất cả)."""
+        return self._workflows_by_type.get(project_type, self.workflows)
+
+    def skill_names_for(self, project_type):
+        return self._skill_names_by_type.get(project_type, self.skill_names)
+
+    def workflows_using(self, skill_name):
+        """Các workflow gọi tới skill (cạnh ngược skill → workflows)."""
+        return self._workflows_by_skill.get(skill_name, ())
+
+
+# ============================================================================
+# PLUGINS — skills/workflows ngoài, metadata lấy từ manifest index (cache)
+# ============================================================================
+# Manifest (JSON hoặc dict trả về từ entry point):
+#   {
+#     "name": "acme-skills",
+#     "skills": [{"name": "acme.audit", "role": "...", "description": "...",
+#                 "project_types": "all", "template": "acme_wb.skills:audit"}],
+#     "workflows": [{"command": "acme-audit", "description": "...", "skills": ["acme.audit"],
+#                    "template_file": "workflows/acme-audit.md"}]
+#   }
+# `template` = "module:hàm" (chỉ import khi thật sự sinh file),
+# `template_file` = file .md tương đối với thư mục chứa manifest (file JSON) hoặc thư mục chứa
+# module của entry point (VD: `acme_wb:manifest` → thư mục package acme_wb/); path tuyệt đối giữ nguyên.
+PLUGIN_ENTRY_POINT_GROUP = "wb_agent.plugins"
+PLUGIN_PATH_ENV = "WB_AGENT_PLUGIN_PATH"
+PLUGIN_CACHE_ENV = "WB_AGENT_PLUGIN_CACHE"
+PLUGIN_INDEX_SCHEMA = 2
+
+
+def _plugin_entry_points():
+    try:
+        from importlib import metadata
+    except ImportError:  # Python < 3.8
+        return []
+    eps = metadata.entry_points()
+    if hasattr(eps, "select"):
+        return list(eps.select(group=PLUGIN_ENTRY_POINT_GROUP))
+    return list(eps.get(PLUGIN_ENTRY_POINT_GROUP, ()))
+
+
+def _plugin_manifest_files():
+    """Các file *.json trong những thư mục của WB_AGENT_PLUGIN_PATH (không đệ quy)."""
+    files = []
+    for directory in filter(None, os.environ.get(PLUGIN_PATH_ENV, "").split(os.pathsep)):
+        try:
+            names = sorted(os.listdir(directory))
+        except OSError:
+            continue
+        files.extend(os.path.join(os.path.abspath(directory), n) for n in names if n.endswith(".json"))
+    return files
+
+
+def _digest(parts):
+    return hashlib.sha256("\n".join(parts).encode("utf-8")).hexdigest()
+
+
+def _plugin_fingerprint(entry_points):
+    """Thay đổi khi có plugin được cài/gỡ/nâng cấp."""
+    parts = [str(PLUGIN_INDEX_SCHEMA)]
+    for ep in entry_points:
+        dist = getattr(ep, "dist", None)
+        parts.append(f"{ep.name}={ep.value}@{getattr(dist, 'version', '')}")
+    return _digest(parts)
+
+
+def _manifest_stamp(manifest_files):
+    """size/mtime các manifest file."""
+    parts = []
+    for path in manifest_files:
+        try:
+            st = os.stat(path)
+            parts.append(f"{path}:{st.st_size}:{st.st_mtime_ns}")
+        except OSError:
+            parts.append(f"{path}:missing")
+    return _digest(parts)
 
-    allowed = PROJECT_TYPES[project_type]["includes_skills"]
-    return [w for w in WORKFLOWS_REGISTRY if w.get("project_types", "all") in allowed]
+
+def _environment_stamp(manifest_stamp):
+    """Dấu rẻ của môi trường: mtime các thư mục sys.path (cài/gỡ package đổi mtime)
+    + manifest stamp. Khớp stamp → dùng index cache, không cần importlib.metadata."""
+    cwd = os.getcwd()
+    parts = [manifest_stamp]
+    for entry in sys.path:
+        if not entry or os.path.abspath(entry) == cwd:
+            continue  # thư mục hiện tại đổi theo từng repo — không đưa vào stamp
+        try:
+            parts.append(f"{entry}:{os.stat(entry).st_mtime_ns}")
+        except OSError:
+            continue
+    return _digest(parts)
+
+
+def _plugin_cache_path():
+    if os.environ.get(PLUGIN_CACHE_ENV):
+        return os.environ[PLUGIN_CACHE_ENV]
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "wb-agent", "plugin-index.json")
+
+
+def _normalize_manifest(manifest, source, base_dir=None):
+    """Chuẩn hoá 1 manifest → (skills, workflows). Entry thiếu trường bắt buộc bị bỏ qua."""
+    plugin = manifest.get("name") or source
+    skills, workflows = [], []
+    for raw in manifest.get("skills", ()):
+        if not raw.get("name") or not raw.get("description"):
+            continue
+        entry = dict(raw, plugin=plugin)
+        entry.setdefault("role", "Specialist")
+        entry.setdefault("project_types", "all")
+        skills.append(entry)
+    for raw in manifest.get("workflows", ()):
+        if not raw.get("command") or not raw.get("description"):
+            continue
+        entry = dict(raw, plugin=plugin)
+        entry.setdefault("skills", [])
+        workflows.append(entry)
+    if base_dir:
+        for entry in skills + workflows:
+            if entry.get("template_file"):
+                entry["template_file"] = os.path.join(base_dir, entry["template_file"])
+    return skills, workflows
+
+
+def _entry_point_dir(ep):
+    """Thư mục chứa module của entry point (gốc cho `template_file` tương đối), hoặc None."""
+    import importlib.util
+
+    module_name = ep.value.partition(":")[0].strip()
+    try:
+        spec = importlib.util.find_spec(module_name)
+    except (ImportError, ValueError):
+        return None
+    if spec is None or not spec.origin or not os.path.isfile(spec.origin):
+        return None
+    return os.path.dirname(os.path.abspath(spec.origin))
+
+
+def _collect_plugins(entry_points, manifest_files):
+    """Đọc mọi manifest (import entry point — chỉ chạy khi cache index không khớp)."""
+    skills, workflows = [], []
+    for path in manifest_files:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            continue
+        s, w = _normalize_manifest(manifest, os.path.basename(path), os.path.dirname(path))
+        skills += s
+        workflows += w
+    for ep in entry_points:
+        try:
+            manifest = ep.load()
+            if callable(manifest):
+                manifest = manifest()
+        except Exception:  # noqa: BLE001 — 1 plugin hỏng không được làm hỏng CLI
+            continue
+        if isinstance(manifest, dict):
+            s, w = _normalize_manifest(manifest, ep.name, _entry_point_dir(ep))
+            skills += s
+            workflows += w
+    return skills, workflows
+
+
+def discover_plugins():
+    """Skills/workflows từ plugin → (skills, workflows).
+
+    Manifest index được cache theo 2 tầng:
+      - stamp (stat sys.path + manifest files) khớp → đọc 1 file JSON, xong
+      - stamp đổi nhưng fingerprint entry points không đổi → chỉ cập nhật stamp
+      - còn lại → nạp lại mọi manifest (lúc này mới import entry point)
+    """
+    manifest_files = _plugin_manifest_files()
+    manifest_stamp = _manifest_stamp(manifest_files)
+    stamp = _environment_stamp(manifest_stamp)
+    cache_path = _plugin_cache_path()
+    try:
+        with open(cache_path, "r", encoding="utf-8") as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        cached = {}
+    if cached.get("schema") == PLUGIN_INDEX_SCHEMA and cached.get("stamp") == stamp:
+        return cached["skills"], cached["workflows"]
+
+    entry_points = _plugin_entry_points()
+    fingerprint = _plugin_fingerprint(entry_points)
+    if (cached.get("schema") == PLUGIN_INDEX_SCHEMA and cached.get("fingerprint") == fingerprint
+            and cached.get("manifest_stamp") == manifest_stamp):
+        skills, workflows = cached["skills"], cached["workflows"]
+    else:
+        skills, workflows = _collect_plugins(entry_points, manifest_files)
+
+    data = {
+        "schema": PLUGIN_INDEX_SCHEMA,
+        "stamp": stamp,
+        "fingerprint": fingerprint,
+        "manifest_stamp": manifest_stamp,
+        "skills": skills,
+        "workflows": workflows,
+    }
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+    return skills, workflows
+
+
+def load_plugin_template(entry):
+    """Nội dung template của skill/workflow plugin (import lười), hoặc None."""
+    if entry.get("template_file"):
+        try:
+            with open(entry["template_file"], "r", encoding="utf-8") as f:
+                return f.read()
+        except OSError:
+            return None
+    if entry.get("template"):
+        import importlib
+
+        module_name, _, attr = entry["template"].partition(":")
+        try:
+            template = getattr(importlib.import_module(module_name), attr)
+        except (ImportError, AttributeError):
+            return None
+        return template() if callable(template) else str(template)
+    return None
+
+
+def _merge_unique(builtin, extra, key):
+    """Built-in thắng khi trùng tên; plugin trùng nhau thì plugin đầu tiên thắng."""
+    seen = {item[key] for item in builtin}
+    merged = list(builtin)
+    for item in extra:
+        if item[key] not in seen:
+            seen.add(item[key])
+            merged.append(item)
+    return merged
+
+
+@lru_cache(maxsize=None)
+def get_registry_index():
+    """RegistryIndex của process = registry built-in + plugins (dựng ở lần gọi đầu tiên)."""
+    plugin_skills, plugin_workflows = discover_plugins()
+    return RegistryIndex(
+        _merge_unique(SKILLS_REGISTRY, plugin_skills, "name"),
+        _merge_unique(WORKFLOWS_REGISTRY, plugin_workflows, "command"),
+        PROJECT_TYPES,
+    )
+
+
+def get_skills_for_project_type(project_type):
+    """Lọc skills phù hợp với loại dự án (tuple, tra từ RegistryIndex)."""
+    return get_registry_index().skills_for(project_type)
+
+
+def get_workflows_for_project_type(project_type):
+    """Lọc workflows phù hợp với loại dự án (tuple, tra từ RegistryIndex)."""
+    return get_registry_index().workflows_for(project_type)
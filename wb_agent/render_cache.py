@@ -0,0 +1,167 @@
+"""
+Render Cache - Memo kết quả render template theo đúng input thật của template.
+
+  - Tầng 1: dict trong process, key = (kind, name, *args)
+  - Tầng 2 (tuỳ chọn): thư mục trên đĩa, key = sha256(version + nguồn templates + kind + name + args)
+    Bật bằng `configure_disk_cache(path)` hoặc biến môi trường WB_AGENT_RENDER_CACHE.
+
+Phần lớn templates không có tham số (skills, workflows, documents, scripts) nên
+được render đúng 1 lần cho mọi project; IDE rules chỉ phụ thuộc project_name.
+Skills / workflows / scripts được đọc thẳng từ templates.bundle (xem template_bundle.py)
+khi bundle còn khớp nguồn — không cần import module templates tương ứng.
+"""
+
+import hashlib
+import json
+import os
+
+from . import __version__
+from .template_bundle import BUNDLED_KINDS, TEMPLATE_SOURCES, get_bundle
+
+# kind → tên map trong templates.py; "doc" = hàm template cấp module (gọi theo tên)
+TEMPLATE_KINDS = {
+    "skill": "SKILL_TEMPLATE_MAP",
+    "workflow": "WORKFLOW_TEMPLATE_MAP",
+    "document": "DOCUMENT_TEMPLATE_MAP",
+    "script": "SCRIPT_TEMPLATE_MAP",
+    "doc": None,
+}
+
+_MEMO = {}
+_disk_dir = os.environ.get("WB_AGENT_RENDER_CACHE") or None
+_source_tag = None
+
+
+def configure_disk_cache(path):
+    """Bật (path) hoặc tắt (None) cache render trên đĩa."""
+    global _disk_dir
+    _disk_dir = path or None
+
+
+def _resolve(kind, name):
+    from . import templates
+
+    map_name = TEMPLATE_KINDS[kind]
+    if map_name is None:
+        return getattr(templates, name, None)
+    return getattr(templates, map_name).get(name)
+
+
+def _template_source_tag():
+    """Fingerprint nguồn templates (size + mtime) — đổi code template thì cache đĩa tự vô hiệu."""
+    global _source_tag
+    if _source_tag is None:
+        package_dir = os.path.dirname(os.path.abspath(__file__))
+        parts = [__version__]
+        for filename in TEMPLATE_SOURCES:
+            try:
+                st = os.stat(os.path.join(package_dir, filename))
+                parts.append(f"{filename}:{st.st_size}:{st.st_mtime_ns}")
+            except OSError:
+                parts.append(f"{filename}:missing")
+        _source_tag = "|".join(parts)
+    return _source_tag
+
+
+def _disk_path(key):
+    raw = json.dumps([_template_source_tag(), *key], ensure_ascii=False)
+    digest = hashlib.sha256(raw.encode("utf-8")).hexdigest()
+    return os.path.join(_disk_dir, digest[:2], f"{digest}.md")
+
+
+def _disk_get(key):
+    try:
+        with open(_disk_path(key), "r", encoding="utf-8", newline="") as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+def _disk_put(key, content):
+    path = _disk_path(key)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(tmp_path, "w", encoding="utf-8", newline="") as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+    except OSError:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+
+_PLUGIN_KINDS = ("skill", "workflow")
+
+
+def _plugin_entry(kind, name):
+    """Entry registry nếu skill/workflow đến từ plugin (có template riêng), ngược lại None."""
+    from .registry import get_registry_index
+
+    index = get_registry_index()
+    entry = index.skill(name) if kind == "skill" else index.workflow(name)
+    return entry if entry is not None and entry.get("plugin") else None
+
+
+def render(kind, name, *args):
+    """Render template `name` thuộc `kind` với args (memo). Trả về None nếu không có template."""
+    key = (kind, name) + args
+    content = _MEMO.get(key)
+    if content is not None:
+        return content
+
+    if kind in _PLUGIN_KINDS and not args:
+        entry = _plugin_entry(kind, name)
+        if entry is not None:
+            from .registry import load_plugin_template
+
+            content = load_plugin_template(entry)
+            if content is not None:
+                _MEMO[key] = content
+            return content
+
+    bundle = get_bundle() if kind in BUNDLED_KINDS and not args else None
+    if bundle is not None:
+        # Bundle chứa đủ mọi template của map → không có trong bundle = không có template
+        content = bundle.get(kind, name)
+        if content is not None:
+            _MEMO[key] = content
+        return content
+
+    if _disk_dir:
+        content = _disk_get(key)
+    if content is None:
+        template_fn = _resolve(kind, name)
+        if template_fn is None:
+            return None
+        content = template_fn(*args)
+        if _disk_dir:
+            _disk_put(key, content)
+
+    _MEMO[key] = content
+    return content
+
+
+def warm():
+    """Render trước mọi template không tham số. Trả về snapshot memo (truyền sang process khác)."""
+    from . import templates
+
+    bundle = get_bundle()
+    for kind, map_name in TEMPLATE_KINDS.items():
+        if map_name is None:
+            continue
+        names = bundle.names(kind) if bundle is not None and kind in BUNDLED_KINDS else getattr(templates, map_name)
+        for name in names:
+            render(kind, name)
+    return dict(_MEMO)
+
+
+def install(snapshot):
+    """Nạp snapshot từ warm() (VD: trong pool initializer của fleet mode)."""
+    if snapshot:
+        _MEMO.update(snapshot)
+
+
+def clear():
+    _MEMO.clear()
@@ -0,0 +1,65 @@
+"""
+Scan Budget - Giới hạn cho 1 lần quét (số file, độ sâu, số byte đọc, thời gian).
+
+Vượt giới hạn không làm quét thất bại: FileIndex dừng duyệt, detector bỏ qua phần
+còn lại và ghi lý do vào `profile["partial"]` để người dùng biết kết quả chưa đầy đủ.
+Kết quả partial không được ghi vào scan cache.
+"""
+
+import threading
+import time
+
+# Lý do partial ghi vào profile
+MAX_FILES = "max_files"
+MAX_DEPTH = "max_depth"
+MAX_BYTES = "max_bytes"
+DEADLINE = "deadline"
+
+
+class ScanBudget:
+    """Ngân sách quét; mọi giới hạn là None = không giới hạn. Thread-safe (detectors song song)."""
+
+    def __init__(self, max_files=None, max_depth=None, max_bytes=None, timeout=None):
+        self.max_files = max_files
+        self.max_depth = max_depth
+        self.max_bytes = max_bytes
+        self.timeout = timeout  # giây (wall-clock), tính từ start()
+        self.bytes_read = 0
+        self._deadline = None
+        self._lock = threading.Lock()
+
+    @property
+    def limited(self):
+        return any(v is not None for v in (self.max_files, self.max_depth, self.max_bytes, self.timeout))
+
+    def start(self):
+        """Bắt đầu đếm giờ (gọi ở đầu ProjectScanner.scan)."""
+        self.bytes_read = 0
+        self._deadline = time.monotonic() + self.timeout if self.timeout is not None else None
+        return self
+
+    def expired(self):
+        return self._deadline is not None and time.monotonic() >= self._deadline
+
+    def take_bytes(self, size):
+        """Trừ `size` byte khỏi ngân sách đọc. False nếu đọc thêm sẽ vượt max_bytes."""
+        if self.max_bytes is None:
+            return True
+        with self._lock:
+            if self.bytes_read + size > self.max_bytes:
+                return False
+            self.bytes_read += size
+            return True
+
+    def describe(self):
+        """Mô tả ngắn các giới hạn đang bật (cho log CLI)."""
+        parts = []
+        if self.max_files is not None:
+            parts.append(f"{self.max_files:,} files")
+        if self.max_depth is not None:
+            parts.append(f"depth {self.max_depth}")
+        if self.max_bytes is not None:
+            parts.append(f"{self.max_bytes:,} bytes")
+        if self.timeout is not None:
+            parts.append(f"{self.timeout:g}s")
+        return ", ".join(parts)
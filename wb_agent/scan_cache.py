@@ -0,0 +1,91 @@
+"""
+Scan Cache - Cache quét tăng dần, lưu tại `.agent/.cache/scan.json`.
+
+Lưu 2 thứ:
+  - `tree`: listing thô của từng thư mục kèm mtime_ns → FileIndex chỉ scandir lại
+    những thư mục có mtime thay đổi.
+  - `detectors`: kết quả (partial profile) của từng detector kèm các dependency
+    nó đã đọc (file → (size, mtime_ns), truy vấn cây → fingerprint). Detector chỉ
+    chạy lại khi một dependency thay đổi.
+  - `packages`: như `detectors` nhưng cho từng package của monorepo (key = thư mục
+    package) → sửa 1 package chỉ làm detector của package đó chạy lại.
+"""
+
+import json
+import os
+
+from . import __version__
+
+CACHE_DIR = os.path.join(".agent", ".cache")
+SCAN_CACHE_FILE = "scan.json"
+
+# Tăng khi output của detector thay đổi để cache cũ tự bị bỏ
+CACHE_SCHEMA = 9
+
+# mtime nằm trong cửa sổ này so với thời điểm bắt đầu quét → không tin (racy timestamp)
+RACY_WINDOW_NS = 2_000_000_000
+
+
+def ensure_cache_dir(target_dir):
+    """Tạo `.agent/.cache/` (kèm .gitignore để không bị commit). Trả về path."""
+    cache_dir = os.path.join(target_dir, CACHE_DIR)
+    os.makedirs(cache_dir, exist_ok=True)
+    gitignore = os.path.join(cache_dir, ".gitignore")
+    if not os.path.exists(gitignore):
+        with open(gitignore, "w", encoding="utf-8") as f:
+            f.write("*\n")
+    return cache_dir
+
+
+class ScanCache:
+    """Đọc/ghi cache quét của một project."""
+
+    def __init__(self, target_dir: str):
+        self.target_dir = target_dir
+        self.path = os.path.join(target_dir, CACHE_DIR, SCAN_CACHE_FILE)
+        self.scanned_at_ns = 0
+        self.tree = {}
+        self.detectors = {}
+        self.packages = {}
+
+    def load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return self
+
+        if data.get("schema") != CACHE_SCHEMA or data.get("version") != __version__:
+            return self
+
+        self.scanned_at_ns = data.get("scanned_at_ns", 0)
+        self.tree = data.get("tree", {})
+        self.detectors = data.get("detectors", {})
+        self.packages = data.get("packages", {})
+        return self
+
+    def is_stable(self, mtime_ns):
+        """mtime đủ cũ so với lần quét trước để tin rằng nội dung chưa đổi."""
+        return mtime_ns is not None and mtime_ns < self.scanned_at_ns - RACY_WINDOW_NS
+
+    def save(self, scanned_at_ns, tree, detectors, packages=None):
+        """Ghi cache (atomic qua file tạm). Lỗi I/O được bỏ qua — cache chỉ là tối ưu."""
+        data = {
+            "schema": CACHE_SCHEMA,
+            "version": __version__,
+            "scanned_at_ns": scanned_at_ns,
+            "tree": tree,
+            "detectors": detectors,
+            "packages": packages or {},
+        }
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            ensure_cache_dir(self.target_dir)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+            os.replace(tmp_path, self.path)
+        except OSError:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
@@ -1,99 +1,538 @@
 """
 Scanner - Quét codebase hiện có để auto-populate .agent/ files.
 Đọc hiểu dự án thông qua config files, source code, và cấu trúc thư mục.
+
+Mỗi detector (`_scan_*`) ghi vào partial profile riêng qua `_DetectorContext`;
+các partial được merge theo thứ tự cố định của `DETECTORS`. Context ghi lại mọi
+file/truy vấn cây mà detector đã dùng để ScanCache biết khi nào cần chạy lại.
 """
 
 import os
 import json
 import re
-import glob
+import time
+import hashlib
+
+from .compose import (COMPOSE_BASE_FILES, OVERRIDE_VARIANT, PROD_VARIANTS, ComposeAnalyzer,
+                      compose_variant_candidates, format_port)
+from .envfile import ENV_FILES, parse_env_lines
+from .file_index import FileIndex
+from .ignore import BUILTIN_IGNORE_DIRS
+from .prisma import PROVIDER_NAMES, SCHEMA_EXTENSION, PrismaFile, build_graph, group_schemas
+from .scan_budget import DEADLINE, MAX_BYTES, ScanBudget
+from .scan_cache import RACY_WINDOW_NS, ScanCache
+from .workspaces import expand_workspaces, read_workspace_patterns
+
+# Thứ tự chạy & merge detectors — (tên cache, method)
+DETECTORS = (
+    ("package_json", "_scan_package_json"),
+    ("pyproject", "_scan_pyproject"),
+    ("docker", "_scan_docker"),
+    ("prisma", "_scan_prisma"),
+    ("env", "_scan_env"),
+    ("api_routes", "_scan_api_routes"),
+    ("pages", "_scan_pages"),
+    ("readme", "_scan_readme"),
+    ("source_structure", "_scan_source_structure"),
+)
+
+# Knowledge base sinh từ profile: (file trong .agent/knowledge_base/, method sinh nội dung,
+# các key profile mà nội dung phụ thuộc — watch mode chỉ sinh lại file có key thay đổi)
+KNOWLEDGE_BASE_FILES = (
+    ("infrastructure.md", "generate_infrastructure_content", ("tech_stack", "docker", "env_vars", "env_sources")),
+    ("data_schema.md", "generate_data_schema_content", ("database",)),
+    ("api_standards.md", "generate_api_standards_content", ("api",)),
+    ("business_logic.md", "generate_business_logic_content",
+     ("project_description", "workspace", "source_structure", "pages")),
+)
+
+# Field scalar chỉ được điền khi còn trống (detector trước được ưu tiên)
+_FILL_IF_EMPTY = frozenset({"project_name", "project_description"})
+
+
+def _empty_profile():
+    return {
+        "has_existing_code": False,
+        "tech_stack": [],
+        "framework": None,
+        "language": None,
+        "package_manager": None,
+        "dependencies": {},
+        "dev_dependencies": {},
+        "scripts": {},
+        "docker": {
+            "has_docker": False,
+            "has_compose": False,
+            "has_prod_compose": False,
+            "services": [],
+            "ports": [],
+            "compose": {},  # base + override: files, services (ports/volumes/networks/depends_on), volumes, networks
+            "compose_environments": {},  # prod / staging / dev... → model base + biến thể đó (cùng dạng "compose")
+        },
+        "database": {
+            "type": None,
+            "has_prisma": False,
+            "models": [],   # model / view / type: name, kind, file, fields ("name: Type")
+            "enums": [],
+            "relations": [],  # model.field → target, type (1-1 / 1-n / n-1 / n-m), fields/references
+            "schemas": [],  # schema chính đứng đầu: path, provider, files
+        },
+        "api": {
+            "routes": [],
+            "has_api_dir": False,
+        },
+        "pages": [],
+        "env_vars": [],
+        "env_sources": {},  # tên biến → env file (độ ưu tiên cao nhất) định nghĩa nó
+        "workspace": {},  # monorepo: tool, patterns, packages [{path, name, framework, language}]
+        "packages": {},  # monorepo: thư mục package → profile riêng của package
+        "partial": {},  # detector (hoặc "file_index") → lý do kết quả chưa đầy đủ (xem scan_budget)
+        "project_description": "",
+        "project_name": "",
+        "project_version": "",
+        "source_structure": [],
+    }
+
+
+def _merge_profile(target, partial):
+    """Merge partial profile vào target: list nối không trùng, dict đệ quy, scalar ghi đè nếu có giá trị."""
+    for key, value in partial.items():
+        current = target.get(key)
+        if isinstance(value, dict) and isinstance(current, dict):
+            _merge_profile(current, value)
+        elif isinstance(value, list) and isinstance(current, list):
+            _extend_unique(current, value)
+        elif value is not None and value != "" and value is not False:
+            if key in _FILL_IF_EMPTY and current:
+                continue
+            target[key] = value
+
+
+def _extend_unique(current, items):
+    """current += items (bỏ trùng, giữ thứ tự) — phần tử hashable tra bằng set để tránh O(n²)."""
+    seen = set()
+    unhashable = []  # VD: dict (docker services) — so sánh tuyến tính như cũ
+    for item in current:
+        try:
+            seen.add(item)
+        except TypeError:
+            unhashable.append(item)
+    for item in items:
+        try:
+            if item in seen:
+                continue
+            seen.add(item)
+        except TypeError:
+            if item in unhashable:
+                continue
+            unhashable.append(item)
+        current.append(item)
+
+
+def _compact(value):
+    """Bỏ các giá trị rỗng (không ảnh hưởng kết quả merge) để cache gọn hơn."""
+    if isinstance(value, dict):
+        compacted = {k: _compact(v) for k, v in value.items()}
+        return {k: v for k, v in compacted.items() if v not in (None, "", False, [], {})}
+    return value
+
+
+def _relative_to(rel, base):
+    """Relpath của `rel` so với `base` (cả 2 là relpath kiểu index)."""
+    if rel == base:
+        return "."
+    return rel[len(base) + 1:]
+
+
+def _digest(value):
+    return hashlib.sha1(json.dumps(value, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+def _detect_framework(profile):
+    """Xác định framework chính từ tech stack."""
+    ts = profile["tech_stack"]
+    if "Next.js" in ts:
+        profile["framework"] = "Next.js"
+    elif "NestJS" in ts:
+        profile["framework"] = "NestJS"
+    elif "Django" in ts:
+        profile["framework"] = "Django"
+    elif "FastAPI" in ts:
+        profile["framework"] = "FastAPI"
+    elif "Express.js" in ts:
+        profile["framework"] = "Express.js"
+    elif "Vue.js" in ts:
+        profile["framework"] = "Vue.js"
+    elif "React" in ts:
+        profile["framework"] = "React"
+
+
+def _finalize_profile(profile):
+    """Framework + cờ has_existing_code sau khi đã merge xong."""
+    _detect_framework(profile)
+    if (profile["tech_stack"]
+        or profile["dependencies"]
+        or profile["dev_dependencies"]
+        or profile["docker"]["has_docker"]
+        or profile["docker"]["has_compose"]):
+        profile["has_existing_code"] = True
+    return profile
+
+
+def _build_profile(results):
+    """Merge partial profile của các detector (theo thứ tự DETECTORS) → profile đầy đủ."""
+    profile = _empty_profile()
+    for name, _ in DETECTORS:
+        if name in results:
+            _merge_profile(profile, results[name]["profile"])
+    return _finalize_profile(profile)
+
+
+# Field của package được gộp vào view tổng. Tên / mô tả / source_structure giữ của root;
+# Prisma schema và Dockerfile đã được root tìm trên toàn cây nên không gộp lại.
+_PACKAGE_MERGE_KEYS = ("tech_stack", "dependencies", "dev_dependencies", "api", "pages", "env_vars", "partial")
+
+
+def _merge_package(target, base, package_profile):
+    """Gộp profile của package `base` vào view tổng của monorepo."""
+    _merge_profile(target, {key: package_profile[key] for key in _PACKAGE_MERGE_KEYS})
+    sources = target["env_sources"]
+    for var, env_name in package_profile["env_sources"].items():
+        sources.setdefault(var, f"{base}/{env_name}")
+    if not target["language"] or (target["language"] == "JavaScript" and package_profile["language"] == "TypeScript"):
+        target["language"] = package_profile["language"]
+
+
+def _within(rel, base):
+    """`rel` nằm trong thư mục `base` ('' là root)."""
+    return not base or rel == base or rel.startswith(base + "/")
+
+
+def _strip_base(rel, base):
+    """Relpath theo root → relpath theo `base` (root của package là '')."""
+    if not base:
+        return rel
+    return "" if rel == base else rel[len(base) + 1:]
+
+
+class _DetectorContext:
+    """Phiên chạy của 1 detector: partial profile riêng + danh sách dependency đã dùng.
+
+    `base` là thư mục package (monorepo): detector vẫn dùng relpath như đang ở root,
+    context tự chuyển đổi. Dependency luôn ghi theo relpath từ root của index.
+    """
+
+    def __init__(self, scanner, base=""):
+        self.target_dir = scanner.target_dir
+        self.index = scanner.index
+        self.budget = scanner.budget
+        self.base = base
+        self.profile = _empty_profile()
+        self.deps = []
+        self.partial = set()  # lý do detector dừng sớm (scan_budget.MAX_BYTES / DEADLINE)
+
+    def _path(self, rel):
+        if not self.base:
+            return rel
+        return f"{self.base}/{rel}" if rel else self.base
+
+    # Mỗi truy vấn trả về (giá trị, fingerprint JSON-serializable)
+    def _q_is_file(self, rel):
+        result = self.index.is_file(rel)
+        return result, result
+
+    def _q_is_dir(self, rel):
+        result = self.index.is_dir(rel)
+        return result, result
+
+    def _q_walk(self, rel):
+        entries = list(self.index.walk(rel))
+        return entries, _digest(entries)
+
+    # Truy vấn toàn cây được giới hạn trong [base, name] để package khác đổi không làm lệch fingerprint
+    def _q_files_named(self, arg):
+        base, name = arg
+        paths = [p for p in self.index.files_named(name) if _within(p, base)]
+        return paths, _digest(paths)
+
+    def _q_files_with_suffix(self, arg):
+        base, suffix = arg
+        paths = [p for p in self.index.files_with_suffix(suffix) if _within(p, base)]
+        return paths, _digest(paths)
+
+    def _q_listdir(self, rel):
+        listing = self.index.listdir(rel)
+        return listing, _digest(listing)
+
+    def _q_pruned(self, rel):
+        names = self.index.pruned(rel)
+        return names, names
+
+    def _q_file(self, rel):
+        try:
+            st = os.stat(os.path.join(self.target_dir, rel))
+        except OSError:
+            return None, None
+        return st.st_size, [st.st_size, st.st_mtime_ns]
+
+    def fingerprint(self, kind, arg):
+        return getattr(self, f"_q_{kind}")(arg)[1]
+
+    def _record(self, kind, arg):
+        value, fp = getattr(self, f"_q_{kind}")(arg)
+        self.deps.append([kind, arg, fp])
+        return value
+
+    def _out_of_time(self):
+        if self.budget is not None and self.budget.expired():
+            self.partial.add(DEADLINE)
+            return True
+        return False
+
+    def _open(self, rel, **kwargs):
+        """Mở file (relpath theo root) sau khi trừ ngân sách byte; None nếu hết ngân sách / lỗi."""
+        size = self._record("file", rel)
+        if self._out_of_time():
+            return None
+        if self.budget is not None and not self.budget.take_bytes(size or 0):
+            self.partial.add(MAX_BYTES)
+            return None
+        try:
+            return open(os.path.join(self.target_dir, rel), "r", encoding="utf-8", **kwargs)
+        except OSError:
+            return None
+
+    def is_file(self, rel):
+        return self._record("is_file", self._path(rel))
+
+    def is_dir(self, rel):
+        return self._record("is_dir", self._path(rel))
+
+    def walk(self, rel):
+        if self._out_of_time():
+            return []
+        entries = self._record("walk", self._path(rel))
+        if not self.base:
+            return entries
+        return [(_strip_base(root, self.base), dirs, files) for root, dirs, files in entries]
+
+    def files_named(self, name):
+        return [_strip_base(p, self.base) for p in self._record("files_named", [self.base, name])]
+
+    def files_with_suffix(self, suffix):
+        return [_strip_base(p, self.base) for p in self._record("files_with_suffix", [self.base, suffix])]
+
+    def listdir(self, rel):
+        return self._record("listdir", self._path(rel))
+
+    def pruned(self, rel):
+        return self._record("pruned", self._path(rel))
+
+    def iter_lines(self, rel):
+        """Đọc file UTF-8 theo từng dòng (ghi lại size + mtime) — không nạp cả file vào bộ nhớ."""
+        f = self._open(self._path(rel), errors="replace")
+        if f is None:
+            return
+        with f:
+            yield from f
+
+    def read_text(self, rel):
+        """Đọc file UTF-8 (ghi lại size + mtime). Trả về None nếu không đọc được / hết ngân sách."""
+        f = self._open(self._path(rel))
+        if f is None:
+            return None
+        try:
+            with f:
+                return f.read()
+        except (OSError, UnicodeDecodeError):
+            return None
 
 
 class ProjectScanner:
     """Quét project directory để trích xuất thông tin thật."""
 
-    def __init__(self, target_dir: str):
+    def __init__(self, target_dir: str, use_cache: bool = False, workers: int = 1, budget: ScanBudget = None):
         self.target_dir = target_dir
-        self.profile = {
-            "has_existing_code": False,
-            "tech_stack": [],
-            "framework": None,
-            "language": None,
-            "package_manager": None,
-            "dependencies": {},
-            "dev_dependencies": {},
-            "scripts": {},
-            "docker": {
-                "has_docker": False,
-                "has_compose": False,
-                "has_prod_compose": False,
-                "services": [],
-                "ports": [],
-            },
-            "database": {
-                "type": None,
-                "has_prisma": False,
-                "models": [],
-                "schema_raw": "",
-            },
-            "api": {
-                "routes": [],
-                "has_api_dir": False,
-            },
-            "pages": [],
-            "env_vars": [],
-            "project_description": "",
-            "project_name": "",
-            "project_version": "",
-            "source_structure": [],
+        self.use_cache = use_cache
+        self.workers = max(1, workers or 1)  # >1 → chạy detectors song song trên thread pool
+        self.budget = budget  # ScanBudget — giới hạn file / độ sâu / byte / thời gian (None = không giới hạn)
+        self.index = None  # FileIndex — dựng 1 lần trong scan()
+        self._indexed_ns = 0
+        self.results = {}  # kết quả detector của root (tên → {"deps", "profile"}) — rescan() dùng lại
+        self.package_results = {}  # thư mục package → kết quả detector của package
+        self.profile = _empty_profile()
+        self.scan_stats = {
+            "detectors_run": 0, "detectors_cached": 0, "dirs_rescanned": 0, "dirs_cached": 0, "packages": 0,
         }
 
     def scan(self):
         """Chạy toàn bộ quá trình quét."""
-        self._scan_package_json()
-        self._scan_pyproject()
-        self._scan_docker()
-        self._scan_prisma()
-        self._scan_env()
-        self._scan_api_routes()
-        self._scan_pages()
-        self._scan_readme()
-        self._scan_source_structure()
-        self._detect_framework()
-
-        # Đánh dấu có code hay không
-        if (self.profile["tech_stack"]
-            or self.profile["dependencies"]
-            or self.profile["dev_dependencies"]
-            or self.profile["docker"]["has_docker"]
-            or self.profile["docker"]["has_compose"]):
-            self.profile["has_existing_code"] = True
+        cache = ScanCache(self.target_dir).load() if self.use_cache else None
+        started_ns = time.time_ns()
+        if self.budget is not None:
+            self.budget.start()
+
+        # Duyệt cây thư mục đúng 1 lần — mọi phase đọc từ index này
+        self.index = FileIndex(self.target_dir).build(
+            previous=cache.tree if cache else None,
+            is_stable=cache.is_stable if cache else None,
+            budget=self.budget,
+        )
+        self._indexed_ns = started_ns
+        self._analyze(lambda base, name, method: self._run_detector(name, method, cache, base))
+
+        # Kết quả partial (index bị cắt) không được cache — lần quét sau đủ ngân sách sẽ quét lại.
+        # Mọi listing + detector đều lấy từ cache → nội dung cache không đổi, bỏ qua lần ghi lại
+        # (mọi thứ đã dùng lại đều stable theo scanned_at_ns cũ nên giữ mốc cũ vẫn đúng)
+        unchanged = self.index.dirs_scanned == 0 and self.scan_stats["detectors_run"] == 0
+        if cache is not None and not self.index.truncated and not unchanged:
+            cache.save(started_ns, self.index.snapshot(), self.results, self.package_results)
 
         return self.profile
 
+    def rescan(self, dirty=None):
+        """Quét lại sau scan() (watch mode): index dựng tăng dần từ index trước, chỉ chạy lại
+        detector trong `dirty` ({(base, tên detector)}; None = tất cả) — detector khác dùng kết quả cũ.
+
+        Người gọi chịu trách nhiệm chọn `dirty` đúng (xem watch.affected_detectors).
+        """
+        started_ns = time.time_ns()
+        previous_ns = self._indexed_ns
+        self.index = FileIndex(self.target_dir).build(
+            previous=self.index.snapshot(),
+            is_stable=lambda mtime_ns: mtime_ns is not None and mtime_ns < previous_ns - RACY_WINDOW_NS,
+        )
+        self._indexed_ns = started_ns
+        previous = dict(self.package_results, **{"": self.results})
+
+        def run(base, name, method):
+            cached = previous.get(base, {}).get(name)
+            if cached is not None and not cached.get("partial") and (dirty is not None and (base, name) not in dirty):
+                return cached, True
+            return self._run_detector(name, method, None, base)
+
+        self._analyze(run)
+        if self.use_cache and not self.index.truncated:
+            ScanCache(self.target_dir).save(started_ns, self.index.snapshot(), self.results, self.package_results)
+        return self.profile
+
+    def _analyze(self, run):
+        """Chạy detectors trên index hiện tại rồi dựng profile. run(base, name, method) → (result, from_cache)."""
+        self.scan_stats.update(detectors_run=0, detectors_cached=0,
+                               dirs_rescanned=self.index.dirs_scanned, dirs_cached=self.index.dirs_reused)
+
+        # Monorepo: mỗi package (apps/*, packages/*...) chạy lại toàn bộ DETECTORS với root là thư mục package
+        tool, patterns = read_workspace_patterns(self._read_root_text)
+        packages = expand_workspaces(self.index.files_named("package.json"), patterns) if patterns else []
+        self.scan_stats["packages"] = len(packages)
+        jobs = [(base, name, method) for base in [""] + packages for name, method in DETECTORS]
+
+        # Detectors độc lập nhau (chỉ đọc index) → có thể chạy song song;
+        # kết quả luôn merge theo thứ tự DETECTORS nên profile giống hệt chế độ tuần tự
+        if self.workers > 1:
+            from concurrent.futures import ThreadPoolExecutor
+
+            with ThreadPoolExecutor(max_workers=min(self.workers, len(jobs))) as pool:
+                futures = [pool.submit(run, base, name, method) for base, name, method in jobs]
+                outcomes = [f.result() for f in futures]
+        else:
+            outcomes = [run(base, name, method) for base, name, method in jobs]
+
+        results = {}
+        package_results = {base: {} for base in packages}
+        for (base, name, _), (result, from_cache) in zip(jobs, outcomes):
+            (package_results[base] if base else results)[name] = result
+            self.scan_stats["detectors_cached" if from_cache else "detectors_run"] += 1
+        self.results = results
+        self.package_results = package_results
+
+        self.profile = _build_profile(results)
+        if packages:
+            package_profiles = {base: _build_profile(package_results[base]) for base in packages}
+            for base in packages:
+                _merge_package(self.profile, base, package_profiles[base])
+            self.profile["workspace"] = {
+                "tool": tool,
+                "patterns": patterns,
+                "packages": [
+                    {
+                        "path": base,
+                        "name": package_profiles[base]["project_name"] or base.rpartition("/")[2],
+                        "framework": package_profiles[base]["framework"],
+                        "language": package_profiles[base]["language"],
+                    }
+                    for base in packages
+                ],
+            }
+            self.profile["packages"] = package_profiles
+        if self.index.truncated:
+            self.profile["partial"]["file_index"] = sorted(self.index.truncated)
+        _finalize_profile(self.profile)
+
+    def _read_root_text(self, rel):
+        """Đọc file ở root (không ghi dependency — chỉ dùng để xác định workspace)."""
+        if not self.index.is_file(rel):
+            return None
+        try:
+            with open(os.path.join(self.target_dir, rel), "r", encoding="utf-8") as f:
+                return f.read()
+        except (OSError, UnicodeDecodeError):
+            return None
+
+    def _run_detector(self, name, method, cache, base=""):
+        """Chạy 1 detector cho root (base '') hoặc 1 package (hoặc dùng lại cache nếu mọi dependency còn nguyên).
+
+        Returns (result, from_cache). Thread-safe: chỉ ghi vào context riêng.
+        """
+        if cache is not None:
+            cached = (cache.packages.get(base, {}) if base else cache.detectors).get(name)
+            if cached is not None and not cached.get("partial") and self._deps_unchanged(cached["deps"], cache):
+                return cached, True
+
+        ctx = _DetectorContext(self, base)
+        getattr(self, method)(ctx)
+        result = {"deps": ctx.deps, "profile": _compact(ctx.profile)}
+        if ctx.partial:
+            # Detector chạm giới hạn: giữ phần đã quét được, đánh dấu để không dùng lại từ cache
+            result["partial"] = True
+            result["profile"]["partial"] = {f"{base}:{name}" if base else name: sorted(ctx.partial)}
+        return result, False
+
+    def _deps_unchanged(self, deps, cache):
+        probe = _DetectorContext(self)
+        for kind, arg, expected in deps:
+            actual = probe.fingerprint(kind, arg)
+            if actual != expected:
+                return False
+            if kind == "file" and actual is not None and not cache.is_stable(actual[1]):
+                return False
+        return True
+
+
     # =========================================================================
     # PACKAGE.JSON
     # =========================================================================
-    def _scan_package_json(self):
+    def _scan_package_json(self, ctx):
         """Đọc package.json để lấy dependencies, scripts, tên project."""
-        pkg_path = os.path.join(self.target_dir, "package.json")
-        if not os.path.exists(pkg_path):
+        if not ctx.is_file("package.json"):
             return
 
+        content = ctx.read_text("package.json")
+        if content is None:
+            return
         try:
-            with open(pkg_path, "r", encoding="utf-8") as f:
-                pkg = json.load(f)
-        except (json.JSONDecodeError, UnicodeDecodeError):
+            pkg = json.loads(content)
+        except json.JSONDecodeError:
             return
 
-        self.profile["project_name"] = pkg.get("name", "")
-        self.profile["project_version"] = pkg.get("version", "")
-        self.profile["project_description"] = pkg.get("description", "")
+        ctx.profile["project_name"] = pkg.get("name", "")
+        ctx.profile["project_version"] = pkg.get("version", "")
+        ctx.profile["project_description"] = pkg.get("description", "")
 
         deps = pkg.get("dependencies", {})
         dev_deps = pkg.get("devDependencies", {})
-        self.profile["dependencies"] = deps
-        self.profile["dev_dependencies"] = dev_deps
+        ctx.profile["dependencies"] = deps
+        ctx.profile["dev_dependencies"] = dev_deps
 
         # Detect tech stack from deps
         all_deps = {**deps, **dev_deps}
@@ -120,258 +559,205 @@ class ProjectScanner:
             "prisma-client-js": "Prisma",
         }
         for dep_name, tech_label in tech_map.items():
-            if dep_name in all_deps and tech_label not in self.profile["tech_stack"]:
-                self.profile["tech_stack"].append(tech_label)
+            if dep_name in all_deps and tech_label not in ctx.profile["tech_stack"]:
+                ctx.profile["tech_stack"].append(tech_label)
 
-        self.profile["scripts"] = pkg.get("scripts", {})
-        self.profile["language"] = "JavaScript"
+        ctx.profile["scripts"] = pkg.get("scripts", {})
+        ctx.profile["language"] = "JavaScript"
         if "typescript" in all_deps or "ts-node" in all_deps or "tsx" in all_deps:
-            self.profile["language"] = "TypeScript"
+            ctx.profile["language"] = "TypeScript"
 
         # Package manager detection
-        if os.path.exists(os.path.join(self.target_dir, "pnpm-workspace.yaml")) or os.path.exists(os.path.join(self.target_dir, "pnpm-lock.yaml")):
-            self.profile["package_manager"] = "pnpm"
-            if "pnpm" not in self.profile["tech_stack"]:
-                self.profile["tech_stack"].append("pnpm Monorepo")
-        elif os.path.exists(os.path.join(self.target_dir, "yarn.lock")):
-            self.profile["package_manager"] = "yarn"
+        if ctx.is_file("pnpm-workspace.yaml") or ctx.is_file("pnpm-lock.yaml"):
+            ctx.profile["package_manager"] = "pnpm"
+            if "pnpm" not in ctx.profile["tech_stack"]:
+                ctx.profile["tech_stack"].append("pnpm Monorepo")
+        elif ctx.is_file("yarn.lock"):
+            ctx.profile["package_manager"] = "yarn"
         else:
-            self.profile["package_manager"] = "npm"
+            ctx.profile["package_manager"] = "npm"
 
     # =========================================================================
     # PYPROJECT.TOML
     # =========================================================================
-    def _scan_pyproject(self):
+    def _scan_pyproject(self, ctx):
         """Đọc pyproject.toml cho Python projects."""
-        pyproject_path = os.path.join(self.target_dir, "pyproject.toml")
-        if not os.path.exists(pyproject_path):
+        if not ctx.is_file("pyproject.toml"):
             return
 
-        try:
-            with open(pyproject_path, "r", encoding="utf-8") as f:
-                content = f.read()
-        except UnicodeDecodeError:
+        content = ctx.read_text("pyproject.toml")
+        if content is None:
             return
 
-        self.profile["language"] = "Python"
-        if "Python" not in self.profile["tech_stack"]:
-            self.profile["tech_stack"].append("Python")
+        ctx.profile["language"] = "Python"
+        if "Python" not in ctx.profile["tech_stack"]:
+            ctx.profile["tech_stack"].append("Python")
 
         # Extract name
         name_match = re.search(r'name\s*=\s*"([^"]+)"', content)
-        if name_match and not self.profile["project_name"]:
-            self.profile["project_name"] = name_match.group(1)
+        if name_match and not ctx.profile["project_name"]:
+            ctx.profile["project_name"] = name_match.group(1)
 
         # Extract version
         ver_match = re.search(r'version\s*=\s*"([^"]+)"', content)
         if ver_match:
-            self.profile["project_version"] = ver_match.group(1)
+            ctx.profile["project_version"] = ver_match.group(1)
 
         # Extract description
         desc_match = re.search(r'description\s*=\s*"([^"]+)"', content)
-        if desc_match and not self.profile["project_description"]:
-            self.profile["project_description"] = desc_match.group(1)
+        if desc_match and not ctx.profile["project_description"]:
+            ctx.profile["project_description"] = desc_match.group(1)
 
         # Detect frameworks
         if "django" in content.lower():
-            self.profile["tech_stack"].append("Django")
+            ctx.profile["tech_stack"].append("Django")
         if "fastapi" in content.lower():
-            self.profile["tech_stack"].append("FastAPI")
+            ctx.profile["tech_stack"].append("FastAPI")
         if "flask" in content.lower():
-            self.profile["tech_stack"].append("Flask")
+            ctx.profile["tech_stack"].append("Flask")
 
     # =========================================================================
     # DOCKER
     # =========================================================================
-    def _scan_docker(self):
+    def _scan_docker(self, ctx):
         """Quét Docker files để lấy services, ports."""
         # Dockerfile
-        dockerfiles = glob.glob(os.path.join(self.target_dir, "**/Dockerfile"), recursive=True)
+        dockerfiles = ctx.files_named("Dockerfile")
         if dockerfiles:
-            self.profile["docker"]["has_docker"] = True
-            if "Docker" not in self.profile["tech_stack"]:
-                self.profile["tech_stack"].append("Docker")
-
-        # docker-compose.yml
-        for compose_name in ["docker-compose.yml", "docker-compose.yaml", "compose.yml", "compose.yaml"]:
-            compose_path = os.path.join(self.target_dir, compose_name)
-            if os.path.exists(compose_path):
-                self.profile["docker"]["has_compose"] = True
-                self._parse_compose(compose_path)
-                break
-
-        # docker-compose.prod.yml
-        for prod_name in ["docker-compose.prod.yml", "docker-compose.prod.yaml", "docker-compose.production.yml"]:
-            prod_path = os.path.join(self.target_dir, prod_name)
-            if os.path.exists(prod_path):
-                self.profile["docker"]["has_prod_compose"] = True
-                break
-
-    def _parse_compose(self, filepath):
-        """Parse docker-compose để lấy services và ports (simple parser)."""
-        try:
-            with open(filepath, "r", encoding="utf-8") as f:
-                content = f.read()
-        except UnicodeDecodeError:
+            ctx.profile["docker"]["has_docker"] = True
+            if "Docker" not in ctx.profile["tech_stack"]:
+                ctx.profile["tech_stack"].append("Docker")
+
+        # docker-compose: base + override = stack mặc định; prod/staging/dev... = môi trường riêng
+        # docker compose chỉ dùng 1 file base
+        base_file = next((name for name in COMPOSE_BASE_FILES if ctx.is_file(name)), None)
+        if not base_file:
             return
-
-        # Extract services (simple regex)
-        in_services = False
-        current_service = None
-        indent_level = 0
-
-        for line in content.split("\n"):
-            stripped = line.strip()
-            if stripped.startswith("services:"):
-                in_services = True
+        override_files = []
+        environments = {}  # variant → [file]
+        for variant, candidates in compose_variant_candidates(base_file):
+            rel = next((name for name in candidates if ctx.is_file(name)), None)
+            if rel is None:
                 continue
-
-            if in_services:
-                # Service name (2-space indent, ends with :)
-                if re.match(r"^  \w", line) and stripped.endswith(":") and not stripped.startswith("-"):
-                    current_service = stripped.rstrip(":")
-                    if current_service not in self.profile["docker"]["services"]:
-                        self.profile["docker"]["services"].append(current_service)
-
-                # Port mapping
-                port_match = re.search(r'["\']?(\d+):(\d+)["\']?', stripped)
-                if port_match and current_service:
-                    port_entry = f"{current_service}: {port_match.group(1)}:{port_match.group(2)}"
-                    if port_entry not in self.profile["docker"]["ports"]:
-                        self.profile["docker"]["ports"].append(port_entry)
+            if variant == OVERRIDE_VARIANT:
+                override_files.append(rel)
+            else:
+                environments[variant] = [rel]
+                if variant in PROD_VARIANTS:
+                    ctx.profile["docker"]["has_prod_compose"] = True
+
+        ctx.profile["docker"]["has_compose"] = True
+        self._parse_compose(ctx, [base_file] + override_files, environments)
+
+    def _parse_compose(self, ctx, files, environments):
+        """Gộp compose file → services, ports, model chi tiết `docker.compose`
+        + `docker.compose_environments` (base + từng biến thể môi trường, không gộp chéo)."""
+        analyzer = ComposeAnalyzer(ctx.iter_lines, ctx.is_file)
+        compose = analyzer.analyze(files)
+        docker = ctx.profile["docker"]
+        docker["compose"] = compose
+        docker["compose_environments"] = {
+            variant: analyzer.analyze(files[:1] + variant_files)
+            for variant, variant_files in environments.items()
+        }
+        for name, service in compose["services"].items():
+            docker["services"].append(name)
+            for port in service["ports"]:
+                entry = format_port(name, port)
+                if entry not in docker["ports"]:
+                    docker["ports"].append(entry)
 
     # =========================================================================
     # PRISMA
     # =========================================================================
-    def _scan_prisma(self):
-        """Quét Prisma schema để lấy models."""
-        # Check multiple possible paths
-        schema_paths = [
-            os.path.join(self.target_dir, "prisma", "schema.prisma"),
-            os.path.join(self.target_dir, "packages", "database", "prisma", "schema.prisma"),
-            os.path.join(self.target_dir, "apps", "api", "prisma", "schema.prisma"),
-        ]
-
-        schema_path = None
-        for p in schema_paths:
-            if os.path.exists(p):
-                schema_path = p
-                break
-
-        if not schema_path:
-            return
-
-        self.profile["database"]["has_prisma"] = True
-        if "Prisma" not in self.profile["tech_stack"]:
-            self.profile["tech_stack"].append("Prisma")
-
-        try:
-            with open(schema_path, "r", encoding="utf-8") as f:
-                content = f.read()
-        except UnicodeDecodeError:
+    def _scan_prisma(self, ctx):
+        """Quét mọi schema Prisma trong project → graph model / enum / relation."""
+        paths = ctx.files_with_suffix(SCHEMA_EXTENSION)
+        if not paths:
             return
 
-        # Detect database type
-        if 'provider = "postgresql"' in content:
-            self.profile["database"]["type"] = "PostgreSQL"
-            if "PostgreSQL" not in self.profile["tech_stack"]:
-                self.profile["tech_stack"].append("PostgreSQL")
-        elif 'provider = "mysql"' in content:
-            self.profile["database"]["type"] = "MySQL"
-        elif 'provider = "sqlite"' in content:
-            self.profile["database"]["type"] = "SQLite"
-
-        # Extract model names and their fields (summary)
-        models = re.findall(r'model\s+(\w+)\s*\{([^}]+)\}', content, re.DOTALL)
-        for model_name, model_body in models:
-            fields = []
-            for line in model_body.strip().split("\n"):
-                line = line.strip()
-                if not line or line.startswith("//") or line.startswith("@@"):
-                    continue
-                parts = line.split()
-                if len(parts) >= 2:
-                    field_name = parts[0]
-                    field_type = parts[1]
-                    fields.append(f"{field_name}: {field_type}")
+        ctx.profile["database"]["has_prisma"] = True
+        if "Prisma" not in ctx.profile["tech_stack"]:
+            ctx.profile["tech_stack"].append("Prisma")
 
-            self.profile["database"]["models"].append({
-                "name": model_name,
-                "fields": fields[:10],  # Limit to 10 fields per model
-            })
+        schemas = group_schemas([PrismaFile(rel, ctx.iter_lines(rel)) for rel in paths])
+        graph = build_graph(schemas)
+        database = ctx.profile["database"]
+        database.update(graph)
 
-        # Store raw schema (truncated)
-        self.profile["database"]["schema_raw"] = content[:3000]
+        # Loại DB theo datasource của schema chính
+        provider = schemas[0]["provider"]
+        database["type"] = PROVIDER_NAMES.get(provider, provider)
+        if database["type"] == "PostgreSQL" and "PostgreSQL" not in ctx.profile["tech_stack"]:
+            ctx.profile["tech_stack"].append("PostgreSQL")
 
     # =========================================================================
     # ENV VARS
     # =========================================================================
-    def _scan_env(self):
-        """Quét .env.example hoặc .env để lấy tên biến (KHÔNG lấy giá trị)."""
-        env_files = [".env.example", ".env.local.example", ".env.development"]
-        for env_name in env_files:
-            env_path = os.path.join(self.target_dir, env_name)
-            if not os.path.exists(env_path):
+    def _scan_env(self, ctx):
+        """Gộp tên biến từ mọi env file đã biết (KHÔNG lấy giá trị).
+
+        File được đọc theo thứ tự ưu tiên tăng dần (envfile.ENV_FILES) nên
+        env_sources[KEY] là file có độ ưu tiên cao nhất định nghĩa KEY.
+        """
+        names = []
+        seen = set()
+        sources = {}
+        for env_name in ENV_FILES:
+            if not ctx.is_file(env_name):
                 continue
-
-            try:
-                with open(env_path, "r", encoding="utf-8") as f:
-                    for line in f:
-                        line = line.strip()
-                        if not line or line.startswith("#"):
-                            continue
-                        key = line.split("=")[0].strip()
-                        if key and key not in self.profile["env_vars"]:
-                            self.profile["env_vars"].append(key)
-            except UnicodeDecodeError:
-                pass
-            break  # Only read first found
+            for key, _ in parse_env_lines(ctx.iter_lines(env_name)):
+                if key not in seen:
+                    seen.add(key)
+                    names.append(key)
+                sources[key] = env_name
+        ctx.profile["env_vars"] = names
+        ctx.profile["env_sources"] = sources
 
     # =========================================================================
     # API ROUTES
     # =========================================================================
-    def _scan_api_routes(self):
+    def _scan_api_routes(self, ctx):
         """Quét API routes từ cấu trúc thư mục."""
         # Next.js App Router
-        api_dir = os.path.join(self.target_dir, "app", "api")
-        if not os.path.exists(api_dir):
-            api_dir = os.path.join(self.target_dir, "src", "app", "api")
+        api_dir = "app/api"
+        if not ctx.is_dir(api_dir):
+            api_dir = "src/app/api"
 
-        if os.path.exists(api_dir):
-            self.profile["api"]["has_api_dir"] = True
-            for root, dirs, files in os.walk(api_dir):
+        if ctx.is_dir(api_dir):
+            ctx.profile["api"]["has_api_dir"] = True
+            for root, dirs, files in ctx.walk(api_dir):
                 for f in files:
                     if f in ("route.ts", "route.js"):
-                        rel = os.path.relpath(root, api_dir)
-                        route = "/api/" + rel.replace("\\", "/").replace("[", ":").replace("]", "")
-                        if route not in self.profile["api"]["routes"]:
-                            self.profile["api"]["routes"].append(route)
+                        rel = _relative_to(root, api_dir)
+                        route = "/api/" + rel.replace("[", ":").replace("]", "")
+                        if route not in ctx.profile["api"]["routes"]:
+                            ctx.profile["api"]["routes"].append(route)
 
         # NestJS controllers
-        src_dir = os.path.join(self.target_dir, "src")
-        if os.path.exists(src_dir):
-            for root, dirs, files in os.walk(src_dir):
+        if ctx.is_dir("src"):
+            for root, dirs, files in ctx.walk("src"):
                 for f in files:
                     if f.endswith(".controller.ts") or f.endswith(".controller.js"):
                         controller_name = f.replace(".controller.ts", "").replace(".controller.js", "")
                         route = f"/api/{controller_name}"
-                        if route not in self.profile["api"]["routes"]:
-                            self.profile["api"]["routes"].append(route)
+                        if route not in ctx.profile["api"]["routes"]:
+                            ctx.profile["api"]["routes"].append(route)
 
     # =========================================================================
     # PAGES
     # =========================================================================
-    def _scan_pages(self):
+    def _scan_pages(self, ctx):
         """Quét public pages từ cấu trúc thư mục."""
         # Next.js App Router pages
-        app_dir = os.path.join(self.target_dir, "app")
-        if not os.path.exists(app_dir):
-            app_dir = os.path.join(self.target_dir, "src", "app")
+        app_dir = "app"
+        if not ctx.is_dir(app_dir):
+            app_dir = "src/app"
 
-        if os.path.exists(app_dir):
-            for root, dirs, files in os.walk(app_dir):
+        if ctx.is_dir(app_dir):
+            for root, dirs, files in ctx.walk(app_dir):
                 # Skip api, components, etc
-                rel = os.path.relpath(root, app_dir)
+                rel = _relative_to(root, app_dir)
                 if rel.startswith("api") or rel.startswith("_"):
                     continue
                 for f in files:
@@ -379,23 +765,20 @@ class ProjectScanner:
                         if rel == ".":
                             page_route = "/"
                         else:
-                            page_route = "/" + rel.replace("\\", "/").replace("(", "").replace(")", "")
-                        if page_route not in self.profile["pages"]:
-                            self.profile["pages"].append(page_route)
+                            page_route = "/" + rel.replace("(", "").replace(")", "")
+                        if page_route not in ctx.profile["pages"]:
+                            ctx.profile["pages"].append(page_route)
 
     # =========================================================================
     # README
     # =========================================================================
-    def _scan_readme(self):
+    def _scan_readme(self, ctx):
         """Đọc README để lấy mô tả dự án."""
-        readme_path = os.path.join(self.target_dir, "README.md")
-        if not os.path.exists(readme_path):
+        if not ctx.is_file("README.md"):
             return
 
-        try:
-            with open(readme_path, "r", encoding="utf-8") as f:
-                content = f.read()
-        except UnicodeDecodeError:
+        content = ctx.read_text("README.md")
+        if content is None:
             return
 
         # Lấy nội dung sau heading đầu tiên (thường là mô tả)
@@ -415,62 +798,42 @@ class ProjectScanner:
                 if len(desc_lines) >= 3:
                     break
 
-        if desc_lines and not self.profile["project_description"]:
-            self.profile["project_description"] = " ".join(desc_lines)
+        if desc_lines and not ctx.profile["project_description"]:
+            ctx.profile["project_description"] = " ".join(desc_lines)
 
     # =========================================================================
     # SOURCE STRUCTURE
     # =========================================================================
-    def _scan_source_structure(self):
+    def _scan_source_structure(self, ctx):
         """Quét cấu trúc thư mục cấp 1-2 để hiểu kiến trúc."""
-        ignore_dirs = {
-            "node_modules", ".git", ".next", ".agent", "__pycache__",
-            "dist", "build", ".cache", ".turbo", "coverage",
-            "test-output", "test-output-deep", "test-output-infra",
-        }
+        ignore_dirs = BUILTIN_IGNORE_DIRS
 
-        if not os.path.isdir(self.target_dir):
+        listing = ctx.listdir("")
+        if listing is None:
             return
+        root_dirs, root_files = listing
+        root_items = root_dirs + root_files
+        if ".agent" in ctx.pruned(""):
+            root_items.append(".agent")
 
-        for item in sorted(os.listdir(self.target_dir)):
+        for item in sorted(root_items):
             if item.startswith(".") and item not in (".env.example",):
                 if item == ".agent":
-                    self.profile["source_structure"].append(f"📁 {item}/ (Agent config)")
+                    ctx.profile["source_structure"].append(f"📁 {item}/ (Agent config)")
                 continue
             if item in ignore_dirs:
                 continue
 
-            full_path = os.path.join(self.target_dir, item)
-            if os.path.isdir(full_path):
+            if item in root_dirs:
                 # Count children
-                try:
-                    children = [c for c in os.listdir(full_path) if not c.startswith(".") and c not in ignore_dirs]
-                    self.profile["source_structure"].append(f"📁 {item}/ ({len(children)} items)")
-                except PermissionError:
-                    self.profile["source_structure"].append(f"📁 {item}/")
+                child_listing = ctx.listdir(item)
+                if child_listing is not None:
+                    children = [c for c in child_listing[0] + child_listing[1] if not c.startswith(".") and c not in ignore_dirs]
+                    ctx.profile["source_structure"].append(f"📁 {item}/ ({len(children)} items)")
+                else:
+                    ctx.profile["source_structure"].append(f"📁 {item}/")
             else:
-                self.profile["source_structure"].append(f"📄 {item}")
-
-    # =========================================================================
-    # FRAMEWORK DETECTION
-    # =========================================================================
-    def _detect_framework(self):
-        """Xác định framework chính từ tech stack."""
-        ts = self.profile["tech_stack"]
-        if "Next.js" in ts:
-            self.profile["framework"] = "Next.js"
-        elif "NestJS" in ts:
-            self.profile["framework"] = "NestJS"
-        elif "Django" in ts:
-            self.profile["framework"] = "Django"
-        elif "FastAPI" in ts:
-            self.profile["framework"] = "FastAPI"
-        elif "Express.js" in ts:
-            self.profile["framework"] = "Express.js"
-        elif "Vue.js" in ts:
-            self.profile["framework"] = "Vue.js"
-        elif "React" in ts:
-            self.profile["framework"] = "React"
+                ctx.profile["source_structure"].append(f"📄 {item}")
 
     # =========================================================================
     # REPORT GENERATION
@@ -496,6 +859,14 @@ class ProjectScanner:
         if p["tech_stack"]:
             lines.append(f"  🛠️ Tech Stack: {', '.join(p['tech_stack'])}")
 
+        if p["workspace"]:
+            packages = p["workspace"]["packages"]
+            lines.append(f"  🧩 Workspace:  {p['workspace']['tool']} ({len(packages)} packages)")
+            for pkg in packages[:8]:
+                lines.append(f"     ├─ {pkg['path']}" + (f" ({pkg['framework']})" if pkg["framework"] else ""))
+            if len(packages) > 8:
+                lines.append(f"     └─ ...và {len(packages) - 8} packages khác")
+
         if p["docker"]["has_compose"]:
             lines.append(f"  🐳 Docker:     {len(p['docker']['services'])} services")
             for port in p["docker"]["ports"]:
@@ -521,6 +892,11 @@ class ProjectScanner:
         if p["env_vars"]:
             lines.append(f"  🔑 ENV Vars:   {len(p['env_vars'])}")
 
+        if p["partial"]:
+            lines.append(f"  ⚠️  Partial:    chạm giới hạn quét — kết quả chưa đầy đủ")
+            for component, reasons in p["partial"].items():
+                lines.append(f"     ├─ {component}: {', '.join(reasons)}")
+
         lines.append("─" * 50)
         return "\n".join(lines)
 
@@ -552,13 +928,50 @@ class ProjectScanner:
 
             if p["docker"]["services"]:
                 sections.append(f"\n### Services ({len(p['docker']['services'])})")
+                compose_services = p["docker"].get("compose", {}).get("services", {})
                 for svc in p["docker"]["services"]:
-                    sections.append(f"- `{svc}`")
+                    details = compose_services.get(svc, {})
+                    line = f"- `{svc}`"
+                    if details.get("image"):
+                        line += f" — image `{details['image']}`"
+                    elif details.get("build"):
+                        line += f" — build `{details['build']}`"
+                    if details.get("depends_on"):
+                        line += f" (depends on: {', '.join(details['depends_on'])})"
+                    sections.append(line)
 
             if p["docker"]["ports"]:
                 sections.append(f"\n### Port Mapping")
                 for port in p["docker"]["ports"]:
                     sections.append(f"- {port}")
+
+            compose = p["docker"].get("compose", {})
+            if compose.get("volumes") or compose.get("networks"):
+                sections.append(f"\n### Volumes & Networks")
+                if compose.get("volumes"):
+                    sections.append(f"- **Volumes**: {', '.join(compose['volumes'])}")
+                if compose.get("networks"):
+                    sections.append(f"- **Networks**: {', '.join(compose['networks'])}")
+            if len(compose.get("files", [])) > 1:
+                sections.append(f"- **Compose files**: {', '.join(f'`{f}`' for f in compose['files'])}")
+            compose_errors = compose.get("errors", []) + [
+                error for env in p["docker"].get("compose_environments", {}).values()
+                for error in env.get("errors", []) if error not in compose.get("errors", [])
+            ]
+            for error in compose_errors:
+                sections.append(f"- ⚠️ **Compose file lỗi** (bỏ qua): {error}")
+
+            environments = p["docker"].get("compose_environments", {})
+            if environments:
+                sections.append(f"\n### Compose Environments")
+                for variant, env in environments.items():
+                    services = env.get("services", {})
+                    env_files = " + ".join(f"`{f}`" for f in env.get("files", []))
+                    ports = [format_port(name, port) for name, svc in services.items() for port in svc.get("ports", [])]
+                    line = f"- **{variant}** ({env_files}): {', '.join(services) or '(không có service)'}"
+                    if ports:
+                        line += f" — ports: {', '.join(ports)}"
+                    sections.append(line)
         else:
             sections.append("- **Docker**: Chưa cấu hình — cần thiết lập Docker environment")
             sections.append("- **Ports**: Tuân thủ dải **8900-8999**")
@@ -566,8 +979,14 @@ class ProjectScanner:
         # ENV
         if p["env_vars"]:
             sections.append(f"\n## 🔑 Environment Variables ({len(p['env_vars'])})")
+            sources = p.get("env_sources") or {}
+            # Chỉ ghi nguồn khi biến đến từ nhiều env file khác nhau
+            show_source = len(set(sources.values())) > 1
             for var in p["env_vars"]:
-                sections.append(f"- `{var}`")
+                if show_source and var in sources:
+                    sections.append(f"- `{var}` ({sources[var]})")
+                else:
+                    sections.append(f"- `{var}`")
 
         # Security
         sections.append("\n## 🔒 Security Protocol")
@@ -587,13 +1006,36 @@ class ProjectScanner:
         if p["database"]["has_prisma"]:
             sections.append(f"## Database: {p['database']['type'] or 'Unknown'}")
             sections.append(f"Models: {len(p['database']['models'])}\n")
+            schemas = p["database"].get("schemas", [])
+            if len(schemas) > 1 or any(len(schema.get("files", [])) > 1 for schema in schemas):
+                for schema in schemas:
+                    sections.append(f"- Schema `{schema['path']}` ({len(schema.get('files', []))} files)")
+                sections.append("")
 
             for model in p["database"]["models"]:
-                sections.append(f"### {model['name']}")
+                kind = model.get("kind", "model")
+                sections.append(f"### {model['name']}" + (f" ({kind})" if kind != "model" else ""))
+                if model.get("doc"):
+                    sections.append(f"> {model['doc']}\n")
                 sections.append("```")
                 for field in model["fields"]:
                     sections.append(f"  {field}")
                 sections.append("```\n")
+
+            if p["database"].get("enums"):
+                sections.append(f"## Enums ({len(p['database']['enums'])})")
+                for enum in p["database"]["enums"]:
+                    sections.append(f"- `{enum['name']}`: {', '.join(enum.get('values', []))}")
+                sections.append("")
+
+            if p["database"].get("relations"):
+                sections.append(f"## Relations ({len(p['database']['relations'])})")
+                for rel in p["database"]["relations"]:
+                    line = f"- `{rel['model']}.{rel['field']}` → `{rel['target']}` ({rel['type']})"
+                    if rel.get("fields"):
+                        line += f" — {', '.join(rel['fields'])} → {', '.join(rel.get('references', []))}"
+                    sections.append(line)
+                sections.append("")
         else:
             sections.append("## Database")
             sections.append("Chưa phát hiện Database schema.")
@@ -635,6 +1077,13 @@ class ProjectScanner:
             sections.append(p["project_description"])
             sections.append("")
 
+        if p["workspace"]:
+            sections.append(f"## Workspace Packages ({len(p['workspace']['packages'])})")
+            for pkg in p["workspace"]["packages"]:
+                details = ", ".join(filter(None, [pkg["framework"], pkg["language"]]))
+                sections.append(f"- `{pkg['path']}` — {pkg['name']}" + (f" ({details})" if details else ""))
+            sections.append("")
+
         if p["source_structure"]:
             sections.append("## Cấu trúc source")
             for item in p["source_structure"]:
@@ -356,6 +356,9 @@ So sánh 2 versions của artifact → highlight thay đổi → đánh giá imp
 - 2 files hoặc 2 versions cần so sánh (spec, plan, tasks, code)
 
 ## 📋 Protocol
+0. Spec vs code: chạy `wb-agent diff --feature [feature]` — đối chiếu file path, endpoint, model
+   trong plan.md/tasks.md với code (scan index) → Thiếu / Đổi tên / Chưa implement / Thừa.
+   Dùng kết quả đó làm input cho Impact Analysis (bước 3) thay vì tự đọc lại toàn bộ code.
 1. Đọc cả 2 versions.
 2. So sánh section-by-section:
    - ➕ **Added**: Sections/requirements mới
@@ -692,6 +695,8 @@ Parse tasks.md → tính tiến độ → hiển thị dashboard trực quan.
 - `.agent/specs/[feature]/tasks.md`
 
 ## 📋 Protocol
+0. Ưu tiên chạy `wb-agent status` (hoặc `wb-agent status --feature [feature]`) — parser built-in
+   in sẵn dashboard bên dưới cho mọi feature, không cần tự đếm. Chỉ làm thủ công các bước sau khi CLI không có sẵn.
 1. Parse tasks.md → đếm checkboxes:
    - `- [X]` = completed
    - `- [ ]` = pending
@@ -775,6 +780,10 @@ Parse tasks.md → tạo issues sẵn sàng import vào GitHub/GitLab/Jira.
 - `.agent/specs/[feature]/tasks.md`
 
 ## 📋 Protocol
+0. Ưu tiên chạy `wb-agent export-issues --tracker [github|gitlab|jira]` — sinh `issues-export.md`
+   + file JSON/CSV import, chỉ gồm task mới / đã đổi so với lần sync trước (ledger `issues-sync.json`).
+   Sau khi người dùng import xong → `wb-agent export-issues --tracker ... --confirm` để ghi ledger.
+   Chỉ làm thủ công các bước sau khi CLI không có sẵn.
 1. Parse mỗi task → extract: ID, title, description, phase, user story link.
 2. Map sang issue format:
    ```markdown
@@ -790,9 +799,12 @@ Parse tasks.md → tạo issues sẵn sàng import vào GitHub/GitLab/Jira.
 
 ## 📤 Output
 - File: `.agent/memory/issues-export.md`
+- (CLI) `.agent/memory/issues-export.[<feature>.]<tracker>.<json|csv>` (+ `.removed.txt` với CSV) + `.agent/memory/issues-sync.json`
 
 ## 🚫 Guard Rails
 - KHÔNG tạo issue trên remote — chỉ generate file export.
+- KHÔNG xoá `issues-sync.json` — mất ledger thì lần export sau tạo issue trùng.
+- KHÔNG `--confirm` trước khi file export đã thực sự được import vào tracker.
 """
 
 
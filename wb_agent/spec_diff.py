@@ -0,0 +1,297 @@
+"""
+Spec Diff - So sánh artifact trong plan.md / tasks.md với code thật (`wb-agent diff`).
+
+Trích từ spec:
+  - file path  (tasks.md: file của từng task; plan.md: path ngoài code block)
+  - endpoint   (`POST /api/v1/users`, `GET /api/users/{id}`)
+  - model      (`model User {` trong code block, "User model", "entity `Order`")
+rồi đối chiếu với dữ liệu ProjectScanner đã index (FileIndex, api.routes, database.models).
+Scanner chạy với scan cache → lần chạy sau chỉ stat thư mục, không đọc lại cây (đủ nhanh cho pre-commit).
+
+Mức độ:
+  - error:   artifact của task đã `[X]` nhưng không có trong code
+  - pending: artifact chưa có nhưng task còn mở / chỉ nhắc trong plan.md
+  - renamed: không thấy đúng tên nhưng có ứng viên gần giống (file cùng tên chỗ khác, tên tương tự)
+  - extra:   endpoint / model có trong code nhưng spec không nhắc tới
+"""
+
+import difflib
+import os
+import re
+
+from .status import SPECS_DIR
+from .tasks import extract_paths, parse_tasks
+
+SPEC_DOCS = ("plan.md", "tasks.md")
+
+HTTP_METHODS = ("GET", "POST", "PUT", "PATCH", "DELETE", "HEAD", "OPTIONS")
+_ENDPOINT_RE = re.compile(r"\b(" + "|".join(HTTP_METHODS) + r")\s+`?(/[^\s`'\")|,]*)")
+_PRISMA_MODEL_RE = re.compile(r"^\s*(?:model|view)\s+([A-Z]\w*)\s*\{")
+_MODEL_REF_RE = re.compile(
+    r"\b(?i:model|entity|table)\s+`?([A-Z]\w*)`?"
+    r"|`?\b([A-Z]\w*)`?\s+(?i:model|entity)\b"
+)
+_PARAM_SEGMENT_RE = re.compile(r"^(?:\{.*\}|:.+|\[.*\]|<.*>)$")
+
+RENAME_CUTOFF = 0.75
+
+
+# =============================================================================
+# NORMALIZE
+# =============================================================================
+def normalize_endpoint(path):
+    """'/api/v1/users/{id}/' → '/api/v1/users/:param' (bỏ query, route group `(x)`, tên param)."""
+    path = path.split("?", 1)[0].split("#", 1)[0].rstrip(".,;:")
+    segments = []
+    for segment in path.strip("/").split("/"):
+        if not segment or (segment.startswith("(") and segment.endswith(")")):
+            continue
+        segments.append(":param" if _PARAM_SEGMENT_RE.match(segment) else segment.lower())
+    return "/" + "/".join(segments)
+
+
+def _normalize_path(path):
+    while path.startswith("./"):
+        path = path[2:]
+    return path
+
+
+# =============================================================================
+# EXTRACT
+# =============================================================================
+class SpecArtifacts:
+    """Artifact trích từ spec của 1 feature. Mỗi mục: key → {"ref", "sources", "done"}.
+
+    `done` = True nếu có ít nhất 1 task đã `[X]` nhắc tới artifact (→ thiếu là error).
+    """
+
+    def __init__(self):
+        self.files = {}
+        self.endpoints = {}
+        self.models = {}
+
+    @staticmethod
+    def _add(bucket, key, ref, source, done):
+        entry = bucket.setdefault(key, {"ref": ref, "sources": [], "done": False})
+        if source not in entry["sources"]:
+            entry["sources"].append(source)
+        entry["done"] = entry["done"] or done
+
+    def add_file(self, path, source, done=False):
+        path = _normalize_path(path)
+        self._add(self.files, path, path, source, done)
+
+    def add_text(self, text, source, done=False, in_code=False):
+        """Endpoint + model nhắc tới trong 1 đoạn text."""
+        for method, path in _ENDPOINT_RE.findall(text):
+            key = normalize_endpoint(path)
+            self._add(self.endpoints, key, f"{method} {path.rstrip('.,;:')}", source, done)
+            methods = self.endpoints[key].setdefault("methods", [])
+            if method not in methods:
+                methods.append(method)
+        match = _PRISMA_MODEL_RE.match(text) if in_code else None
+        names = [match.group(1)] if match else [a or b for a, b in _MODEL_REF_RE.findall(text)]
+        for name in names:
+            self._add(self.models, name.lower(), name, source, done)
+
+
+def extract_artifacts(feature_dir, rel_dir):
+    """Đọc plan.md + tasks.md của 1 feature → SpecArtifacts. rel_dir dùng để ghi nguồn (path:line)."""
+    artifacts = SpecArtifacts()
+
+    plan_path = os.path.join(feature_dir, "plan.md")
+    try:
+        with open(plan_path, "r", encoding="utf-8", errors="replace") as f:
+            in_code = False
+            for lineno, line in enumerate(f, 1):
+                stripped = line.strip()
+                if stripped.startswith("```"):
+                    in_code = not in_code
+                    continue
+                source = f"{rel_dir}/plan.md:{lineno}"
+                artifacts.add_text(line, source, in_code=in_code)
+                if not in_code:
+                    # Code block thường là cây thư mục / snippet — path trong đó không đáng tin
+                    for path in extract_paths(stripped):
+                        artifacts.add_file(path, source)
+    except OSError:
+        pass
+
+    tasks_path = os.path.join(feature_dir, "tasks.md")
+    try:
+        with open(tasks_path, "r", encoding="utf-8", errors="replace") as f:
+            tasks = parse_tasks(f)
+    except OSError:
+        tasks = []
+    for task in tasks:
+        source = f"{rel_dir}/tasks.md:{task['line']}" + (f" ({task['id']})" if task["id"] else "")
+        for path in task["files"]:
+            artifacts.add_file(path, source, task["done"])
+        artifacts.add_text(task["title"], source, task["done"])
+    return artifacts
+
+
+# =============================================================================
+# COMPARE
+# =============================================================================
+def _finding(kind, status, ref, entry, candidate=None):
+    finding = {"kind": kind, "status": status, "ref": ref, "sources": entry["sources"] if entry else []}
+    if candidate:
+        finding["candidate"] = candidate
+    return finding
+
+
+def _missing_status(entry):
+    return "error" if entry["done"] else "pending"
+
+
+class ImplementationIndex:
+    """View của code thật từ ProjectScanner (đã scan): file index, routes, models."""
+
+    def __init__(self, scanner):
+        self.index = scanner.index
+        profile = scanner.profile
+        self.routes = {}
+        for route in profile["api"]["routes"]:
+            self.routes.setdefault(normalize_endpoint(route), route)
+        self.models = {}
+        for model in profile["database"]["models"]:
+            self.models.setdefault(model["name"].lower(), model["name"])
+        self.partial = profile.get("partial", {})
+
+    def has_path(self, path):
+        """Path có trong index, hoặc tồn tại thật nhưng bị index bỏ qua (.gitignore, dist/, .env...)."""
+        path = path.rstrip("/")
+        if self.index.is_file(path) or self.index.is_dir(path):
+            return True
+        parent, _, name = path.rpartition("/")
+        listing = self.index.snapshot().get(parent)
+        if listing is not None:
+            return name in listing[1] or name in listing[2]  # listing thô (chưa lọc ignore) của thư mục cha
+        # Thư mục cha không được duyệt: nằm dưới thư mục bị prune → hỏi thẳng filesystem (1 lần stat)
+        while parent:
+            parent, _, name = parent.rpartition("/")
+            if name in self.index.pruned(parent):
+                return os.path.exists(os.path.join(self.index.root, path))
+        return False
+
+    def path_candidate(self, path):
+        """File cùng tên ở chỗ khác (bị move) hoặc tên gần giống trong cùng thư mục (bị rename).
+
+        Tên file trùng nhiều nơi (route.ts, index.ts, page.tsx) không đủ để đoán bị move.
+        """
+        path = path.rstrip("/")
+        directory, _, name = path.rpartition("/")
+        moved = self.index.files_named(name)
+        if len(moved) == 1:
+            return moved[0]
+        listing = self.index.listdir(directory)
+        if listing:
+            close = difflib.get_close_matches(name, listing[1] + listing[0], n=1, cutoff=RENAME_CUTOFF)
+            if close:
+                return f"{directory}/{close[0]}" if directory else close[0]
+        return None
+
+
+def compare(artifacts, impl):
+    """SpecArtifacts × ImplementationIndex → list finding {"kind", "status", "ref", "sources", "candidate"?}."""
+    findings = []
+
+    for path, entry in artifacts.files.items():
+        if impl.has_path(path):
+            continue
+        candidate = impl.path_candidate(path)
+        findings.append(_finding("file", "renamed" if candidate else _missing_status(entry), path, entry, candidate))
+
+    # Scanner chỉ nhận diện route theo cấu trúc thư mục (Next.js / NestJS) — không thấy route nào
+    # thì không đủ dữ liệu để kết luận endpoint thiếu. Tương tự với model (Prisma).
+    findings.extend(_compare_names("endpoint", artifacts.endpoints, impl.routes))
+    findings.extend(_compare_names("model", artifacts.models, impl.models))
+    return findings
+
+
+def _compare_names(kind, expected, actual):
+    """So 2 tập tên đã normalize (key → entry spec / key → tên trong code)."""
+    if not actual:
+        return []
+    findings = []
+    claimed = set()  # tên trong code đã được coi là bản đổi tên của 1 mục spec → không tính là extra
+    unmatched = [key for key in actual if key not in expected]
+    for key, entry in expected.items():
+        if key in actual:
+            continue
+        close = difflib.get_close_matches(key, unmatched, n=1, cutoff=RENAME_CUTOFF)
+        if close:
+            claimed.add(close[0])
+            findings.append(_finding(kind, "renamed", entry["ref"], entry, actual[close[0]]))
+        else:
+            findings.append(_finding(kind, _missing_status(entry), entry["ref"], entry))
+    if expected:
+        for key in unmatched:
+            if key not in claimed:
+                findings.append(_finding(kind, "extra", actual[key], None))
+    return findings
+
+
+def iter_features(target_dir):
+    """Yield (feature, relpath thư mục) của mọi `.agent/specs/<feature>/` có plan.md hoặc tasks.md."""
+    specs_dir = os.path.join(target_dir, SPECS_DIR)
+    try:
+        with os.scandir(specs_dir) as it:
+            names = sorted(entry.name for entry in it if entry.is_dir() and not entry.name.startswith("."))
+    except OSError:
+        return
+    for name in names:
+        if any(os.path.isfile(os.path.join(specs_dir, name, doc)) for doc in SPEC_DOCS):
+            yield name, f"{SPECS_DIR.replace(os.sep, '/')}/{name}"
+
+
+def diff_features(target_dir, scanner, feature=None):
+    """Chạy diff cho mọi feature (hoặc 1 feature) → list {"feature", "counts", "findings"}."""
+    impl = ImplementationIndex(scanner)
+    reports = []
+    for name, rel_dir in iter_features(target_dir):
+        if feature and name != feature:
+            continue
+        artifacts = extract_artifacts(os.path.join(target_dir, rel_dir), rel_dir)
+        findings = compare(artifacts, impl)
+        counts = {"files": len(artifacts.files), "endpoints": len(artifacts.endpoints), "models": len(artifacts.models)}
+        for status in ("error", "pending", "renamed", "extra"):
+            counts[status] = sum(1 for f in findings if f["status"] == status)
+        reports.append({"feature": name, "counts": counts, "findings": findings})
+    return reports
+
+
+# =============================================================================
+# RENDER
+# =============================================================================
+_STATUS_ICONS = {"error": "❌", "renamed": "✏️ ", "pending": "⏳", "extra": "➕"}
+_STATUS_LABELS = {
+    "error": "Thiếu (task đã xong)",
+    "renamed": "Có thể đã đổi tên / di chuyển",
+    "pending": "Chưa implement",
+    "extra": "Có trong code, không có trong spec",
+}
+
+
+def render_report(report, show_sources=True):
+    counts = report["counts"]
+    lines = [
+        f"🔍 Spec Diff: {report['feature']} "
+        f"({counts['files']} files, {counts['endpoints']} endpoints, {counts['models']} models)",
+        "═" * 60,
+    ]
+    if not report["findings"]:
+        lines.append("✅ Spec và code khớp nhau")
+        return "\n".join(lines)
+    for status in ("error", "renamed", "pending", "extra"):
+        items = [f for f in report["findings"] if f["status"] == status]
+        if not items:
+            continue
+        lines.append(f"{_STATUS_ICONS[status]} {_STATUS_LABELS[status]} ({len(items)}):")
+        for item in items:
+            arrow = f" → {item['candidate']}" if item.get("candidate") else ""
+            lines.append(f"   [{item['kind']}] {item['ref']}{arrow}")
+            if show_sources and item["sources"]:
+                lines.append(f"      ↳ {item['sources'][0]}" + (f" (+{len(item['sources']) - 1})" if len(item["sources"]) > 1 else ""))
+    return "\n".join(lines)
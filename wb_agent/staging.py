@@ -0,0 +1,178 @@
+"""
+Staging - Ghi file theo transaction cho ProjectGenerator.
+
+  - StagedWriter: render mọi file vào thư mục tạm cùng filesystem, sau đó
+    fsync theo lô → rename từng file vào vị trí thật → fsync các thư mục cha 1 lần.
+    Bị ngắt giữa chừng thì cây thư mục thật không bao giờ ở trạng thái ghi dở.
+  - AdvisoryLock: khoá tư vấn (flock / msvcrt) để 2 lần chạy song song không ghi xen kẽ.
+"""
+
+import errno
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+STAGE_PREFIX = ".wb-agent-stage-"
+
+
+class AdvisoryLock:
+    """Khoá độc quyền trên 1 file lock. Dùng: `with AdvisoryLock(path): ...`"""
+
+    def __init__(self, path: str, timeout: float = 300.0, on_wait=None):
+        self.path = path
+        self.timeout = timeout
+        self.on_wait = on_wait  # callback gọi 1 lần khi phải chờ tiến trình khác
+        self._fd = None
+
+    def _try_lock(self):
+        try:
+            if fcntl is not None:
+                fcntl.flock(self._fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            else:
+                msvcrt.locking(self._fd, msvcrt.LK_NBLCK, 1)
+            return True
+        except OSError:
+            return False
+
+    def acquire(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        deadline = time.monotonic() + self.timeout
+        waited = False
+        while not self._try_lock():
+            if not waited and self.on_wait:
+                self.on_wait()
+            waited = True
+            if time.monotonic() >= deadline:
+                os.close(self._fd)
+                self._fd = None
+                raise TimeoutError(f"Không lấy được lock {self.path} sau {self.timeout:.0f}s")
+            time.sleep(0.1)
+        return self
+
+    def release(self):
+        if self._fd is None:
+            return
+        try:
+            if fcntl is not None:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+            else:
+                os.lseek(self._fd, 0, os.SEEK_SET)
+                msvcrt.locking(self._fd, msvcrt.LK_UNLCK, 1)
+        except OSError:
+            pass
+        os.close(self._fd)
+        self._fd = None
+
+    def __enter__(self):
+        return self.acquire()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.release()
+
+
+def _syncfs(path):
+    """Flush cả filesystem chứa `path` bằng 1 syscall (Linux syncfs). False nếu không hỗ trợ."""
+    if not sys.platform.startswith("linux"):
+        return False
+    try:
+        import ctypes
+        libc = ctypes.CDLL(None, use_errno=True)
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            return libc.syncfs(fd) == 0
+        finally:
+            os.close(fd)
+    except (OSError, AttributeError):
+        return False
+
+
+def _fsync_path(path, directory=False):
+    flags = os.O_RDONLY
+    if directory:
+        if os.name == "nt":
+            return  # Windows không fsync được thư mục
+        flags |= getattr(os, "O_DIRECTORY", 0)
+    try:
+        fd = os.open(path, flags)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def remove_stale_stages(target_dir):
+    """Xoá thư mục staging còn sót từ lần chạy bị ngắt (gọi khi đang giữ lock)."""
+    try:
+        names = os.listdir(target_dir)
+    except OSError:
+        return
+    for name in names:
+        if name.startswith(STAGE_PREFIX):
+            shutil.rmtree(os.path.join(target_dir, name), ignore_errors=True)
+
+
+class StagedWriter:
+    """Gom file vào thư mục staging rồi commit bằng rename."""
+
+    def __init__(self, target_dir: str):
+        self.target_dir = target_dir
+        self.stage_dir = tempfile.mkdtemp(prefix=STAGE_PREFIX, dir=target_dir)
+        self._entries = []  # (staged_path, final_path)
+        self._lock = threading.Lock()  # stage() được gọi từ writer pool của generator
+
+    def stage(self, final_path, data: bytes, mode=None):
+        """Ghi `data` vào staging cho `final_path`. Trả về đường dẫn file staged."""
+        rel = os.path.relpath(final_path, self.target_dir)
+        staged_path = os.path.join(self.stage_dir, rel)
+        os.makedirs(os.path.dirname(staged_path), exist_ok=True)
+        with open(staged_path, "wb") as f:
+            f.write(data)
+        if mode is not None:
+            os.chmod(staged_path, mode)
+        with self._lock:
+            self._entries.append((staged_path, final_path))
+        return staged_path
+
+    def __len__(self):
+        return len(self._entries)
+
+    def commit(self):
+        """fsync theo lô → rename vào vị trí thật → fsync thư mục cha (mỗi thư mục 1 lần)."""
+        if self._entries and not _syncfs(self.stage_dir):
+            for staged_path, _ in self._entries:
+                _fsync_path(staged_path)
+
+        parents = set()
+        for staged_path, final_path in self._entries:
+            parent = os.path.dirname(final_path)
+            os.makedirs(parent, exist_ok=True)
+            try:
+                os.replace(staged_path, final_path)
+            except OSError as e:
+                if e.errno != errno.EXDEV:
+                    raise
+                # Khác filesystem (mount point riêng) → copy rồi thay thế
+                shutil.copy2(staged_path, final_path)
+            parents.add(parent)
+
+        for parent in sorted(parents):
+            _fsync_path(parent, directory=True)
+        self._entries = []
+        self.cleanup()
+
+    def cleanup(self):
+        shutil.rmtree(self.stage_dir, ignore_errors=True)
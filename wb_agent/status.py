@@ -0,0 +1,188 @@
+"""
+Status - Progress dashboard cho mọi feature trong `.agent/specs/*/tasks.md` (lệnh `wb-agent status`).
+
+Kết quả parse từng tasks.md được cache tại `.agent/.cache/tasks.json` theo (size, mtime_ns):
+file không đổi → không đọc lại. mtime quá sát lần ghi cache (racy window) thì luôn parse lại.
+"""
+
+import json
+import os
+import time
+
+from . import __version__
+from .scan_cache import CACHE_DIR, RACY_WINDOW_NS, ensure_cache_dir
+from .tasks import parse_tasks, phase_progress
+
+SPECS_DIR = os.path.join(".agent", "specs")
+TASKS_FILE = "tasks.md"
+TASKS_CACHE_FILE = "tasks.json"
+TASKS_CACHE_SCHEMA = 1
+
+BAR_WIDTH = 16
+
+
+class TasksCache:
+    """Cache kết quả parse tasks.md theo file (key = relpath từ project root)."""
+
+    def __init__(self, target_dir):
+        self.target_dir = target_dir
+        self.path = os.path.join(target_dir, CACHE_DIR, TASKS_CACHE_FILE)
+        self.saved_at_ns = 0
+        self.entries = {}
+        self.hits = 0
+        self.misses = 0
+        self._dirty = False
+
+    def load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return self
+        if data.get("schema") == TASKS_CACHE_SCHEMA and data.get("version") == __version__:
+            self.saved_at_ns = data.get("saved_at_ns", 0)
+            self.entries = data.get("files", {})
+        return self
+
+    def summary(self, rel, st):
+        """Tóm tắt tiến độ của file `rel` (os.stat_result `st`) — từ cache nếu file không đổi.
+
+        Cache chỉ lưu phần dashboard cần (phase counts + task pending dạng list gọn)
+        để load JSON vẫn nhanh khi có hàng nghìn spec.
+        """
+        entry = self.entries.get(rel)
+        stamp = [st.st_size, st.st_mtime_ns]
+        if entry is not None and entry["stamp"] == stamp and st.st_mtime_ns < self.saved_at_ns - RACY_WINDOW_NS:
+            self.hits += 1
+            return entry
+
+        self.misses += 1
+        try:
+            with open(os.path.join(self.target_dir, rel), "r", encoding="utf-8", errors="replace") as f:
+                tasks = parse_tasks(f)
+        except OSError:
+            tasks = []
+        entry = {
+            "stamp": stamp,
+            "phases": [[p["phase"], p["done"], p["total"]] for p in phase_progress(tasks)],
+            "pending": [[t["id"], t["markers"], t["title"]] for t in tasks if not t["done"]],
+        }
+        self.entries[rel] = entry
+        self._dirty = True
+        return entry
+
+    def save(self, saved_at_ns, keep):
+        """Ghi cache (chỉ giữ các file trong `keep`). Lỗi I/O được bỏ qua — cache chỉ là tối ưu."""
+        stale = set(self.entries) - set(keep)
+        if not self._dirty and not stale:
+            return
+        for rel in stale:
+            del self.entries[rel]
+        data = {
+            "schema": TASKS_CACHE_SCHEMA,
+            "version": __version__,
+            "saved_at_ns": saved_at_ns,
+            "files": self.entries,
+        }
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            ensure_cache_dir(self.target_dir)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+            os.replace(tmp_path, self.path)
+        except OSError:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+
+def iter_task_files(target_dir):
+    """Yield (feature, relpath, stat) của mọi `.agent/specs/<feature>/tasks.md` (sort theo tên feature)."""
+    specs_dir = os.path.join(target_dir, SPECS_DIR)
+    try:
+        with os.scandir(specs_dir) as it:
+            features = sorted(entry.name for entry in it if entry.is_dir() and not entry.name.startswith("."))
+    except OSError:
+        return
+    for feature in features:
+        rel = f"{SPECS_DIR.replace(os.sep, '/')}/{feature}/{TASKS_FILE}"
+        try:
+            st = os.stat(os.path.join(target_dir, rel))
+        except OSError:
+            continue
+        yield feature, rel, st
+
+
+def collect_status(target_dir, feature=None, use_cache=True):
+    """Tiến độ mọi feature → list {"feature", "path", "done", "total", "phases", "pending"}."""
+    started_ns = time.time_ns()
+    cache = TasksCache(target_dir).load() if use_cache else TasksCache(target_dir)
+    features = []
+    seen = []
+    for name, rel, st in iter_task_files(target_dir):
+        if feature and name != feature:
+            continue
+        seen.append(rel)
+        summary = cache.summary(rel, st)
+        phases = [{"phase": phase, "done": done, "total": total} for phase, done, total in summary["phases"]]
+        features.append({
+            "feature": name,
+            "path": rel,
+            "done": sum(p["done"] for p in phases),
+            "total": sum(p["total"] for p in phases),
+            "phases": phases,
+            "pending": [{"id": task_id, "markers": markers, "title": title} for task_id, markers, title in summary["pending"]],
+        })
+    if use_cache:
+        # Lọc theo feature → giữ nguyên entry của các feature khác
+        cache.save(started_ns, list(cache.entries) if feature else seen)
+    return features
+
+
+# =============================================================================
+# RENDER
+# =============================================================================
+def progress_bar(done, total, width=BAR_WIDTH):
+    filled = round(width * done / total) if total else 0
+    return "█" * filled + "░" * (width - filled)
+
+
+def _percent(done, total):
+    return round(100 * done / total) if total else 0
+
+
+def _progress_line(label, done, total, label_width):
+    return f"{label:<{label_width}} {progress_bar(done, total)} {_percent(done, total):>3}% ({done}/{total})"
+
+
+def render_dashboard(status, pending_limit=5):
+    """Dashboard 1 feature — cùng layout với skill speckit.status."""
+    phases = status["phases"]
+    label_width = max([len(p["phase"] or "Tasks") for p in phases] + [len("Total:")])
+    lines = [f"📊 Progress Dashboard: {status['feature']}", "═" * (label_width + BAR_WIDTH + 16)]
+    for phase in phases:
+        lines.append(_progress_line(phase["phase"] or "Tasks", phase["done"], phase["total"], label_width))
+    lines.append("─" * (label_width + BAR_WIDTH + 16))
+    lines.append(_progress_line("Total:", status["done"], status["total"], label_width))
+
+    pending = status["pending"]
+    if pending:
+        lines.append("")
+        lines.append(f"⏭️  Tiếp theo ({len(pending)} pending):")
+        for task in pending[:pending_limit]:
+            marks = "".join(f" [{m}]" for m in task["markers"])
+            lines.append(f"   - [ ] {task['id'] or '—'}{marks} {task['title']}")
+        if len(pending) > pending_limit:
+            lines.append(f"   ...và {len(pending) - pending_limit} tasks khác")
+    return "\n".join(lines)
+
+
+def render_brief(statuses):
+    """1 dòng / feature + dòng tổng — cho project có nhiều spec."""
+    label_width = max([len(s["feature"]) for s in statuses] + [len("Total:")])
+    lines = [_progress_line(s["feature"], s["done"], s["total"], label_width) for s in statuses]
+    lines.append("─" * (label_width + BAR_WIDTH + 16))
+    lines.append(_progress_line("Total:", sum(s["done"] for s in statuses),
+                                sum(s["total"] for s in statuses), label_width))
+    return "\n".join(lines)
@@ -0,0 +1,312 @@
+"""
+Task Plan - DAG dependency từ tasks.md → waves chạy song song + critical path (`wb-agent tasks plan`).
+
+Cạnh (prerequisite → task) đến từ 4 nguồn:
+  - phase:    task của phase sau chờ mọi task của phase trước
+  - priority: task [P] (blocking) chạy trước các task khác cùng phase
+  - depends:  `Depends on: T001, T002`
+  - file:     2 task cùng phase chạm cùng 1 file → chạy nối tiếp theo thứ tự trong tasks.md
+Task đã `[X]` coi như đã thoả, nhưng thứ tự vẫn truyền qua nó (task pending trước nó
+vẫn đứng trước task sau nó). Wave = các task pending có mọi prerequisite ở wave trước;
+task trong cùng wave không chung file nên nhiều implementer agent chạy cùng lúc không va nhau.
+"""
+
+from .tasks import parse_tasks
+
+MAX_FILES_PER_TASK = 3  # 15-Minute Rule của speckit.tasks
+MINUTES_PER_TASK = 15
+
+
+def _task_key(task):
+    return task["id"] or f"L{task['line']}"
+
+
+class TaskGraph:
+    """DAG của 1 tasks.md. `prereqs[key]` = {key prerequisite: lý do cạnh}."""
+
+    def __init__(self, tasks):
+        self.tasks = {}
+        self.order = []
+        self.warnings = []
+        for task in tasks:
+            key = _task_key(task)
+            if key in self.tasks:
+                self.warnings.append(f"{key} bị khai báo trùng (dòng {task['line']}) — bỏ qua bản sau")
+                continue
+            self.tasks[key] = task
+            self.order.append(key)
+        self.prereqs = {key: {} for key in self.order}
+        self._levels = None
+        self._build()
+
+    def _edge(self, before, after, reason):
+        if before != after:
+            self.prereqs[after].setdefault(before, reason)
+
+    def _build(self):
+        # Nhóm task theo phase liên tiếp (giữ thứ tự xuất hiện)
+        groups = []
+        for key in self.order:
+            phase = self.tasks[key]["phase"]
+            if not groups or groups[-1][0] != phase:
+                groups.append((phase, []))
+            groups[-1][1].append(key)
+
+        previous = []
+        for _, keys in groups:
+            for key in keys:
+                for before in previous:
+                    self._edge(before, key, "phase")
+
+            blocking = [k for k in keys if self.tasks[k]["priority"]]
+            for key in keys:
+                if not self.tasks[key]["priority"]:
+                    for before in blocking:
+                        self._edge(before, key, "priority")
+
+            # Thứ tự chạy trong phase: [P] trước, rồi theo thứ tự tasks.md — cạnh file đi cùng chiều
+            # để 2 loại cạnh ngầm định không tự tạo chu trình
+            last_writer = {}
+            for key in blocking + [k for k in keys if not self.tasks[k]["priority"]]:
+                for path in self.tasks[key]["files"]:
+                    if path in last_writer:
+                        self._edge(last_writer[path], key, "file")
+                    last_writer[path] = key
+
+            # Phase sau chỉ cần nối tới các task "cuối" (không task nào cùng phase chờ nó) —
+            # các task còn lại đã đứng trước chúng → tránh O(n²) cạnh phase
+            has_dependent = {before for key in keys for before in self.prereqs[key]}
+            previous = [k for k in keys if k not in has_dependent]
+
+        for key in self.order:
+            task = self.tasks[key]
+            for dep in task["depends_on"]:
+                if dep in self.tasks:
+                    self._edge(dep, key, "depends")
+                else:
+                    self.warnings.append(f"{key}: Depends on {dep} — không tìm thấy task này")
+            if len(task["files"]) > MAX_FILES_PER_TASK:
+                self.warnings.append(
+                    f"{key} chạm {len(task['files'])} files (> {MAX_FILES_PER_TASK}) — nên tách nhỏ"
+                )
+            elif not task["files"] and not task["done"]:
+                self.warnings.append(f"{key} chưa ghi file path cụ thể")
+
+    # =========================================================================
+    # ANALYSIS
+    # =========================================================================
+    def cycles(self):
+        """Các chu trình (SCC > 1 node) — Tarjan không đệ quy. Mỗi chu trình là list key theo thứ tự tasks.md."""
+        index = {}
+        low = {}
+        on_stack = set()
+        stack = []
+        result = []
+        counter = 0
+        position = {key: i for i, key in enumerate(self.order)}
+        for root in self.order:
+            if root in index:
+                continue
+            work = [(root, iter(self.prereqs[root]))]
+            index[root] = low[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack.add(root)
+            while work:
+                node, children = work[-1]
+                advanced = False
+                for child in children:
+                    if child not in index:
+                        index[child] = low[child] = counter
+                        counter += 1
+                        stack.append(child)
+                        on_stack.add(child)
+                        work.append((child, iter(self.prereqs[child])))
+                        advanced = True
+                        break
+                    if child in on_stack:
+                        low[node] = min(low[node], index[child])
+                if advanced:
+                    continue
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    low[parent] = min(low[parent], low[node])
+                if low[node] == index[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    if len(component) > 1:
+                        result.append(sorted(component, key=position.get))
+        return result
+
+    def _pending_prereqs(self, key, pending_set, memo):
+        """Prerequisite pending của `key`; prerequisite đã xong được thay bằng prerequisite pending
+        gần nhất phía trước nó — thứ tự vẫn truyền qua task đã `[X]`.
+
+        VD: T001 (pending) → T002 ([X], cùng file) → T003 (phase sau): T003 vẫn phải chờ T001.
+        memo: task đã xong → frozenset prerequisite pending của nó (dùng chung giữa các task).
+        """
+        result = set()
+        for before in self.prereqs[key]:
+            if before in pending_set:
+                result.add(before)
+            else:
+                result |= self._done_ancestors(before, pending_set, memo)
+        return result
+
+    def _done_ancestors(self, start, pending_set, memo):
+        """Prerequisite pending gần nhất của task đã xong `start` (DFS không đệ quy, có memo)."""
+        work = [start]
+        visiting = set()
+        while work:
+            key = work[-1]
+            if key in memo:
+                work.pop()
+                continue
+            missing = [p for p in self.prereqs[key]
+                       if p not in pending_set and p not in memo and p not in visiting]
+            if missing and key not in visiting:
+                visiting.add(key)
+                work.extend(missing)
+                continue
+            work.pop()
+            result = set()
+            for before in self.prereqs[key]:
+                if before in pending_set:
+                    result.add(before)
+                else:
+                    result |= memo.get(before, frozenset())  # chu trình giữa task đã xong → bỏ qua
+            memo[key] = frozenset(result)
+        return memo[start]
+
+    def _pending_levels(self):
+        """Level (0-based) của mỗi task pending = độ dài chuỗi prerequisite pending dài nhất.
+
+        Task nằm trong / phụ thuộc vào chu trình không có level.
+        """
+        if self._levels is not None:
+            return self._levels
+        pending = [k for k in self.order if not self.tasks[k]["done"]]
+        pending_set = set(pending)
+        memo = {}
+        effective = {k: self._pending_prereqs(k, pending_set, memo) for k in pending}
+        remaining = {k: set(prereqs) for k, prereqs in effective.items()}
+        dependents = {k: [] for k in pending}
+        for key, prereqs in remaining.items():
+            for before in prereqs:
+                dependents[before].append(key)
+
+        levels = {}
+        best_prev = {}
+        ready = [k for k in pending if not remaining[k]]
+        for key in ready:
+            levels[key] = 0
+        while ready:
+            next_ready = []
+            for key in ready:
+                for after in dependents[key]:
+                    remaining[after].discard(key)
+                    if not remaining[after]:
+                        # Mọi prerequisite đã có level → level = chuỗi dài nhất + 1
+                        prev = max((p for p in effective[after] if p in levels), key=levels.get)
+                        levels[after] = levels[prev] + 1
+                        best_prev[after] = prev
+                        next_ready.append(after)
+            ready = next_ready
+        blocked = [k for k in pending if remaining[k]]
+        self._levels = (levels, best_prev, blocked)
+        return self._levels
+
+    def waves(self, max_parallel=None):
+        """Waves task pending (list các list key). max_parallel: số agent tối đa mỗi wave."""
+        levels, _, _ = self._pending_levels()
+        by_level = {}
+        for key in self.order:
+            if key in levels:
+                by_level.setdefault(levels[key], []).append(key)
+        waves = []
+        for level in sorted(by_level):
+            # Task [P] (blocking) lên trước khi phải chia nhỏ wave
+            keys = sorted(by_level[level], key=lambda k: not self.tasks[k]["priority"])
+            step = max_parallel or len(keys)
+            waves.extend(keys[i:i + step] for i in range(0, len(keys), step))
+        return waves
+
+    def critical_path(self):
+        """Chuỗi task pending dài nhất (mỗi task = 1 đơn vị ≈ MINUTES_PER_TASK phút)."""
+        levels, best_prev, _ = self._pending_levels()
+        if not levels:
+            return []
+        position = {key: i for i, key in enumerate(self.order)}
+        end = max(levels, key=lambda k: (levels[k], -position[k]))
+        path = [end]
+        while path[-1] in best_prev:
+            path.append(best_prev[path[-1]])
+        return path[::-1]
+
+    def blocked(self):
+        """Task pending không xếp được wave (nằm trong / phụ thuộc chu trình)."""
+        return self._pending_levels()[2]
+
+
+def plan_feature(path, max_parallel=None):
+    """Lập plan cho 1 tasks.md → dict JSON-serializable."""
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        graph = TaskGraph(parse_tasks(f))
+    waves = graph.waves(max_parallel)
+    critical = graph.critical_path()
+
+    def _brief(key):
+        task = graph.tasks[key]
+        return {"id": key, "title": task["title"], "markers": task["markers"], "files": task["files"]}
+
+    return {
+        "total": len(graph.order),
+        "pending": sum(1 for k in graph.order if not graph.tasks[k]["done"]),
+        "edges": sum(len(p) for p in graph.prereqs.values()),
+        "cycles": graph.cycles(),
+        "blocked": graph.blocked(),
+        "waves": [[_brief(k) for k in wave] for wave in waves],
+        "critical_path": critical,
+        "critical_minutes": len(critical) * MINUTES_PER_TASK,
+        "warnings": graph.warnings,
+    }
+
+
+def render_plan(feature, plan):
+    """Text output của `wb-agent tasks plan` cho 1 feature."""
+    lines = [f"🗺️  Task Plan: {feature} ({plan['pending']}/{plan['total']} tasks pending, {len(plan['waves'])} waves)"]
+    lines.append("═" * 60)
+
+    for cycle in plan["cycles"]:
+        lines.append(f"🔁 Chu trình dependency: {' → '.join(cycle + cycle[:1])}")
+    if plan["blocked"]:
+        lines.append(f"⛔ Không xếp được (do chu trình): {', '.join(plan['blocked'])}")
+
+    for number, wave in enumerate(plan["waves"], 1):
+        lines.append(f"Wave {number} ({len(wave)} song song):" if len(wave) > 1 else f"Wave {number}:")
+        for task in wave:
+            marks = "".join(f" [{m}]" for m in task["markers"])
+            files = f"  ({', '.join(task['files'])})" if task["files"] else ""
+            lines.append(f"   {task['id']}{marks} {task['title']}{files}")
+
+    if plan["critical_path"]:
+        lines.append("─" * 60)
+        lines.append(
+            f"🧭 Critical path ({len(plan['critical_path'])} tasks ≈ {plan['critical_minutes']} phút): "
+            + " → ".join(plan["critical_path"])
+        )
+    elif not plan["cycles"]:
+        lines.append("✅ Không còn task pending")
+
+    if plan["warnings"]:
+        lines.append("")
+        lines.append(f"⚠️  Warnings ({len(plan['warnings'])}):")
+        for warning in plan["warnings"]:
+            lines.append(f"   - {warning}")
+    return "\n".join(lines)
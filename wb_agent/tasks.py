@@ -0,0 +1,152 @@
+"""
+Tasks - Parser tasks.md dạng stream (theo format của speckit.tasks).
+
+    ### Phase 2: Foundation
+    - [ ] T002 [P] Create database schema in prisma/schema.prisma
+    - [X] T003 [P] [US1] Implement user registration API in `src/api/auth.ts`
+
+Mỗi dòng checkbox có task ID (T001...) hoặc nằm dưới heading Phase là 1 task.
+Checkbox ngoài phase và không có ID (VD: mục "Progress Overview") bị bỏ qua.
+Dòng thụt lề ngay sau task là phần mô tả của task đó; `Depends on: T001, T002`
+(trên dòng task hoặc dòng mô tả) khai báo dependency.
+"""
+
+import re
+
+_HEADING_RE = re.compile(r"#{1,6}\s+(.*?)\s*#*\s*$")
+_PHASE_RE = re.compile(r"\bphase\b", re.IGNORECASE)
+_CHECKBOX_RE = re.compile(r"\s*[-*+]\s+\[([ xX])\]\s+(.*)")
+_ID_RE = re.compile(r"(T\d+)\b[:.]?\s*")
+_MARKER_RE = re.compile(r"\[([A-Za-z][\w-]*)\]\s*")
+_STORY_RE = re.compile(r"US\d+$")
+_DEPENDS_RE = re.compile(r"depends\s+on\s*:?\s*(.*)", re.IGNORECASE)
+_TASK_REF_RE = re.compile(r"\bT\d+\b")
+_CODE_SPAN_RE = re.compile(r"`([^`]+)`")
+_PATH_RE = re.compile(
+    r"(?<![\w/.`])("
+    r"(?:[\w.@\[\]()-]+/)+[\w.@\[\]()-]*\w"  # có dấu "/": src/api/auth.ts, app/(shop)/page.tsx
+    r"|[\w-]+\.(?:tsx?|jsx?|mjs|cjs|py|prisma|sql|json|ya?ml|toml|md|css|scss|html|vue|svelte|go|rs|java|kt|swift|sh)"
+    r")(?![\w/])"
+)
+
+
+# Artifact của speckit được nhắc tới ("per plan.md") — không phải file task sửa
+_SPEC_DOCS = frozenset({"spec.md", "plan.md", "tasks.md"})
+
+
+def _clean_phase(title):
+    """Bỏ emoji / ký tự trang trí đầu heading: '🛠️ Phase 1: Setup' → 'Phase 1: Setup'."""
+    match = re.search(r"[\w(]", title)
+    return title[match.start():].strip() if match else title.strip()
+
+
+def extract_paths(text):
+    """File path nhắc tới trong mô tả task (code span trước, rồi tới token dạng path)."""
+    paths = []
+    for span in _CODE_SPAN_RE.findall(text):
+        span = span.strip()
+        if span.startswith("/") or any(c.isspace() for c in span):
+            continue  # URL path / endpoint (`GET /api/users`), không phải file trong repo
+        if ("/" in span or _PATH_RE.fullmatch(span)) and span not in _SPEC_DOCS:
+            paths.append(span)
+    for match in _PATH_RE.finditer(_CODE_SPAN_RE.sub(" ", text)):
+        path = match.group(1).rstrip(".")
+        if "://" in path or path.startswith("http") or path in _SPEC_DOCS:
+            continue
+        if path not in paths:
+            paths.append(path)
+    return paths
+
+
+def parse_task_line(text):
+    """Phần sau checkbox → (id, markers, title). id None nếu task không đánh số."""
+    task_id = None
+    markers = []
+    rest = text.strip()
+    match = _ID_RE.match(rest)
+    if match:
+        task_id = match.group(1)
+        rest = rest[match.end():]
+    while True:
+        match = _MARKER_RE.match(rest)
+        if not match:
+            break
+        markers.append(match.group(1))
+        rest = rest[match.end():]
+    return task_id, markers, rest.strip()
+
+
+def _depends_on(text):
+    """'... Depends on: T001, T002' → ['T001', 'T002']."""
+    match = _DEPENDS_RE.search(text)
+    return _TASK_REF_RE.findall(match.group(1)) if match else []
+
+
+def _add_unique(items, new_items):
+    for item in new_items:
+        if item not in items:
+            items.append(item)
+
+
+def parse_tasks(lines):
+    """Parse tasks.md từ iterable các dòng (VD: file object) → list task dict theo thứ tự.
+
+    Task: {"id", "done", "title", "markers", "priority", "story", "phase", "files", "depends_on", "line"}
+    """
+    tasks = []
+    phase = None
+    in_code = False
+    current = None  # task đang nhận dòng mô tả thụt lề
+    for lineno, raw in enumerate(lines, 1):
+        stripped = raw.strip()
+        if stripped.startswith("```"):
+            in_code = not in_code
+            current = None
+            continue
+        if in_code or not stripped:
+            continue
+
+        if current is not None and raw[:1] in (" ", "\t") and not _CHECKBOX_RE.match(raw):
+            _add_unique(current["depends_on"], _depends_on(stripped))
+            _add_unique(current["files"], extract_paths(_DEPENDS_RE.sub("", stripped)))
+            continue
+        current = None
+
+        if stripped.startswith("#"):
+            heading = _HEADING_RE.match(stripped)
+            if heading:
+                title = _clean_phase(heading.group(1))
+                phase = title if _PHASE_RE.search(title) else None
+            continue
+
+        match = _CHECKBOX_RE.match(raw)
+        if not match:
+            continue
+        task_id, markers, title = parse_task_line(match.group(2))
+        if task_id is None and phase is None:
+            continue
+        story = next((m for m in markers if _STORY_RE.match(m)), None)
+        current = {
+            "id": task_id,
+            "done": match.group(1) in "xX",
+            "title": title,
+            "markers": markers,
+            "priority": "P" in markers,  # [P] = priority (blocking task) theo speckit.tasks
+            "story": story,
+            "phase": phase,
+            "files": extract_paths(_DEPENDS_RE.sub("", title)),
+            "depends_on": _depends_on(title),
+            "line": lineno,
+        }
+        tasks.append(current)
+    return tasks
+
+
+def phase_progress(tasks):
+    """Nhóm task theo phase (giữ thứ tự xuất hiện) → [{"phase", "done", "total"}]."""
+    phases = {}
+    for task in tasks:
+        entry = phases.setdefault(task["phase"], {"phase": task["phase"], "done": 0, "total": 0})
+        entry["total"] += 1
+        entry["done"] += task["done"]
+    return list(phases.values())
@@ -0,0 +1,141 @@
+"""
+Template Bundle - Templates tĩnh (skills, workflows, scripts) đóng gói trong 1 file resource.
+
+Định dạng `templates.bundle`:
+  MAGIC (5 byte) | độ dài index (4 byte, big-endian) | index JSON | blob UTF-8
+  index = {"version", "sources": {file: sha256}, "entries": {kind: {name: [offset, length]}}}
+  offset tính từ đầu blob.
+
+Khi chạy, file được mmap (hoặc đọc bytes nếu package nằm trong zip) và chỉ cắt đúng
+đoạn cần render → không phải import skill_templates / workflow_templates.
+Bundle lệch version hoặc lệch hash sha256 file nguồn (kể cả sửa giữ nguyên độ dài) → bị bỏ qua,
+render_cache quay về hàm Python.
+
+Build lại sau khi sửa templates: python -m wb_agent.template_bundle
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+
+from . import __version__
+
+BUNDLE_FILE = "templates.bundle"
+MAGIC = b"WBTB\x01"
+
+# kind (render_cache) → tên map trong templates.py — chỉ template không tham số
+BUNDLED_KINDS = {
+    "skill": "SKILL_TEMPLATE_MAP",
+    "workflow": "WORKFLOW_TEMPLATE_MAP",
+    "script": "SCRIPT_TEMPLATE_MAP",
+}
+
+TEMPLATE_SOURCES = ("templates.py", "skill_templates.py", "workflow_templates.py")
+
+_PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+_bundle = None
+_loaded = False
+
+
+def _source_hashes():
+    """sha256 nội dung từng file nguồn templates (~70KB, <1ms) — mtime không dùng được vì
+    bị đặt lại khi cài package."""
+    hashes = {}
+    for filename in TEMPLATE_SOURCES:
+        try:
+            with open(os.path.join(_PACKAGE_DIR, filename), "rb") as f:
+                hashes[filename] = hashlib.sha256(f.read()).hexdigest()
+        except OSError:
+            hashes[filename] = None
+    return hashes
+
+
+class TemplateBundle:
+    """Đọc bundle đã mở (mmap hoặc bytes) theo offset index."""
+
+    def __init__(self, data):
+        if data[:len(MAGIC)] != MAGIC:
+            raise ValueError("Sai định dạng templates.bundle")
+        header_end = len(MAGIC) + 4
+        (index_len,) = struct.unpack(">I", data[len(MAGIC):header_end])
+        index = json.loads(bytes(data[header_end:header_end + index_len]).decode("utf-8"))
+        self._data = data
+        self._blob_start = header_end + index_len
+        self.version = index.get("version")
+        self.sources = index.get("sources", {})
+        self.entries = index.get("entries", {})
+
+    @classmethod
+    def open(cls):
+        """Mở bundle đi kèm package qua importlib.resources."""
+        from importlib import resources
+
+        resource = resources.files(__package__).joinpath(BUNDLE_FILE)
+        path = os.fspath(resource) if isinstance(resource, os.PathLike) else None
+        if path is None:
+            return cls(resource.read_bytes())  # package trong zip
+        with open(path, "rb") as f:
+            return cls(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+    def is_current(self):
+        """Bundle khớp version và hash nội dung các file nguồn templates."""
+        return self.version == __version__ and self.sources == _source_hashes()
+
+    def names(self, kind):
+        return list(self.entries.get(kind, ()))
+
+    def get(self, kind, name):
+        """Nội dung template, hoặc None nếu bundle không có."""
+        entry = self.entries.get(kind, {}).get(name)
+        if entry is None:
+            return None
+        start = self._blob_start + entry[0]
+        return bytes(self._data[start:start + entry[1]]).decode("utf-8")
+
+
+def get_bundle():
+    """Bundle hợp lệ của package (mở 1 lần), hoặc None nếu thiếu / cũ / hỏng."""
+    global _bundle, _loaded
+    if not _loaded:
+        _loaded = True
+        try:
+            bundle = TemplateBundle.open()
+            _bundle = bundle if bundle.is_current() else None
+        except (OSError, ValueError, struct.error):
+            _bundle = None
+    return _bundle
+
+
+def build(path=None):
+    """Render mọi template tĩnh từ các hàm Python và ghi bundle. Trả về (path, số entry)."""
+    from . import templates
+
+    path = path or os.path.join(_PACKAGE_DIR, BUNDLE_FILE)
+    blob = bytearray()
+    entries = {}
+    for kind, map_name in BUNDLED_KINDS.items():
+        entries[kind] = {}
+        for name, template_fn in getattr(templates, map_name).items():
+            data = template_fn().encode("utf-8")
+            entries[kind][name] = [len(blob), len(data)]
+            blob += data
+
+    index = json.dumps(
+        {"version": __version__, "sources": _source_hashes(), "entries": entries},
+        ensure_ascii=False, separators=(",", ":"),
+    ).encode("utf-8")
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(MAGIC)
+        f.write(struct.pack(">I", len(index)))
+        f.write(index)
+        f.write(blob)
+    os.replace(tmp_path, path)
+    return path, sum(len(names) for names in entries.values())
+
+
+if __name__ == "__main__":
+    bundle_path, count = build()
+    print(f"✅ Đã build {count} templates → {bundle_path} ({os.path.getsize(bundle_path):,} bytes)")
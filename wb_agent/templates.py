@@ -3,9 +3,9 @@ Templates - Aggregator cho Document, Skill, Workflow, Script templates.
 Skill và Workflow templates được tách ra file riêng để dễ maintain.
 """
 
+import importlib
 from datetime import datetime
-from .skill_templates import SKILL_TEMPLATE_MAP
-from .workflow_templates import WORKFLOW_TEMPLATE_MAP
+from functools import lru_cache
 
 
 # =============================================================================
@@ -307,6 +307,7 @@ echo "✅ Context update complete"
 # Research date: 2026-02-21
 # =============================================================================
 
+@lru_cache(maxsize=64)
 def _core_rules_content(project_name="Project"):
     """Nội dung rules chung — được tái sử dụng cho mọi IDE."""
     return f"""Dự án: {project_name}
@@ -459,9 +460,21 @@ def doc_agents_md_template(project_name="Project"):
 # TEMPLATE MAPS — Re-exported from sub-modules + local definitions
 # =============================================================================
 
-# Re-export from sub-modules (for backward compat)
-# SKILL_TEMPLATE_MAP imported from skill_templates
-# WORKFLOW_TEMPLATE_MAP imported from workflow_templates
+# Re-export from sub-modules (for backward compat) — import lười khi truy cập lần đầu,
+# để các lệnh không cần nội dung skill/workflow (version, validate, ...) không phải nạp chúng
+_LAZY_TEMPLATE_MAPS = {
+    "SKILL_TEMPLATE_MAP": ".skill_templates",
+    "WORKFLOW_TEMPLATE_MAP": ".workflow_templates",
+}
+
+
+def __getattr__(name):
+    module_name = _LAZY_TEMPLATE_MAPS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __package__), name)
+    globals()[name] = value
+    return value
 
 DOCUMENT_TEMPLATE_MAP = {
     "spec-template.md": doc_spec_template,
@@ -1,74 +1,159 @@
 """
 Validators - Validate cấu trúc .agent/ đã tạo.
+
+Mọi check đọc từ một snapshot duy nhất của .agent/ (_AgentSnapshot): mỗi thư mục
+chỉ scandir 1 lần, mỗi file chỉ stat 1 lần, frontmatter chỉ đọc vài byte đầu.
 """
 
 import os
-from .registry import SKILLS_REGISTRY, WORKFLOWS_REGISTRY
-
-
-def validate_agent_structure(agent_dir: str) -> list:
+import stat
+from .registry import get_registry_index
+
+FRONTMATTER_MARKER = b"---"
+
+
+class _AgentSnapshot:
+    """Listing thư mục + stat của .agent/, lấy lười và cache — không bao giờ hỏi lại filesystem."""
+
+    def __init__(self, agent_dir: str):
+        self.agent_dir = agent_dir
+        self._listings = {}  # reldir -> {tên: "dir" | "file" | "other"} hoặc None nếu không đọc được
+        self._stats = {}     # relpath -> os.stat_result hoặc None
+
+    def _path(self, rel):
+        return os.path.join(self.agent_dir, *rel.split("/")) if rel else self.agent_dir
+
+    def listdir(self, rel=""):
+        if rel not in self._listings:
+            entries = {}
+            try:
+                with os.scandir(self._path(rel)) as it:
+                    for entry in it:
+                        try:
+                            kind = "dir" if entry.is_dir() else "file" if entry.is_file() else "other"
+                        except OSError:
+                            kind = "other"
+                        entries[entry.name] = kind
+            except OSError:
+                entries = None
+            self._listings[rel] = entries
+        return self._listings[rel]
+
+    def _entry(self, rel):
+        parent, _, name = rel.rpartition("/")
+        listing = self.listdir(parent)
+        if listing is None or name not in listing:
+            return None
+        return listing[name]
+
+    def exists(self):
+        return self.listdir("") is not None
+
+    def is_dir(self, rel):
+        return self._entry(rel) == "dir"
+
+    def is_file(self, rel):
+        return self._entry(rel) == "file"
+
+    def stat(self, rel):
+        """stat 1 file (cache) — dùng khi cần size mà listing không có."""
+        if rel not in self._stats:
+            try:
+                self._stats[rel] = os.stat(self._path(rel))
+            except OSError:
+                self._stats[rel] = None
+        return self._stats[rel]
+
+    def head(self, rel, size):
+        """Đọc `size` byte đầu của file."""
+        try:
+            with open(self._path(rel), "rb") as f:
+                return f.read(size)
+        except OSError:
+            return b""
+
+
+def validate_agent_structure(agent_dir: str, fail_fast: bool = False) -> list:
     """
     Validate cấu trúc .agent/ directory.
-    Returns list of check results: [{name, passed, details}]
+    Returns list of check results: [{id, name, passed, details}]
+    fail_fast=True → dừng ngay sau check FAILED đầu tiên.
     """
     results = []
+    for check in iter_agent_checks(agent_dir):
+        results.append(check)
+        if fail_fast and not check["passed"]:
+            break
+    return results
+
+
+def iter_agent_checks(agent_dir: str):
+    """Chạy lần lượt các check, yield từng kết quả ngay khi xong (dùng cho output dạng stream)."""
+    snap = _AgentSnapshot(agent_dir)
+    registry = get_registry_index()
 
     # Check 1: .agent/ directory exists
-    results.append({
+    exists = snap.exists()
+    yield {
+        "id": "agent_dir",
         "name": "Thư mục .agent/ tồn tại",
-        "passed": os.path.isdir(agent_dir),
-        "details": [] if os.path.isdir(agent_dir) else ["Không tìm thấy thư mục .agent/"],
-    })
+        "passed": exists,
+        "details": [] if exists else ["Không tìm thấy thư mục .agent/"],
+    }
 
-    if not os.path.isdir(agent_dir):
-        return results
+    if not exists:
+        return
 
     # Check 2: Core directories
     core_dirs = ["skills", "workflows", "templates", "scripts", "memory"]
     missing_dirs = []
     for d in core_dirs:
-        if not os.path.isdir(os.path.join(agent_dir, d)):
+        if not snap.is_dir(d):
             missing_dirs.append(d)
 
-    results.append({
+    yield {
+        "id": "core_dirs",
         "name": f"Thư mục core ({len(core_dirs)} dirs)",
         "passed": len(missing_dirs) == 0,
         "details": [f"Thiếu: {d}" for d in missing_dirs],
-    })
+    }
 
     # Check 3: Skills directories & SKILL.md
+    # 1 lần stat mỗi SKILL.md, dùng chung cho Check 9 (size)
     missing_skills = []
     incomplete_skills = []
-    for skill in SKILLS_REGISTRY:
-        skill_dir = os.path.join(agent_dir, "skills", skill["name"])
-        skill_file = os.path.join(skill_dir, "SKILL.md")
-
-        if not os.path.isdir(skill_dir):
+    skill_sizes = {}
+    for skill in registry.skills:
+        skill_stat = snap.stat(f"skills/{skill['name']}/SKILL.md")
+        if skill_stat is not None and stat.S_ISREG(skill_stat.st_mode):
+            skill_sizes[skill["name"]] = skill_stat.st_size
+        elif not snap.is_dir(f"skills/{skill['name']}"):
             missing_skills.append(skill["name"])
-        elif not os.path.isfile(skill_file):
+        else:
             incomplete_skills.append(skill["name"])
 
-    results.append({
-        "name": f"Skills ({len(SKILLS_REGISTRY)} skills)",
+    yield {
+        "id": "skills",
+        "name": f"Skills ({len(registry.skills)} skills)",
         "passed": len(missing_skills) == 0 and len(incomplete_skills) == 0,
         "details": (
             [f"Thiếu thư mục: {s}" for s in missing_skills] +
             [f"Thiếu SKILL.md: {s}" for s in incomplete_skills]
         ),
-    })
+    }
 
     # Check 4: Workflow files
     missing_workflows = []
-    for wf in WORKFLOWS_REGISTRY:
-        wf_file = os.path.join(agent_dir, "workflows", f"{wf['command']}.md")
-        if not os.path.isfile(wf_file):
+    for wf in registry.workflows:
+        if not snap.is_file(f"workflows/{wf['command']}.md"):
             missing_workflows.append(wf["command"])
 
-    results.append({
-        "name": f"Workflows ({len(WORKFLOWS_REGISTRY)} workflows)",
+    yield {
+        "id": "workflows",
+        "name": f"Workflows ({len(registry.workflows)} workflows)",
         "passed": len(missing_workflows) == 0,
         "details": [f"Thiếu: {w}.md" for w in missing_workflows],
-    })
+    }
 
     # Check 5: Template files
     template_files = [
@@ -79,14 +164,15 @@ def validate_agent_structure(agent_dir: str) -> list:
     ]
     missing_templates = []
     for t in template_files:
-        if not os.path.isfile(os.path.join(agent_dir, "templates", t)):
+        if not snap.is_file(f"templates/{t}"):
             missing_templates.append(t)
 
-    results.append({
+    yield {
+        "id": "templates",
         "name": f"Templates ({len(template_files)} templates)",
         "passed": len(missing_templates) == 0,
         "details": [f"Thiếu: {t}" for t in missing_templates],
-    })
+    }
 
     # Check 6: Script files
     script_files = [
@@ -97,62 +183,59 @@ def validate_agent_structure(agent_dir: str) -> list:
     ]
     missing_scripts = []
     for s in script_files:
-        if not os.path.isfile(os.path.join(agent_dir, "scripts", "bash", s)):
+        if not snap.is_file(f"scripts/bash/{s}"):
             missing_scripts.append(s)
 
-    results.append({
+    yield {
+        "id": "scripts",
         "name": f"Scripts ({len(script_files)} scripts)",
         "passed": len(missing_scripts) == 0,
         "details": [f"Thiếu: {s}" for s in missing_scripts],
-    })
+    }
 
     # Check 7: Constitution file
-    constitution_file = os.path.join(agent_dir, "memory", "constitution.md")
-    results.append({
+    has_constitution = snap.is_file("memory/constitution.md")
+    yield {
+        "id": "constitution",
         "name": "Constitution (memory/constitution.md)",
-        "passed": os.path.isfile(constitution_file),
-        "details": [] if os.path.isfile(constitution_file) else ["Thiếu constitution.md"],
-    })
+        "passed": has_constitution,
+        "details": [] if has_constitution else ["Thiếu constitution.md"],
+    }
 
     # Check 8: README.md
-    readme_file = os.path.join(agent_dir, "README.md")
-    results.append({
+    has_readme = snap.is_file("README.md")
+    yield {
+        "id": "readme",
         "name": "README.md",
-        "passed": os.path.isfile(readme_file),
-        "details": [] if os.path.isfile(readme_file) else ["Thiếu README.md"],
-    })
+        "passed": has_readme,
+        "details": [] if has_readme else ["Thiếu README.md"],
+    }
 
     # Check 9: SKILL.md content quality (basic check)
     empty_skills = []
-    for skill in SKILLS_REGISTRY:
-        skill_file = os.path.join(agent_dir, "skills", skill["name"], "SKILL.md")
-        if os.path.isfile(skill_file):
-            size = os.path.getsize(skill_file)
-            if size < 100:
-                empty_skills.append(f"{skill['name']} ({size} bytes)")
-
-    results.append({
+    for skill in registry.skills:
+        size = skill_sizes.get(skill["name"])
+        if size is not None and size < 100:
+            empty_skills.append(f"{skill['name']} ({size} bytes)")
+
+    yield {
+        "id": "skill_content",
         "name": "SKILL.md content quality (>100 bytes each)",
         "passed": len(empty_skills) == 0,
         "details": [f"Quá ngắn: {s}" for s in empty_skills],
-    })
+    }
 
     # Check 10: Workflow frontmatter
     invalid_frontmatter = []
-    wf_dir = os.path.join(agent_dir, "workflows")
-    if os.path.isdir(wf_dir):
-        for fname in os.listdir(wf_dir):
-            if fname.endswith(".md"):
-                fpath = os.path.join(wf_dir, fname)
-                with open(fpath, "r", encoding="utf-8") as f:
-                    content = f.read()
-                if not content.startswith("---"):
-                    invalid_frontmatter.append(fname)
-
-    results.append({
+    wf_listing = snap.listdir("workflows") if snap.is_dir("workflows") else None
+    for fname, kind in sorted((wf_listing or {}).items()):
+        if fname.endswith(".md") and kind == "file":
+            if not snap.head(f"workflows/{fname}", len(FRONTMATTER_MARKER)).startswith(FRONTMATTER_MARKER):
+                invalid_frontmatter.append(fname)
+
+    yield {
+        "id": "workflow_frontmatter",
         "name": "Workflow frontmatter (YAML header)",
         "passed": len(invalid_frontmatter) == 0,
         "details": [f"Thiếu frontmatter: {f}" for f in invalid_frontmatter],
-    })
-
-    return results
+    }
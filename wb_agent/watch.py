@@ -0,0 +1,489 @@
+"""
+Watch - Giữ knowledge base (.agent/knowledge_base/*.md) đồng bộ với code (`wb-agent watch`).
+
+Vòng lặp:
+  1. Watcher báo path thay đổi — inotify (Linux, qua ctypes) hoặc polling mtime snapshot.
+     Idle: inotify block trong select() → ~0 CPU; polling chỉ stat thư mục + file detector đã đọc.
+  2. Debounce: gom thay đổi tới khi im lặng `debounce` giây (lưu file hàng loạt → 1 lần cập nhật).
+  3. Map path → detector qua dependency mà detector đã ghi lại (_DetectorContext.deps):
+     sửa nội dung chỉ ảnh hưởng detector đã đọc file đó; thêm/xoá/đổi tên ảnh hưởng detector
+     đã truy vấn cấu trúc (walk / files_named / listdir...) chứa path đó. Không detector nào
+     bị ảnh hưởng (VD: sửa src/utils.ts) → không quét gì cả.
+  4. ProjectScanner.rescan(dirty) chỉ chạy lại các detector đó, rồi chỉ sinh lại file
+     knowledge base có phần profile liên quan thay đổi (so digest), file nội dung y hệt không ghi.
+"""
+
+import ctypes
+import ctypes.util
+import errno
+import hashlib
+import json
+import os
+import select
+import struct
+import sys
+import time
+
+from .file_index import join_rel
+from .ignore import PACKAGE_MANIFEST
+from .scanner import KNOWLEDGE_BASE_FILES, ProjectScanner
+
+KNOWLEDGE_BASE_DIR = os.path.join(".agent", "knowledge_base")
+
+DEFAULT_DEBOUNCE = 0.3  # giây im lặng trước khi cập nhật
+DEFAULT_INTERVAL = 1.0  # chu kỳ polling (giây)
+MAX_DEBOUNCE_WAIT = 5.0  # thay đổi liên tục (VD: git checkout lớn) vẫn cập nhật sau tối đa ngần này
+
+# File quyết định cấu trúc index / danh sách package — đổi nội dung thì quét lại toàn bộ
+_GLOBAL_FILES = frozenset({".gitignore", "pnpm-workspace.yaml"})
+
+
+# =============================================================================
+# CHANGE → DETECTOR
+# =============================================================================
+class Change:
+    """1 thay đổi: `path` (relpath kiểu index), `structural` = thêm / xoá / đổi tên (False = sửa nội dung)."""
+
+    __slots__ = ("path", "structural")
+
+    def __init__(self, path, structural):
+        self.path = path
+        self.structural = structural
+
+    def __repr__(self):
+        return f"Change({self.path!r}, {'structure' if self.structural else 'content'})"
+
+
+def _within(rel, base):
+    return not base or rel == base or rel.startswith(base + "/")
+
+
+def _dep_affected(dep, path, structural):
+    kind, arg = dep[0], dep[1]
+    if kind == "file":
+        return arg == path or (structural and _within(arg, path))
+    if not structural:
+        return False  # sửa nội dung không đổi kết quả truy vấn cấu trúc
+    if kind in ("files_named", "files_with_suffix"):
+        base, pattern = arg
+        name = path.rpartition("/")[2]
+        matched = name == pattern if kind == "files_named" else name.endswith(pattern)
+        return (matched and _within(path, base)) or _within(base, path)
+    if kind == "walk":
+        return _within(path, arg) or _within(arg, path)
+    if kind in ("listdir", "pruned"):
+        return path.rpartition("/")[0] == arg or _within(arg, path)
+    return arg == path or _within(arg, path)  # is_file / is_dir
+
+
+def expand_changes(index, root, changes):
+    """Thay đổi cấu trúc ở 1 thư mục = thay đổi mọi file bên trong (thư mục bị xoá: theo index cũ;
+    thư mục mới / move vào: theo đĩa) — để map được tới files_named / files_with_suffix."""
+    expanded = {}
+    for change in changes:
+        previous = expanded.get(change.path)
+        expanded[change.path] = Change(change.path, change.structural or (previous is not None and previous.structural))
+        if not change.structural:
+            continue
+        inner = [join_rel(reldir, name) for reldir, _, files in index.walk(change.path) for name in files]
+        full = os.path.join(root, change.path)
+        if os.path.isdir(full) and not os.path.islink(full):
+            for dirpath, dirnames, filenames in os.walk(full):
+                reldir = os.path.relpath(dirpath, root).replace(os.sep, "/")
+                package_root = PACKAGE_MANIFEST in filenames
+                dirnames[:] = [d for d in dirnames
+                               if not index.ignore or not index.ignore.is_ignored(join_rel(reldir, d), True, package_root)]
+                inner.extend(join_rel(reldir, name) for name in filenames)
+        for path in inner:
+            expanded[path] = Change(path, True)
+    return list(expanded.values())
+
+
+def affected_detectors(scanner, changes):
+    """Changes → {(base, detector)} cần chạy lại, hoặc None nếu phải quét lại toàn bộ."""
+    dirty = set()
+    jobs = [("", scanner.results)] + list(scanner.package_results.items())
+    for change in changes:
+        name = change.path.rpartition("/")[2]
+        if name in _GLOBAL_FILES or (name == "package.json" and "/" not in change.path):
+            return None  # ignore rules / workspace đổi → index + danh sách package có thể đổi hoàn toàn
+        if change.structural and name == "package.json":
+            return None  # package mới / bị xoá trong monorepo
+        for base, results in jobs:
+            for detector, result in results.items():
+                if (base, detector) in dirty:
+                    continue
+                if any(_dep_affected(dep, change.path, change.structural) for dep in result["deps"]):
+                    dirty.add((base, detector))
+    return dirty
+
+
+def watched_files(scanner):
+    """File mà detector đã đọc nội dung (dependency "file") + file cấu hình toàn cục ở root."""
+    files = set(_GLOBAL_FILES | {"package.json"})
+    for results in [scanner.results] + list(scanner.package_results.values()):
+        for result in results.values():
+            files.update(dep[1] for dep in result["deps"] if dep[0] == "file")
+    return files
+
+
+# =============================================================================
+# WATCHERS
+# =============================================================================
+def _is_noise(index, path):
+    """Path nằm trong vùng không được index (.agent/, node_modules/, file bị .gitignore...)."""
+    parent, _, name = path.rpartition("/")
+    if path == ".agent" or path.startswith(".agent/"):
+        return True
+    if name in index.pruned(parent):
+        return True
+    if index.ignore is None:
+        return False
+    is_dir = os.path.isdir(os.path.join(index.root, path))
+    if not is_dir and not parent:
+        return False  # file cấp root luôn được index
+    return index.ignore.is_ignored(path, is_dir, index.is_file(join_rel(parent, PACKAGE_MANIFEST)))
+
+
+def _listing_changes(index, root, reldir, names):
+    """So listing thô trên đĩa của `reldir` với `names` (listing lúc index) → Change cho tên thêm / mất."""
+    try:
+        current = set(os.listdir(os.path.join(root, reldir) if reldir else root))
+    except OSError:
+        return [Change(reldir, True)], set()
+    changes = []
+    for name in sorted(current ^ names):
+        path = join_rel(reldir, name)
+        if not _is_noise(index, path):
+            changes.append(Change(path, True))
+    return changes, current
+
+
+def _snapshot_dirs(index):
+    """reldir → (mtime_ns, tên con) từ snapshot thô của index (chưa lọc ignore)."""
+    return {
+        reldir: (entry[0], set(entry[1]) | set(entry[2]))
+        for reldir, entry in index.snapshot().items()
+        if entry[0] is not None
+    }
+
+
+class PollingWatcher:
+    """So mtime snapshot: stat mọi thư mục trong index (bắt thêm / xoá / đổi tên) + file detector đã đọc."""
+
+    name = "polling"
+
+    def __init__(self, root, interval=DEFAULT_INTERVAL):
+        self.root = root
+        self.interval = interval
+        self.index = None
+        self._dirs = {}  # reldir → (mtime_ns, set tên con)
+        self._files = {}  # relpath → (size, mtime_ns)
+
+    def _stat(self, rel):
+        try:
+            st = os.stat(os.path.join(self.root, rel) if rel else self.root)
+        except OSError:
+            return None
+        return st
+
+    def refresh(self, index, files):
+        """Cập nhật tập được theo dõi sau mỗi lần quét. Mốc mtime lấy từ snapshot của index
+        → thay đổi xảy ra giữa lúc quét và lúc refresh vẫn được bắt ở lượt poll đầu."""
+        self.index = index
+        self._dirs = _snapshot_dirs(index)
+        self._files = {}
+        for rel in files:
+            st = self._stat(rel)
+            self._files[rel] = (st.st_size, st.st_mtime_ns) if st is not None else None
+        return []
+
+    def _poll(self):
+        changes = []
+        for reldir, (mtime_ns, names) in list(self._dirs.items()):
+            st = self._stat(reldir)
+            if st is None:
+                changes.append(Change(reldir, True))
+                del self._dirs[reldir]
+            elif st.st_mtime_ns != mtime_ns:
+                found, current = _listing_changes(self.index, self.root, reldir, names)
+                changes.extend(found)
+                self._dirs[reldir] = (st.st_mtime_ns, current)
+        for rel, previous in self._files.items():
+            st = self._stat(rel)
+            current = (st.st_size, st.st_mtime_ns) if st is not None else None
+            if current != previous:
+                self._files[rel] = current
+                changes.append(Change(rel, previous is None or current is None))
+        return changes
+
+    def wait(self, timeout=None):
+        """Block tới khi có thay đổi hoặc hết `timeout` giây (None = chờ mãi). Trả về list Change."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            changes = self._poll()
+            if changes:
+                return changes
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                return []
+            time.sleep(self.interval if remaining is None else min(self.interval, remaining))
+
+    def close(self):
+        pass
+
+
+# inotify(7) — hằng số trong <sys/inotify.h>
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_DONT_FOLLOW = 0x02000000
+
+_WATCH_MASK = (IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF
+               | IN_ONLYDIR | IN_DONT_FOLLOW)
+_STRUCTURE_MASK = IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+_EVENT_HEADER = struct.Struct("iIII")  # wd, mask, cookie, len
+
+
+class InotifyError(OSError):
+    """inotify không dùng được (không phải Linux, hết giới hạn watch...) → dùng PollingWatcher."""
+
+
+class InotifyWatcher:
+    """1 inotify watch cho mỗi thư mục trong index. Đợi sự kiện bằng select() nên idle không tốn CPU."""
+
+    name = "inotify"
+
+    def __init__(self, root):
+        if not sys.platform.startswith("linux"):
+            raise InotifyError(errno.ENOSYS, "inotify chỉ có trên Linux")
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+            self._add_watch = libc.inotify_add_watch
+            self._rm_watch = libc.inotify_rm_watch
+            fd = libc.inotify_init1(os.O_CLOEXEC | os.O_NONBLOCK)
+        except (OSError, AttributeError) as e:
+            raise InotifyError(errno.ENOSYS, f"không tải được inotify: {e}")
+        if fd < 0:
+            err = ctypes.get_errno()
+            raise InotifyError(err, os.strerror(err))
+        self._add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self.root = root
+        self.fd = fd
+        self.index = None
+        self._wd_to_dir = {}
+        self._dir_to_wd = {}
+        self._overflow = False
+
+    def refresh(self, index, files):
+        """Thêm watch cho thư mục mới trong index, bỏ watch thư mục đã mất.
+
+        Thư mục có thể đổi giữa lúc quét và lúc được watch → mtime khác snapshot thì so listing,
+        trả về phần chênh lệch như thay đổi để không bỏ sót.
+        """
+        self.index = index
+        dirs = _snapshot_dirs(index)
+        for reldir in list(self._dir_to_wd):
+            if reldir not in dirs:
+                wd = self._dir_to_wd.pop(reldir)
+                self._wd_to_dir.pop(wd, None)
+                self._rm_watch(self.fd, wd)
+        missed = []
+        for reldir in sorted(set(dirs) - set(self._dir_to_wd)):
+            path = os.path.join(self.root, reldir) if reldir else self.root
+            wd = self._add_watch(self.fd, os.fsencode(path), _WATCH_MASK)
+            if wd < 0:
+                err = ctypes.get_errno()
+                if err == errno.ENOSPC:
+                    raise InotifyError(err, "hết giới hạn inotify watch (fs.inotify.max_user_watches)")
+                missed.append(Change(reldir, True))  # thư mục vừa bị xoá
+                continue
+            self._wd_to_dir[wd] = reldir
+            self._dir_to_wd[reldir] = wd
+            try:
+                mtime_ns = os.stat(path).st_mtime_ns
+            except OSError:
+                continue
+            if mtime_ns != dirs[reldir][0]:
+                missed.extend(_listing_changes(index, self.root, reldir, dirs[reldir][1])[0])
+        return missed
+
+    def _read(self):
+        changes = []
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return changes
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            wd, mask, _, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b"\0").decode("utf-8", "surrogateescape")
+            offset += length
+            if mask & IN_Q_OVERFLOW:
+                self._overflow = True
+                continue
+            reldir = self._wd_to_dir.get(wd)
+            if reldir is None:
+                continue
+            if mask & IN_IGNORED:
+                self._wd_to_dir.pop(wd, None)
+                self._dir_to_wd.pop(reldir, None)
+                continue
+            if mask & IN_DELETE_SELF:
+                changes.append(Change(reldir, True))
+                continue
+            path = join_rel(reldir, name)
+            if _is_noise(self.index, path):
+                continue
+            changes.append(Change(path, bool(mask & _STRUCTURE_MASK)))
+        return changes
+
+    @property
+    def overflowed(self):
+        """Hàng đợi kernel tràn → đã mất sự kiện, cần quét lại toàn bộ. Đọc xong tự reset."""
+        overflow, self._overflow = self._overflow, False
+        return overflow
+
+    def wait(self, timeout=None):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            ready, _, _ = select.select([self.fd], [], [], remaining)
+            if not ready:
+                return []
+            changes = self._read()
+            if changes or self._overflow:
+                return changes
+
+    def close(self):
+        try:
+            os.close(self.fd)
+        except OSError:
+            pass
+
+
+def create_watcher(root, mode="auto", interval=DEFAULT_INTERVAL):
+    """mode: auto (inotify nếu được, không thì polling) / inotify / poll."""
+    if mode in ("auto", "inotify"):
+        try:
+            return InotifyWatcher(root)
+        except InotifyError:
+            if mode == "inotify":
+                raise
+    return PollingWatcher(root, interval)
+
+
+# =============================================================================
+# KNOWLEDGE BASE
+# =============================================================================
+def _slice_digest(profile, keys):
+    data = json.dumps([profile.get(key) for key in keys], ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha1(data.encode("utf-8")).hexdigest()
+
+
+class KnowledgeBaseSync:
+    """Sinh lại file knowledge base khi phần profile của nó đổi; chỉ ghi khi nội dung khác trên đĩa."""
+
+    def __init__(self, target_dir):
+        self.base_path = os.path.join(target_dir, KNOWLEDGE_BASE_DIR)
+        self._digests = {}
+
+    def sync(self, scanner):
+        """→ list tên file đã ghi. Project chưa có code (profile rỗng) giữ nguyên placeholder của init."""
+        if not scanner.profile.get("has_existing_code"):
+            return []
+        written = []
+        for name, method, keys in KNOWLEDGE_BASE_FILES:
+            digest = _slice_digest(scanner.profile, keys)
+            if self._digests.get(name) == digest:
+                continue
+            self._digests[name] = digest
+            path = os.path.join(self.base_path, name)
+            content = getattr(scanner, method)()
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    if f.read() == content:
+                        continue
+            except OSError:
+                pass
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(content)
+            os.replace(tmp_path, path)
+            written.append(name)
+        return written
+
+
+# =============================================================================
+# LOOP
+# =============================================================================
+def watch(target_dir, mode="auto", debounce=DEFAULT_DEBOUNCE, interval=DEFAULT_INTERVAL, workers=1,
+          log=print, max_updates=None):
+    """Chạy watch loop tới khi bị ngắt (Ctrl+C). max_updates: dừng sau N lần cập nhật (None = chạy mãi)."""
+    scanner = ProjectScanner(target_dir, use_cache=True, workers=workers)
+    scanner.scan()
+    kb = KnowledgeBaseSync(target_dir)
+    written = kb.sync(scanner)
+    watcher = create_watcher(target_dir, mode, interval)
+
+    def refresh():
+        nonlocal watcher
+        try:
+            return watcher.refresh(scanner.index, watched_files(scanner))
+        except InotifyError as e:
+            if mode == "inotify":
+                raise
+            log(f"⚠️  inotify: {e.strerror} → chuyển sang polling")
+            watcher.close()
+            watcher = PollingWatcher(target_dir, interval)
+            return watcher.refresh(scanner.index, watched_files(scanner))
+
+    pending = refresh()
+    log(f"👀 Watching {target_dir} ({watcher.name}, {len(scanner.index):,} files)"
+        + (f" — đã cập nhật: {', '.join(written)}" if written else ""))
+    updates = 0
+    try:
+        while max_updates is None or updates < max_updates:
+            changes = pending or watcher.wait(None)
+            pending = []
+            # Debounce: gom tới khi im lặng `debounce` giây (tối đa MAX_DEBOUNCE_WAIT)
+            deadline = time.monotonic() + MAX_DEBOUNCE_WAIT
+            while time.monotonic() < deadline:
+                more = watcher.wait(debounce)
+                if not more:
+                    break
+                changes.extend(more)
+            overflow = getattr(watcher, "overflowed", False)
+            if not changes and not overflow:
+                continue
+
+            started = time.perf_counter()
+            dirty = None if overflow else affected_detectors(scanner, expand_changes(scanner.index, target_dir, changes))
+            if dirty is not None and not dirty:
+                # Không detector nào phụ thuộc các path này. Thêm / xoá path vẫn phải cập nhật index
+                # (chỉ stat, không chạy detector) để watch thư mục mới — file xuất hiện sau đó trong
+                # thư mục này có thể thuộc về detector (VD: schema.prisma)
+                if any(change.structural for change in changes):
+                    scanner.rescan(dirty)
+                    pending = refresh()
+                continue
+            scanner.rescan(dirty)
+            written = kb.sync(scanner)
+            pending = refresh()
+            updates += 1
+
+            rerun = "tất cả" if dirty is None else ", ".join(
+                f"{base}:{name}" if base else name for base, name in sorted(dirty))
+            result = f"→ {', '.join(written)}" if written else "→ knowledge base không đổi"
+            log(f"🔄 {len(changes)} thay đổi · detectors: {rerun} {result} "
+                f"({(time.perf_counter() - started) * 1000:.0f}ms)")
+    finally:
+        watcher.close()
+    return updates
@@ -522,7 +522,7 @@ description: So sánh Artifacts (Spec vs Implementation)
 # 🔀 Artifact Comparison
 
 ## Steps
-1. **@speckit.diff** — So sánh 2 versions/artifacts
+1. **@speckit.diff** — So sánh 2 versions/artifacts (spec vs code: `wb-agent diff`)
 2. Output: Added/Removed/Changed table + impact analysis
 
 ## Success Criteria
@@ -585,7 +585,7 @@ description: Hiển thị Progress Dashboard
 # 📊 Progress Dashboard
 
 ## Steps
-1. **@speckit.status** — Parse tasks.md → hiển thị:
+1. **@speckit.status** — Chạy `wb-agent status` (parse tasks.md built-in) → hiển thị:
    - Per-phase progress bars
    - Total completion %
    - Pending tasks list
@@ -0,0 +1,76 @@
+"""
+Workspaces - Phát hiện các package của monorepo (pnpm / yarn / npm workspaces, turborepo).
+
+Nguồn pattern:
+  - `pnpm-workspace.yaml` → key `packages:`
+  - package.json → `workspaces` (list) hoặc `workspaces.packages` (yarn classic)
+Pattern bắt đầu bằng `!` là loại trừ. Package = thư mục khớp pattern và có package.json;
+danh sách thư mục lấy từ FileIndex nên không phải walk lại cây.
+"""
+
+import fnmatch
+import json
+
+from .mini_yaml import YamlError, load
+
+
+def _normalize(pattern):
+    pattern = pattern.strip()
+    while pattern.startswith("./"):
+        pattern = pattern[2:]
+    return pattern.rstrip("/")
+
+
+def read_workspace_patterns(read_text):
+    """`read_text(rel)` → nội dung file hoặc None. Trả về (tool, [pattern]) — tool None nếu không phải monorepo."""
+    content = read_text("pnpm-workspace.yaml")
+    if content is not None:
+        try:
+            data = load(content)
+        except YamlError:
+            return None, []
+        packages = data.get("packages") if isinstance(data, dict) else None
+        if isinstance(packages, list):
+            return "pnpm", [_normalize(p) for p in packages if isinstance(p, str) and p.strip()]
+
+    content = read_text("package.json")
+    if content is not None:
+        try:
+            pkg = json.loads(content)
+        except json.JSONDecodeError:
+            return None, []
+        workspaces = pkg.get("workspaces") if isinstance(pkg, dict) else None
+        if isinstance(workspaces, dict):
+            workspaces = workspaces.get("packages")
+        if isinstance(workspaces, list):
+            tool = "yarn" if read_text("yarn.lock") is not None else "npm"
+            return tool, [_normalize(p) for p in workspaces if isinstance(p, str) and p.strip()]
+    return None, []
+
+
+def match_glob(path, pattern):
+    """Khớp relpath với glob workspace: `*` trong 1 segment, `**` là 0..n segment."""
+    return _match_segments(path.split("/") if path else [], pattern.split("/") if pattern else [])
+
+
+def _match_segments(parts, segments):
+    if not segments:
+        return not parts
+    head, rest = segments[0], segments[1:]
+    if head == "**":
+        return any(_match_segments(parts[i:], rest) for i in range(len(parts) + 1))
+    return bool(parts) and fnmatch.fnmatchcase(parts[0], head) and _match_segments(parts[1:], rest)
+
+
+def expand_workspaces(package_json_paths, patterns):
+    """Relpath các package.json trong cây → thư mục package khớp `patterns` (đã sort)."""
+    includes = [p for p in patterns if not p.startswith("!")]
+    excludes = [_normalize(p[1:]) for p in patterns if p.startswith("!")]
+    packages = []
+    for rel in package_json_paths:
+        directory = rel.rpartition("/")[0]
+        if not directory:
+            continue  # root không phải package con
+        if any(match_glob(directory, p) for p in includes) and not any(match_glob(directory, p) for p in excludes):
+            packages.append(directory)
+    return sorted(set(packages))